@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
 import logging
 
 from bleak_retry_connector import BLEAK_RETRY_EXCEPTIONS as BLEAK_EXCEPTIONS, get_device
@@ -12,11 +13,13 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS, EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.event import async_track_time_interval
 
 from .tuya_ble import TuyaBLEDevice
+from .tuya_ble.connections import connection_manager
 
 from .cloud import HASSTuyaBLEDeviceManager
-from .const import DOMAIN
+from .const import ADVERTISEMENT_POLL_INTERVAL, DOMAIN
 from .devices import TuyaBLECoordinator, TuyaBLEData, get_device_product_info
 
 PLATFORMS: list[Platform] = [
@@ -52,6 +55,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     manager = HASSTuyaBLEDeviceManager(hass, entry.options.copy())
     device = TuyaBLEDevice(manager, ble_device)
+    _async_sync_connection_limit(hass, device)
     await device.initialize()
     product_info = get_device_product_info(device)
 
@@ -73,10 +77,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         change: bluetooth.BluetoothChange,
     ) -> None:
         """Update from a ble callback."""
+        nonlocal last_advertisement
+        last_advertisement = service_info.time
         device.set_ble_device_and_advertisement_data(
             service_info.device, service_info.advertisement
         )
 
+    last_advertisement: float | None = None
+
+    @callback
+    def _async_poll_advertisement(now) -> None:
+        """Pass on an unchanged advertisement to a device waiting to reconnect."""
+        if not device.reconnect_pending:
+            return
+        service_info = bluetooth.async_last_service_info(hass, address.upper(), True)
+        if service_info is not None and service_info.time != last_advertisement:
+            _async_update_ble(service_info, bluetooth.BluetoothChange.ADVERTISEMENT)
+
     entry.async_on_unload(
         bluetooth.async_register_callback(
             hass,
@@ -85,6 +102,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             bluetooth.BluetoothScanningMode.ACTIVE,
         )
     )
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            _async_poll_advertisement,
+            timedelta(seconds=ADVERTISEMENT_POLL_INTERVAL),
+        )
+    )
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = TuyaBLEData(
         entry.title,
@@ -107,6 +131,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+@callback
+def _async_sync_connection_limit(hass: HomeAssistant, device: TuyaBLEDevice) -> None:
+    """Budget the connections of the adapter by the slots it reports."""
+    source = device.connect_source
+    scanner = bluetooth.async_scanner_by_source(hass, source)
+    if scanner is None or (allocations := scanner.get_allocations()) is None:
+        return
+    if allocations.slots > 0:
+        connection_manager.set_limit(source, allocations.slots)
+
+
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     data: TuyaBLEData = hass.data[DOMAIN][entry.entry_id]
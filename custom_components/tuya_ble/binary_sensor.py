@@ -451,6 +451,9 @@ class TuyaBLEBinarySensor(TuyaBLEEntity, BinarySensorEntity):
         super().__init__(hass, coordinator, device, product, mapping.description)
         self._mapping = mapping
 
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        return self._get_mapping_datapoint_ids(self._mapping, self._mapping.dp_id)
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
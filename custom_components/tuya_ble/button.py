@@ -38,6 +38,7 @@ class TuyaBLEButtonMapping:
     force_add: bool = True
     dp_type: TuyaBLEDataPointType | None = None
     is_available: TuyaBLEButtonIsAvailable = None
+    momentary: bool = True
 
 
 def is_fingerbot_in_push_mode(self: TuyaBLEButton, product: TuyaBLEProductInfo) -> bool:
@@ -312,6 +313,12 @@ class TuyaBLEButton(TuyaBLEEntity, ButtonEntity):
     ) -> None:
         super().__init__(hass, coordinator, device, product, mapping.description)
         self._mapping = mapping
+        if mapping.momentary:
+            device.datapoints.set_momentary(mapping.dp_id)
+
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        # Only the availability of a button can depend on datapoints.
+        return self._get_mapping_datapoint_ids(self._mapping)
 
     async def _run_hs21i377_unlock(self) -> None:
         """Run the validated dp71 unlock flow for hs21i377 and oyqux5vv."""
@@ -321,6 +328,7 @@ class TuyaBLEButton(TuyaBLEEntity, ButtonEntity):
         # empirically validated value here until the payload semantics are
         # understood better.
         dp71_value = bytes.fromhex("0001ffff36383538313536320169ab34cd0000")
+        self._device.datapoints.set_momentary(71)
 
         dp71 = self._device.datapoints.get_or_create(
             71,
@@ -335,6 +343,7 @@ class TuyaBLEButton(TuyaBLEEntity, ButtonEntity):
         # It seems like kholoaew requires the same type of unlock as hs21i377
         # but I haven't been able to make it work.
         dp71_value = bytes.fromhex("0001ffff3038383532353836016a1f49270000")
+        self._device.datapoints.set_momentary(71)
 
         dp71 = self._device.datapoints.get_or_create(
             71,
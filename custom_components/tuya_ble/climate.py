@@ -215,6 +215,18 @@ class TuyaBLEClimate(TuyaBLEEntity, ClimateEntity):
             self._attr_max_humidity = mapping.target_humidity_max
             self._attr_min_humidity = mapping.target_humidity_min
 
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        return self._get_mapping_datapoint_ids(
+            self._mapping,
+            self._mapping.hvac_mode_dp_id,
+            self._mapping.hvac_switch_dp_id,
+            self._mapping.current_temperature_dp_id,
+            self._mapping.target_temperature_dp_id,
+            self._mapping.current_humidity_dp_id,
+            self._mapping.target_humidity_dp_id,
+            *(self._mapping.preset_mode_dp_ids or {}).values(),
+        )
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 import json
 from typing import Any, Iterable
 
@@ -17,6 +17,8 @@ from homeassistant.const import (
 )
 
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.singleton import singleton
+from homeassistant.helpers.storage import Store
 
 from tuya_iot import (
     TuyaOpenAPI,
@@ -26,6 +28,7 @@ from tuya_iot import (
 from .tuya_ble import (
     AbstaractTuyaBLEDeviceManager,
     TuyaBLEDeviceCredentials,
+    TuyaBLEGattProfile,
 )
 
 from .const import (
@@ -46,6 +49,8 @@ from .const import (
     CONF_FUNCTIONS,
     CONF_STATUS_RANGE,
     DOMAIN,
+    GATT_PROFILES_STORAGE_KEY,
+    GATT_PROFILES_STORAGE_VERSION,
     TUYA_API_DEVICES_URL,
     TUYA_API_FACTORY_INFO_URL,
     TUYA_API_DEVICE_SPECIFICATION,
@@ -91,6 +96,45 @@ CONF_TUYA_DEVICE_KEYS = [
 _cache: dict[str, TuyaCloudCacheItem] = {}
 
 
+class TuyaBLEGattProfileStore:
+    """GATT profiles of all Tuya BLE devices, kept in one store."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, GATT_PROFILES_STORAGE_VERSION, GATT_PROFILES_STORAGE_KEY
+        )
+        self._profiles: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        self._profiles = await self._store.async_load() or {}
+
+    def get(self, address: str) -> TuyaBLEGattProfile | None:
+        if (data := self._profiles.get(address)) is None:
+            return None
+        try:
+            return TuyaBLEGattProfile(**data)
+        except TypeError:
+            return None
+
+    async def async_set(self, address: str, profile: TuyaBLEGattProfile | None) -> None:
+        data = None if profile is None else asdict(profile)
+        if self._profiles.get(address) == data:
+            return
+        if data is None:
+            del self._profiles[address]
+        else:
+            self._profiles[address] = data
+        await self._store.async_save(self._profiles)
+
+
+@singleton(GATT_PROFILES_STORAGE_KEY)
+async def async_get_gatt_profile_store(hass: HomeAssistant) -> TuyaBLEGattProfileStore:
+    """Return the loaded GATT profile store."""
+    store = TuyaBLEGattProfileStore(hass)
+    await store.async_load()
+    return store
+
+
 class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
     """Cloud connected manager of the Tuya BLE devices credentials."""
 
@@ -334,6 +378,18 @@ class HASSTuyaBLEDeviceManager(AbstaractTuyaBLEDeviceManager):
 
         return result
 
+    async def get_gatt_profile(self, address: str) -> TuyaBLEGattProfile | None:
+        """Get the stored GATT profile of the Tuya BLE device."""
+        store = await async_get_gatt_profile_store(self._hass)
+        return store.get(address)
+
+    async def save_gatt_profile(
+        self, address: str, profile: TuyaBLEGattProfile | None
+    ) -> None:
+        """Store the GATT profile of the Tuya BLE device, None forgets it."""
+        store = await async_get_gatt_profile_store(self._hass)
+        await store.async_set(address, profile)
+
     @property
     def data(self) -> dict[str, Any]:
         return self._data
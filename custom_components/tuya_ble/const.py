@@ -14,6 +14,12 @@ DEVICE_METADATA_UUIDS: Final = "uuids"
 
 DEVICE_DEF_MANUFACTURER: Final = "Tuya"
 SET_DISCONNECTED_DELAY = 10 * 60
+# Seconds between checks for advertisements Home Assistant did not pass on
+# because they were unchanged, while a device waits to reconnect.
+ADVERTISEMENT_POLL_INTERVAL = 10
+# Store for the GATT characteristics each device was last reached through.
+GATT_PROFILES_STORAGE_KEY: Final = f"{DOMAIN}.gatt_profiles"
+GATT_PROFILES_STORAGE_VERSION: Final = 1
 
 CONF_UUID: Final = "uuid"
 CONF_LOCAL_KEY: Final = "local_key"
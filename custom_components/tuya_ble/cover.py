@@ -174,6 +174,14 @@ class TuyaBLECover(TuyaBLEEntity, CoverEntity):
         super().__init__(hass, coordinator, device, product, mapping.description)
         self._mapping = mapping
 
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        return self._get_mapping_datapoint_ids(
+            self._mapping,
+            self._mapping.cover_state_dp_id,
+            self._mapping.cover_position_dp_id,
+            self._mapping.cover_tilt_dp_id,
+        )
+
     @property
     def supported_features(self) -> CoverEntityFeature:
         """Return the supported features of the device."""
@@ -1,6 +1,7 @@
 """The Tuya BLE integration."""
 
 from __future__ import annotations
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
@@ -118,28 +119,68 @@ class TuyaBLEEntity(CoordinatorEntity):
         """Return the associated BLE Device."""
         return self._device
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates of the datapoints the entity shows."""
+        self.coordinator_context = self._get_datapoint_ids()
+        await super().async_added_to_hass()
+
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        """Return the ids of the datapoints the state depends on, None for all."""
+        return None
+
+    @staticmethod
+    def _get_mapping_datapoint_ids(
+        mapping: Any, *dp_ids: int | None
+    ) -> frozenset[int] | None:
+        """Return the set dp_ids, None if mapping callbacks may read any datapoint."""
+        if getattr(mapping, "getter", None) or getattr(mapping, "is_available", None):
+            return None
+        return frozenset(dp_id for dp_id in dp_ids if dp_id)
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self.async_write_ha_state()
 
+    def _get_datapoint(
+        self,
+        key: DPCode | None,
+        dp_type: TuyaBLEDataPointType,
+        value: bytes | bool | int | str | None = None,
+    ) -> TuyaBLEDataPoint | None:
+        dpid = self.find_dpid(key)
+        if dpid is None:
+            return None
+        return self._device.datapoints.get_or_create(dpid, dp_type, value)
+
     def send_dp_value(
         self,
         key: DPCode | None,
         dp_type: TuyaBLEDataPointType,
         value: bytes | bool | int | str | None = None,
     ) -> None:
-        dpid = self.find_dpid(key)
-        if dpid is not None:
-            datapoint = self._device.datapoints.get_or_create(
-                dpid,
-                dp_type,
-                value,
-            )
+        datapoint = self._get_datapoint(key, dp_type, value)
+        if datapoint is not None:
             self._hass.create_task(datapoint.set_value(value))
 
+    def send_dp_values(
+        self, values: list[tuple[TuyaBLEDataPoint, bytes | bool | int | str]]
+    ) -> None:
+        """Write several datapoints to the device as one frame."""
+        if values:
+            self._hass.create_task(self._device.write_datapoints(values))
+
     def _send_command(self, commands: list[dict[str, Any]]) -> None:
         """Send the commands to the device"""
+        writes: list[tuple[TuyaBLEDataPoint, bytes | bool | int | str]] = []
+
+        def add_value(
+            code: str, dp_type: TuyaBLEDataPointType, value: bytes | bool | int | str
+        ) -> None:
+            datapoint = self._get_datapoint(code, dp_type, value)
+            if datapoint is not None:
+                writes.append((datapoint, value))
+
         for command in commands:
             code = command.get("code")
             value = command.get("value")
@@ -149,7 +190,7 @@ class TuyaBLEEntity(CoordinatorEntity):
                 if isinstance(value, str):
                     # We suppose here that cloud JSON type are sent as string
                     if dttype in (DPType.STRING, DPType.JSON):
-                        self.send_dp_value(code, TuyaBLEDataPointType.DT_STRING, value)
+                        add_value(code, TuyaBLEDataPointType.DT_STRING, value)
                     elif dttype == DPType.ENUM:
                         int_value = 0
                         values = self.device.function[code].values
@@ -161,14 +202,14 @@ class TuyaBLEEntity(CoordinatorEntity):
                                     if value in values_range
                                     else None
                                 )
-                        self.send_dp_value(
-                            code, TuyaBLEDataPointType.DT_ENUM, int_value
-                        )
+                        add_value(code, TuyaBLEDataPointType.DT_ENUM, int_value)
 
                 elif isinstance(value, bool):
-                    self.send_dp_value(code, TuyaBLEDataPointType.DT_BOOL, value)
+                    add_value(code, TuyaBLEDataPointType.DT_BOOL, value)
                 else:
-                    self.send_dp_value(code, TuyaBLEDataPointType.DT_VALUE, value)
+                    add_value(code, TuyaBLEDataPointType.DT_VALUE, value)
+
+        self.send_dp_values(writes)
 
     def find_dpid(
         self, dpcode: DPCode | None, prefer_function: bool = False
@@ -177,6 +218,12 @@ class TuyaBLEEntity(CoordinatorEntity):
         if dpcode is None:
             return None
 
+        return self._resolve(
+            ("dpid", dpcode, prefer_function),
+            lambda: self._find_dpid(dpcode, prefer_function),
+        )
+
+    def _find_dpid(self, dpcode: DPCode, prefer_function: bool) -> int | None:
         order = ["status_range", "function"]
         if prefer_function:
             order = ["function", "status_range"]
@@ -186,6 +233,28 @@ class TuyaBLEEntity(CoordinatorEntity):
 
         return None
 
+    def _resolve(self, key: tuple, resolve: Callable[[], Any]) -> Any:
+        """Returns a value resolved from the device schema, computing it once"""
+        cache = self.device.schema_cache
+        if key not in cache:
+            cache[key] = resolve()
+        return cache[key]
+
+    def find_dpids(self, *dpcodes: DPCode | str | None) -> frozenset[int]:
+        """Returns the dp ids of the given codes, as functions or status"""
+        return self._resolve(("dpids", dpcodes), lambda: self._find_dpids(dpcodes))
+
+    def _find_dpids(self, dpcodes: tuple[DPCode | str | None, ...]) -> frozenset[int]:
+        result: set[int] = set()
+        for dpcode in dpcodes:
+            if dpcode is None:
+                continue
+            for key in ("status_range", "function"):
+                functions = getattr(self.device, key)
+                if dpcode in functions:
+                    result.add(functions[dpcode].dp_id)
+        return frozenset(result)
+
     def find_dpcode(
         self,
         dpcodes: str | DPCode | tuple[DPCode, ...] | None,
@@ -202,6 +271,17 @@ class TuyaBLEEntity(CoordinatorEntity):
         elif not isinstance(dpcodes, tuple):
             dpcodes = (dpcodes,)
 
+        return self._resolve(
+            ("dpcode", dpcodes, prefer_function, dptype),
+            lambda: self._find_dpcode(dpcodes, prefer_function, dptype),
+        )
+
+    def _find_dpcode(
+        self,
+        dpcodes: tuple[DPCode, ...],
+        prefer_function: bool,
+        dptype: DPType | None,
+    ) -> DPCode | EnumTypeData | IntegerTypeData | None:
         order = ["status_range", "function"]
         if prefer_function:
             order = ["function", "status_range"]
@@ -251,6 +331,12 @@ class TuyaBLEEntity(CoordinatorEntity):
         if dpcode is None:
             return None
 
+        return self._resolve(
+            ("dptype", dpcode, prefer_function),
+            lambda: self._get_dptype(dpcode, prefer_function),
+        )
+
+    def _get_dptype(self, dpcode: DPCode, prefer_function: bool) -> DPType | None:
         order = ["status_range", "function"]
         if prefer_function:
             order = ["function", "status_range"]
@@ -275,14 +361,73 @@ class TuyaBLECoordinator(DataUpdateCoordinator[None]):
         self._disconnected: bool = True
         self._unsub_disconnect: CALLBACK_TYPE | None = None
         self.last_updates: list[TuyaBLEDataPoint] | None = None
+        # Listeners of datapoint updates by dp id, and those of every update.
+        self._dp_listeners: dict[int, list[CALLBACK_TYPE]] = {}
+        self._all_dp_listeners: list[CALLBACK_TYPE] = []
+        # Listeners of every report by dp id, also of repeated values.
+        self._report_listeners: dict[int, list[CALLBACK_TYPE]] = {}
         device.register_connected_callback(self._async_handle_connect)
-        device.register_callback(self._async_handle_update)
+        device.register_callback(self._async_handle_update, changed_only=True)
+        device.register_callback(self._async_handle_reports)
         device.register_disconnected_callback(self._async_handle_disconnect)
 
     @property
     def connected(self) -> bool:
         return not self._disconnected
 
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for updates, of the datapoint ids in context if it is a set."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        if isinstance(context, frozenset):
+            lists = [self._dp_listeners.setdefault(dp_id, []) for dp_id in context]
+        else:
+            lists = [self._all_dp_listeners]
+        for listeners in lists:
+            listeners.append(update_callback)
+
+        @callback
+        def remove_dp_listener() -> None:
+            remove_listener()
+            for listeners in lists:
+                if update_callback in listeners:
+                    listeners.remove(update_callback)
+
+        return remove_dp_listener
+
+    @callback
+    def async_add_report_listener(
+        self, update_callback: CALLBACK_TYPE, dp_ids: frozenset[int]
+    ) -> Callable[[], None]:
+        """Listen for every report of dp_ids, also those repeating the value."""
+        lists = [self._report_listeners.setdefault(dp_id, []) for dp_id in dp_ids]
+        for listeners in lists:
+            listeners.append(update_callback)
+
+        @callback
+        def remove_report_listener() -> None:
+            for listeners in lists:
+                if update_callback in listeners:
+                    listeners.remove(update_callback)
+
+        return remove_report_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners, only those of changed datapoints on updates."""
+        if self.last_updates is None:
+            super().async_update_listeners()
+            return
+        update_callbacks = dict.fromkeys(self._all_dp_listeners)
+        for datapoint in self.last_updates:
+            update_callbacks.update(
+                dict.fromkeys(self._dp_listeners.get(datapoint.id, ()))
+            )
+        for update_callback in update_callbacks:
+            update_callback()
+
     @callback
     def _async_handle_connect(self) -> None:
         self.last_updates = None
@@ -299,10 +444,15 @@ class TuyaBLECoordinator(DataUpdateCoordinator[None]):
         self.last_updates = updates
         self.async_set_updated_data(None)
         self.last_updates = None
+
+    @callback
+    def _async_handle_reports(self, reports: list[TuyaBLEDataPoint]) -> None:
+        """Trigger the report listeners of the datapoints in a frame."""
+        self._async_handle_connect()
         info = get_device_product_info(self._device)
         if info and info.fingerbot and info.fingerbot.manual_control != 0:
-            for update in updates:
-                if update.id == info.fingerbot.switch and update.changed_by_device:
+            for report in reports:
+                if report.id == info.fingerbot.switch and report.changed_by_device:
                     self.hass.bus.fire(
                         FINGERBOT_BUTTON_EVENT,
                         {
@@ -310,6 +460,17 @@ class TuyaBLECoordinator(DataUpdateCoordinator[None]):
                             CONF_DEVICE_ID: self._device.device_id,
                         },
                     )
+        update_callbacks: dict[CALLBACK_TYPE, None] = {}
+        for datapoint in reports:
+            update_callbacks.update(
+                dict.fromkeys(self._report_listeners.get(datapoint.id, ()))
+            )
+        if not update_callbacks:
+            return
+        self.last_updates = reports
+        for update_callback in update_callbacks:
+            update_callback()
+        self.last_updates = None
 
     @callback
     def _set_disconnected(self, _: None) -> None:
@@ -2,6 +2,10 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.components.diagnostics import async_redact_data
 
+from .const import DOMAIN
+from .tuya_ble.connections import connection_manager
+from .tuya_ble.scheduler import connect_scheduler
+
 TO_REDACT = {
     "username",
     "password",
@@ -21,9 +25,34 @@ async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry):
         "data": entry.data,
         "options": entry.options,
     }
+    if tuya_ble_data := hass.data.get(DOMAIN, {}).get(entry.entry_id):
+        data["connection"] = get_connection_diagnostics(tuya_ble_data.device)
     return async_redact_data(data, TO_REDACT)
 
 
+def get_connection_diagnostics(device) -> dict:
+    """Connection details of a Tuya BLE device."""
+    source = device.connect_source
+    return {
+        "connect_source": source,
+        "connect_priority": device.connect_priority,
+        "connects_active": connect_scheduler.active(source),
+        "connects_waiting": connect_scheduler.waiting(source),
+        "reconnect_state": device.reconnect_state,
+        "idle_timeout": device.idle_timeout,
+        "idle_for": connection_manager.idle_for(device),
+        "connections_used": connection_manager.occupancy(source),
+        "connections_limit": connection_manager.limit(source),
+        "connections_waiting": connection_manager.waiting(source),
+        "connection_evictions": connection_manager.evictions(source),
+        "connection_wait_time": connection_manager.wait_time(device),
+        "connect_time": device.connect_time,
+        "gatt_mtu": device.gatt_mtu,
+        "response_rtt_ms": device.response_rtt,
+        "suppressed_writes": device.suppressed_writes,
+    }
+
+
 async def async_get_device_diagnostics(hass: HomeAssistant, entry, device):
     # Optional: if your integration uses devices (via the device registry)
     device_data = {
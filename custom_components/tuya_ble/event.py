@@ -108,6 +108,19 @@ class TuyaBLEEvent(TuyaBLEEntity, EventEntity):
         self._mapping = mapping
         self._attr_event_types = mapping.event_types
 
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        # Events come from reports, a repeated press repeats the value.
+        return frozenset()
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to every report of the event datapoint."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._coordinator.async_add_report_listener(
+                self._handle_coordinator_update, frozenset((self._mapping.dp_id,))
+            )
+        )
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -630,6 +630,26 @@ class TuyaBLELight(TuyaBLEEntity, LightEntity):
         if not self._attr_supported_color_modes:
             self._attr_supported_color_modes = {ColorMode.ONOFF}
 
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        return (
+            self.find_dpids(
+                self.entity_description.key,
+                self._color_mode_dpcode,
+                self._color_data_dpcode,
+                *(
+                    int_type.dpcode
+                    for int_type in (
+                        self._brightness,
+                        self._brightness_max,
+                        self._brightness_min,
+                        self._color_temp,
+                    )
+                    if int_type
+                ),
+            )
+            or None
+        )
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -53,6 +53,17 @@ class TuyaBLELock(TuyaBLEEntity, LockEntity):
             LockEntityDescription(key="lock", name=product.name),
         )
         self._attr_supported_features = LockEntityFeature.OPEN
+        # Lock and unlock are commands, sent even if the state is already reported.
+        for dpid in (
+            self.find_dpid(DPCode.MANUAL_LOCK),
+            self.find_dpid(DPCode.LOCK_MOTOR_STATE),
+            6 if device.product_id == "wgv4haro" else None,
+        ):
+            if dpid is not None:
+                device.datapoints.set_momentary(dpid)
+
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        return self.find_dpids(DPCode.LOCK_MOTOR_STATE) or None
 
     @property
     def is_locked(self) -> bool | None:
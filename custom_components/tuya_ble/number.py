@@ -1016,6 +1016,9 @@ class TuyaBLENumber(TuyaBLEEntity, NumberEntity):
         self._mapping = mapping
         self._attr_mode = mapping.mode
 
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        return self._get_mapping_datapoint_ids(self._mapping, self._mapping.dp_id)
+
     @property
     def native_value(self) -> float | None:
         """Return the entity value to represent the entity state."""
@@ -836,6 +836,9 @@ class TuyaBLESelect(TuyaBLEEntity, SelectEntity):
         self._mapping = mapping
         self._attr_options = mapping.description.options
 
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        return self._get_mapping_datapoint_ids(self._mapping, self._mapping.dp_id)
+
     @property
     def current_option(self) -> str | None:
         """Return the selected entity option to represent the entity state."""
@@ -39,9 +39,13 @@ from .const import (
 )
 from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
 from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
+from .tuya_ble.connections import connection_manager
 
 _LOGGER = logging.getLogger(__name__)
 SIGNAL_STRENGTH_DP_ID = -1
+CONNECTION_SLOTS_DP_ID = -2
+CONNECTION_WAIT_TIME_DP_ID = -3
+CONNECTION_EVICTIONS_DP_ID = -4
 TuyaBLESensorIsAvailable = Callable[["TuyaBLESensor", TuyaBLEProductInfo], bool] | None
 
 
@@ -2174,6 +2178,61 @@ rssi_mapping = TuyaBLESensorMapping(
 )
 
 
+def connection_slots_getter(sensor: TuyaBLESensor) -> None:
+    sensor._attr_native_value = connection_manager.occupancy(
+        sensor._device.connect_source
+    )
+
+
+connection_slots_mapping = TuyaBLESensorMapping(
+    dp_id=CONNECTION_SLOTS_DP_ID,
+    description=SensorEntityDescription(
+        key="connection_slots_used",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    getter=connection_slots_getter,
+)
+
+
+def connection_wait_time_getter(sensor: TuyaBLESensor) -> None:
+    wait_time = connection_manager.wait_time(sensor._device)
+    sensor._attr_native_value = None if wait_time is None else round(wait_time * 1000)
+
+
+connection_wait_time_mapping = TuyaBLESensorMapping(
+    dp_id=CONNECTION_WAIT_TIME_DP_ID,
+    description=SensorEntityDescription(
+        key="connection_wait_time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    getter=connection_wait_time_getter,
+)
+
+
+def connection_evictions_getter(sensor: TuyaBLESensor) -> None:
+    sensor._attr_native_value = connection_manager.evictions(
+        sensor._device.connect_source
+    )
+
+
+connection_evictions_mapping = TuyaBLESensorMapping(
+    dp_id=CONNECTION_EVICTIONS_DP_ID,
+    description=SensorEntityDescription(
+        key="connection_evictions",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    getter=connection_evictions_getter,
+)
+
+
 def get_mapping_by_device(device: TuyaBLEDevice) -> list[TuyaBLESensorMapping]:
     category = mapping.get(device.category)
     if category is not None and category.products is not None:
@@ -2202,6 +2261,9 @@ class TuyaBLESensor(TuyaBLEEntity, SensorEntity):
         super().__init__(hass, coordinator, device, product, mapping.description)
         self._mapping = mapping
 
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        return self._get_mapping_datapoint_ids(self._mapping, self._mapping.dp_id)
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -2256,7 +2318,13 @@ async def async_setup_entry(
             data.coordinator,
             data.device,
             data.product,
+            mapping,
+        )
+        for mapping in (
             rssi_mapping,
+            connection_slots_mapping,
+            connection_wait_time_mapping,
+            connection_evictions_mapping,
         )
     ]
     for mapping in mappings:
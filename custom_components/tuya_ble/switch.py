@@ -915,6 +915,9 @@ class TuyaBLESwitch(TuyaBLEEntity, SwitchEntity):
         super().__init__(hass, coordinator, device, product, mapping.description)
         self._mapping = mapping
 
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        return self._get_mapping_datapoint_ids(self._mapping, self._mapping.dp_id)
+
     @property
     def is_on(self) -> bool:
         """Return true if switch is on."""
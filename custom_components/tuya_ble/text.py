@@ -228,6 +228,9 @@ class TuyaBLEText(TuyaBLEEntity, TextEntity):
         super().__init__(hass, coordinator, device, product, mapping.description)
         self._mapping = mapping
 
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        return self._get_mapping_datapoint_ids(self._mapping, self._mapping.dp_id)
+
     @property
     def available(self) -> bool:
         """Return if entity is available."""
@@ -11,6 +11,7 @@ from .const import (
 from .manager import (
     AbstaractTuyaBLEDeviceManager,
     TuyaBLEDeviceCredentials,
+    TuyaBLEGattProfile,
 )
 from .tuya_ble import TuyaBLEDataPoint, TuyaBLEDevice, TuyaBLEEntityDescription
 
@@ -21,6 +22,7 @@ __all__ = [
     "TuyaBLEDataPointType",
     "TuyaBLEDevice",
     "TuyaBLEDeviceCredentials",
+    "TuyaBLEGattProfile",
     "SERVICE_UUID",
     "SERVICE_UUIDS",
 ]
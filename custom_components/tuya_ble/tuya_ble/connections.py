@@ -0,0 +1,257 @@
+"""Tracking of Tuya BLE connections and their activity."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from .const import (
+    CONNECTION_WAIT_TIMEOUT,
+    CONNECTIONS_PER_SOURCE,
+    IDLE_SWEEP_INTERVAL,
+)
+
+if TYPE_CHECKING:
+    from .tuya_ble import TuyaBLEDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _SourcePool:
+    limit: int
+    # Devices holding a connection through the source, or connecting.
+    holders: set[TuyaBLEDevice] = field(default_factory=set)
+    connecting: set[TuyaBLEDevice] = field(default_factory=set)
+    evicting: set[TuyaBLEDevice] = field(default_factory=set)
+    waiters: deque[asyncio.Future[None]] = field(default_factory=deque)
+    evictions: int = 0
+
+
+class TuyaBLEConnectionManager:
+    """Budgets connections per adapter and disconnects idle devices.
+
+    Each adapter or proxy gets a number of connections; a device that needs
+    one while all are taken evicts the least recently active idle device and
+    waits for its slot. Only devices with an idle timeout are evicted, those
+    reconnect on their next command; devices pushing their state keep theirs. Devices idle longer than their idle timeout are
+    disconnected by a periodic sweep.
+    """
+
+    def __init__(
+        self,
+        sweep_interval: float = IDLE_SWEEP_INTERVAL,
+        default_limit: int = CONNECTIONS_PER_SOURCE,
+    ) -> None:
+        self._sweep_interval = sweep_interval
+        self._default_limit = default_limit
+        # Last activity per device, least recently active first.
+        self._activity: dict[TuyaBLEDevice, float] = {}
+        self._sweep_timer: asyncio.TimerHandle | None = None
+        self._pools: dict[str, _SourcePool] = {}
+        self._sources: dict[TuyaBLEDevice, str] = {}
+        self._wait_times: dict[TuyaBLEDevice, float] = {}
+
+    def track(self, device: TuyaBLEDevice) -> None:
+        """Start tracking the activity of a connected device."""
+        self._activity.pop(device, None)
+        self._activity[device] = time.monotonic()
+        if device.idle_timeout is not None:
+            self._schedule_sweep()
+
+    def _schedule_sweep(self) -> None:
+        if self._sweep_timer is None:
+            self._sweep_timer = asyncio.get_running_loop().call_later(
+                self._sweep_interval, self._sweep
+            )
+
+    def touch(self, device: TuyaBLEDevice) -> None:
+        """Record activity on the connection of a tracked device."""
+        if self._activity.pop(device, None) is not None:
+            self._activity[device] = time.monotonic()
+
+    def forget(self, device: TuyaBLEDevice) -> None:
+        """Stop tracking device."""
+        self._activity.pop(device, None)
+        self._wait_times.pop(device, None)
+        self.release(device)
+        if self._sweep_timer is not None and not any(
+            tracked.idle_timeout is not None for tracked in self._activity
+        ):
+            self._sweep_timer.cancel()
+            self._sweep_timer = None
+
+    def idle_for(self, device: TuyaBLEDevice) -> float | None:
+        """Return the seconds since the last activity of device."""
+        last = self._activity.get(device)
+        return None if last is None else time.monotonic() - last
+
+    def _get_pool(self, source: str) -> _SourcePool:
+        pool = self._pools.get(source)
+        if pool is None:
+            pool = self._pools[source] = _SourcePool(self._default_limit)
+        return pool
+
+    def set_limit(self, source: str, limit: int) -> None:
+        """Set how many connections may be held through source."""
+        if limit < 1:
+            raise ValueError("Connection limit must be at least 1")
+        pool = self._get_pool(source)
+        pool.limit = limit
+        self._wake(pool)
+
+    def limit(self, source: str) -> int:
+        """Return how many connections may be held through source."""
+        pool = self._pools.get(source)
+        return pool.limit if pool else self._default_limit
+
+    def occupancy(self, source: str) -> int:
+        """Return the connections held or being made through source."""
+        pool = self._pools.get(source)
+        if pool is None:
+            return 0
+        self._prune(pool)
+        return len(pool.holders)
+
+    def waiting(self, source: str) -> int:
+        """Return the number of devices waiting for a slot of source."""
+        pool = self._pools.get(source)
+        return len(pool.waiters) if pool else 0
+
+    def evictions(self, source: str) -> int:
+        """Return how many devices were disconnected to free a slot."""
+        pool = self._pools.get(source)
+        return pool.evictions if pool else 0
+
+    def wait_time(self, device: TuyaBLEDevice) -> float | None:
+        """Return the seconds the last connect of device waited for a slot."""
+        return self._wait_times.get(device)
+
+    async def acquire(
+        self, device: TuyaBLEDevice, timeout: float = CONNECTION_WAIT_TIMEOUT
+    ) -> None:
+        """Take a connection slot for device, evicting an idle device if full."""
+        source = device.connect_source
+        if self._sources.get(device) not in (None, source):
+            self.release(device)
+        pool = self._get_pool(source)
+        pool.connecting.add(device)
+        if device in pool.holders:
+            return
+        start = time.monotonic()
+        try:
+            while True:
+                self._prune(pool)
+                if len(pool.holders) < pool.limit:
+                    break
+                self._evict(pool, device)
+                waiter = asyncio.get_running_loop().create_future()
+                pool.waiters.append(waiter)
+                try:
+                    await asyncio.wait_for(waiter, start + timeout - time.monotonic())
+                except TimeoutError:
+                    raise TimeoutError(
+                        f"No free connection slot on {source} in {timeout}s"
+                    ) from None
+                finally:
+                    if waiter in pool.waiters:
+                        pool.waiters.remove(waiter)
+        except BaseException:
+            pool.connecting.discard(device)
+            raise
+        pool.holders.add(device)
+        self._sources[device] = source
+        self._wait_times[device] = wait_time = time.monotonic() - start
+        if wait_time >= 0.001:
+            _LOGGER.debug(
+                "%s: Waited %.1fs for a connection slot on %s",
+                device.address,
+                wait_time,
+                source,
+            )
+
+    def settle(self, device: TuyaBLEDevice) -> None:
+        """End a connect or disconnect, keeping the slot only if connected."""
+        source = self._sources.get(device)
+        if source is None:
+            return
+        pool = self._pools[source]
+        pool.connecting.discard(device)
+        pool.evicting.discard(device)
+        if not device.holds_connection:
+            self.release(device)
+
+    def release(self, device: TuyaBLEDevice) -> None:
+        """Give back the connection slot of device."""
+        source = self._sources.pop(device, None)
+        if source is None:
+            return
+        pool = self._pools[source]
+        pool.holders.discard(device)
+        pool.connecting.discard(device)
+        pool.evicting.discard(device)
+        self._wake(pool)
+
+    def _prune(self, pool: _SourcePool) -> None:
+        """Drop holders whose connection went away without a release."""
+        for device in list(pool.holders):
+            if device not in pool.connecting and not device.holds_connection:
+                self.release(device)
+
+    def _wake(self, pool: _SourcePool) -> None:
+        free = pool.limit - len(pool.holders)
+        for waiter in pool.waiters:
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def _evict(self, pool: _SourcePool, requester: TuyaBLEDevice) -> None:
+        """Disconnect the least recently active idle device of the pool."""
+        # One eviction in flight per waiting device is enough.
+        if len(pool.evicting) > len(pool.waiters):
+            return
+        for device in self._activity:
+            if (
+                device is requester
+                or device.idle_timeout is None
+                or device not in pool.holders
+                or device in pool.connecting
+                or device in pool.evicting
+                or not device.is_connected
+                or device.is_busy
+            ):
+                continue
+            pool.evicting.add(device)
+            pool.evictions += 1
+            _LOGGER.debug(
+                "%s: Disconnecting to free a connection slot for %s",
+                device.address,
+                requester.address,
+            )
+            asyncio.create_task(device._execute_idle_disconnect())
+            return
+
+    def _sweep(self) -> None:
+        self._sweep_timer = None
+        now = time.monotonic()
+        timed = False
+        for device, last in list(self._activity.items()):
+            if (timeout := device.idle_timeout) is None:
+                continue
+            timed = True
+            if now - last >= timeout and device.is_connected and not device.is_busy:
+                _LOGGER.debug(
+                    "%s: Idle for %.0fs, disconnecting", device.address, now - last
+                )
+                asyncio.create_task(device._execute_idle_disconnect())
+        if timed:
+            self._schedule_sweep()
+
+
+connection_manager = TuyaBLEConnectionManager()
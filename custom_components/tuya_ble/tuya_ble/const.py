@@ -2,10 +2,82 @@ from __future__ import annotations
 
 from enum import Enum
 
+# GATT write size until the ATT MTU of a connection is known (23 - 3 bytes).
 GATT_MTU = 20
 
+# Fragments written without response that may be queued at the backend at once.
+GATT_WRITE_WINDOW = 4
+
+# Seconds datapoint writes from entities are held to go out together in one
+# frame; writes made while a frame is in flight wait for the next one.
+DATAPOINT_COALESCE_DELAY = 0.05
+
+# Seconds a value reported by the device is trusted to skip writing the same
+# value again, long enough for automations that re-assert state every minute.
+WRITE_SUPPRESSION_WINDOW = 300.0
+
+# Priorities of outbound frames of a device, lower values are written first.
+# Acknowledgements and time replies go ahead so the device does not resend its
+# frame, status polls go last and a queued poll is dropped for a newer one.
+OPERATION_PRIORITY_RESPONSE = 0
+OPERATION_PRIORITY_COMMAND = 10
+OPERATION_PRIORITY_POLL = 20
+
 DEFAULT_ATTEMPTS = 0xFFFF
 
+# Connection attempts that may run at once through one adapter or proxy, in
+# line with the 3 connection slots of an ESPHome Bluetooth proxy.
+CONNECT_SLOTS_PER_SOURCE = 3
+
+# Connection attempts made by one connect before giving up.
+CONNECT_ATTEMPTS = 10
+
+# Seconds one connect may spend retrying, backoff delays included, before it
+# gives up and leaves further attempts to the advertisement driven reconnect.
+CONNECT_RETRY_BUDGET = 20.0
+
+# Delays between failed connection attempts are drawn from zero up to the base
+# doubled per consecutive failure, capped; all in seconds.
+RECONNECT_BACKOFF_BASE = 0.5
+RECONNECT_BACKOFF_MAX = 60.0
+
+# Consecutive "device not found" attempts after which connecting is suspended
+# until the device advertises again.
+RECONNECT_BREAKER_THRESHOLD = 5
+
+# Reconnect retries are only made while the device is advertising: within
+# this many seconds of its last advertisement and at or above this RSSI.
+RECONNECT_ADVERTISEMENT_MAX_AGE = 30.0
+RECONNECT_RSSI_MIN = -90
+
+# Seconds without traffic after which a device lets go of its connection, it
+# reconnects when the next command is sent. Devices that push their state,
+# like sensors, stay connected; those only acted on disconnect when idle.
+IDLE_DISCONNECT_DEFAULT: float | None = None
+IDLE_DISCONNECT_CATEGORIES: dict[str, float | None] = {
+    "szjqr": 60.0,  # Fingerbot
+    "kg": 60.0,  # Fingerbot Plus, switches
+    "sfkzq": 60.0,  # Water valve
+    "ggq": 60.0,  # Irrigation timer
+}
+
+# Seconds between checks for idle connections.
+IDLE_SWEEP_INTERVAL = 5.0
+
+# Connections held at once through one adapter or proxy, unless the adapter
+# reports its own slot count, and the seconds a connect waits for a free one.
+CONNECTIONS_PER_SOURCE = 5
+CONNECTION_WAIT_TIMEOUT = 30.0
+
+# Devices someone is waiting on at the door or window connect first, lower
+# values go first.
+CONNECT_PRIORITY_DEFAULT = 10
+CONNECT_PRIORITY_CATEGORIES = {
+    "ms": 0,  # Smart lock
+    "jtmspro": 0,  # Smart lock
+    "cl": 5,  # Curtain / cover
+}
+
 # GATT characteristics and services. Added support for multiple generations/services.
 # Dynamic selection mechanism contributed by @Shirkamdev (https://github.com/Shirkamdev/ha_tuya_ble).
 
@@ -33,7 +105,16 @@ SERVICE_UUID_TEMP = "0000a201-0000-1000-8000-00805f9b34fb"
 
 MANUFACTURER_DATA_ID = 0x07D0
 
-RESPONSE_WAIT_TIMEOUT = 60
+# Response timeouts in seconds. Before a request kind has been answered the
+# initial timeout applies; afterwards it follows the smoothed round trip time,
+# kept between the floor and the ceiling.
+RESPONSE_TIMEOUT_INITIAL = 5.0
+RESPONSE_TIMEOUT_MIN = 1.0
+RESPONSE_TIMEOUT_MAX = 20.0
+
+# Times an unanswered frame is written again, with the same seq_num, before
+# the request is given up.
+RESPONSE_RETRANSMITS = 1
 
 
 class TuyaBLECode(Enum):
@@ -0,0 +1,29 @@
+"""CRC16 used to protect Tuya BLE frames."""
+
+from __future__ import annotations
+
+
+def _build_crc16_table() -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 1:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+        table.append(crc)
+    return tuple(table)
+
+
+# CRC-16/MODBUS (reflected polynomial 0xA001). binascii only ships CRC-CCITT
+# (crc_hqx), which is a different polynomial, so the table is the fast path.
+CRC16_TABLE = _build_crc16_table()
+
+
+def crc16(data: bytes | bytearray | memoryview, crc: int = 0xFFFF) -> int:
+    """Return the CRC16 of a frame, optionally continuing from a previous CRC."""
+    table = CRC16_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
@@ -33,6 +33,13 @@ class TuyaBLEDataLengthError(TuyaBLEError):
         super().__init__("Incoming packet has invalid length")
 
 
+class TuyaBLEOperationSupersededError(TuyaBLEError):
+    """Raised when a queued operation was replaced by a newer one."""
+
+    def __init__(self) -> None:
+        super().__init__("Queued operation was replaced by a newer one")
+
+
 class TuyaBLEDeviceError(TuyaBLEError):
     """Raised when Tuya BLE device returned error in response to command."""
 
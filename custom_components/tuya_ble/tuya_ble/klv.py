@@ -0,0 +1,99 @@
+"""Tuya KLV datapoint payload codec."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from struct import Struct
+
+from .const import TuyaBLEDataPointType
+from .exceptions import TuyaBLEDataFormatError, TuyaBLEDataLengthError
+
+
+# id, type and value length; protocol v3 uses a one byte length, v4 two bytes.
+KLV_HEADERS = {
+    1: Struct(">BBB"),
+    2: Struct(">BBH"),
+}
+
+# Indexed by the wire type value, avoids an Enum lookup per datapoint.
+_DATAPOINT_TYPES = tuple(
+    TuyaBLEDataPointType(value) for value in range(len(TuyaBLEDataPointType))
+)
+
+_DT_BOOL = TuyaBLEDataPointType.DT_BOOL.value
+_DT_VALUE = TuyaBLEDataPointType.DT_VALUE.value
+_DT_STRING = TuyaBLEDataPointType.DT_STRING.value
+_DT_ENUM = TuyaBLEDataPointType.DT_ENUM.value
+
+DecodedDataPoint = tuple[int, TuyaBLEDataPointType, bytes | bool | int | str]
+
+
+def _get_header(length_size: int) -> Struct:
+    header = KLV_HEADERS.get(length_size)
+    if header is None:
+        raise ValueError("Tuya KLV length width must be one or two bytes")
+    return header
+
+
+def decode_datapoints(
+    data: bytes, start_pos: int, length_size: int
+) -> tuple[list[DecodedDataPoint], int]:
+    """Decode KLV datapoints into (id, type, value) tuples and the end position."""
+    header = _get_header(length_size)
+    unpack_header = header.unpack_from
+    header_size = header.size
+    types = _DATAPOINT_TYPES
+    view = memoryview(data)
+    end = len(view)
+
+    result: list[DecodedDataPoint] = []
+    pos = start_pos
+    while end - pos >= header_size:
+        dp_id, dp_type, data_len = unpack_header(view, pos)
+        if dp_type >= len(types):
+            raise TuyaBLEDataFormatError()
+        pos += header_size
+        next_pos = pos + data_len
+        if next_pos > end:
+            raise TuyaBLEDataLengthError()
+        raw_value = view[pos:next_pos]
+        if dp_type == _DT_VALUE or dp_type == _DT_ENUM:
+            value = int.from_bytes(raw_value, "big", signed=True)
+        elif dp_type == _DT_BOOL:
+            value = any(raw_value)
+        elif dp_type == _DT_STRING:
+            value = str(raw_value, "utf-8")
+        else:
+            value = bytes(raw_value)
+        result.append((dp_id, types[dp_type], value))
+        pos = next_pos
+
+    return result, pos
+
+
+def encode_datapoints(
+    datapoints: Sequence[tuple[int, int, bytes]],
+    length_size: int,
+    reserved: int = 0,
+) -> bytearray:
+    """Encode (id, type, raw value) triples into one preallocated buffer.
+
+    The first ``reserved`` bytes are left zeroed for a command header the
+    caller packs in place, so the payload is never concatenated again.
+    """
+    header = _get_header(length_size)
+    pack_header = header.pack_into
+    header_size = header.size
+
+    buffer = bytearray(
+        reserved + sum(header_size + len(value) for _, _, value in datapoints)
+    )
+    pos = reserved
+    for dp_id, dp_type, value in datapoints:
+        pack_header(buffer, pos, dp_id, dp_type, len(value))
+        pos += header_size
+        end = pos + len(value)
+        buffer[pos:end] = value
+        pos = end
+
+    return buffer
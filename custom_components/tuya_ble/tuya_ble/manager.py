@@ -49,6 +49,15 @@ class TuyaBLEDeviceCredentials:
         )
 
 
+@dataclass
+class TuyaBLEGattProfile:
+    """Model of the GATT characteristics a device was last reached through"""
+
+    characteristic_notify: str
+    characteristic_write: str
+    fd50_handshake: bool = False
+
+
 class AbstaractTuyaBLEDeviceManager(ABC):
     """Abstaract manager of the Tuya BLE devices credentials."""
 
@@ -62,6 +71,15 @@ class AbstaractTuyaBLEDeviceManager(ABC):
         """Get credentials of the Tuya BLE device."""
         pass
 
+    async def get_gatt_profile(self, address: str) -> TuyaBLEGattProfile | None:
+        """Get the stored GATT profile of the Tuya BLE device."""
+        return None
+
+    async def save_gatt_profile(
+        self, address: str, profile: TuyaBLEGattProfile | None
+    ) -> None:
+        """Store the GATT profile of the Tuya BLE device, None forgets it."""
+
     @classmethod
     def check_and_create_device_credentials(
         self,
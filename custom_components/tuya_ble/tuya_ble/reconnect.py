@@ -0,0 +1,95 @@
+"""Reconnect backoff and circuit breaker for Tuya BLE devices."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import random
+
+from .const import (
+    RECONNECT_BACKOFF_BASE,
+    RECONNECT_BACKOFF_MAX,
+    RECONNECT_BREAKER_THRESHOLD,
+)
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class TuyaBLEReconnectPolicy:
+    """Exponential backoff with full jitter and a not-found circuit breaker.
+
+    The breaker opens once a device has not been found for `threshold`
+    consecutive attempts; it stays open until the device advertises again,
+    then allows attempts in the half-open state until one succeeds or the
+    device is not found once more.
+    """
+
+    __slots__ = (
+        "_base",
+        "_cap",
+        "_failures",
+        "_not_found",
+        "_random",
+        "_state",
+        "_threshold",
+    )
+
+    def __init__(
+        self,
+        base: float = RECONNECT_BACKOFF_BASE,
+        cap: float = RECONNECT_BACKOFF_MAX,
+        threshold: int = RECONNECT_BREAKER_THRESHOLD,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self._base = base
+        self._cap = cap
+        self._threshold = threshold
+        self._random = rng
+        self._failures = 0
+        self._not_found = 0
+        self._state = BREAKER_CLOSED
+
+    @property
+    def state(self) -> str:
+        """Return the circuit breaker state."""
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """Return whether connection attempts are suspended."""
+        return self._state == BREAKER_OPEN
+
+    @property
+    def failures(self) -> int:
+        """Return the number of consecutive failed attempts."""
+        return self._failures
+
+    def record_success(self) -> None:
+        """Reset backoff and close the breaker after a connection."""
+        self._failures = 0
+        self._not_found = 0
+        self._state = BREAKER_CLOSED
+
+    def record_failure(self, not_found: bool) -> None:
+        """Count a failed attempt, not_found when the device was not seen."""
+        self._failures += 1
+        if not not_found:
+            self._not_found = 0
+            return
+        self._not_found += 1
+        if self._state == BREAKER_HALF_OPEN or self._not_found >= self._threshold:
+            self._state = BREAKER_OPEN
+
+    def half_open(self) -> bool:
+        """Allow attempts again after an advertisement, True if it was open."""
+        if self._state != BREAKER_OPEN:
+            return False
+        self._state = BREAKER_HALF_OPEN
+        self._failures = 0
+        return True
+
+    def next_delay(self) -> float:
+        """Return a random delay up to the exponential backoff for the failures."""
+        ceiling = min(self._cap, self._base * (1 << min(self._failures, 31)))
+        return ceiling * self._random()
@@ -0,0 +1,73 @@
+"""Round-trip time estimation for Tuya BLE request/response exchanges."""
+
+from __future__ import annotations
+
+from collections.abc import Hashable
+
+from .const import (
+    RESPONSE_TIMEOUT_INITIAL,
+    RESPONSE_TIMEOUT_MAX,
+    RESPONSE_TIMEOUT_MIN,
+)
+
+# Smoothing gains and variance factor of RFC 6298.
+_ALPHA = 1 / 8
+_BETA = 1 / 4
+_K = 4
+
+
+class _RTTSample:
+    __slots__ = ("srtt", "rttvar")
+
+    def __init__(self, rtt: float) -> None:
+        self.srtt = rtt
+        self.rttvar = rtt / 2
+
+
+class TuyaBLERTTEstimator:
+    """Smoothed response latency per request kind and the timeout it implies."""
+
+    __slots__ = ("_initial", "_maximum", "_minimum", "_samples")
+
+    def __init__(
+        self,
+        initial: float = RESPONSE_TIMEOUT_INITIAL,
+        minimum: float = RESPONSE_TIMEOUT_MIN,
+        maximum: float = RESPONSE_TIMEOUT_MAX,
+    ) -> None:
+        self._initial = initial
+        self._minimum = minimum
+        self._maximum = maximum
+        self._samples: dict[Hashable, _RTTSample] = {}
+
+    def add_sample(self, key: Hashable, rtt: float) -> None:
+        """Fold an observed round trip into the estimate for key."""
+        sample = self._samples.get(key)
+        if sample is None:
+            self._samples[key] = _RTTSample(rtt)
+            return
+        sample.rttvar += _BETA * (abs(sample.srtt - rtt) - sample.rttvar)
+        sample.srtt += _ALPHA * (rtt - sample.srtt)
+
+    def smoothed_rtt(self, key: Hashable) -> float | None:
+        """Return the smoothed round trip for key, None before any sample."""
+        sample = self._samples.get(key)
+        return None if sample is None else sample.srtt
+
+    def smoothed_rtts(self) -> dict[Hashable, float]:
+        """Return the smoothed round trip of every sampled key."""
+        return {key: sample.srtt for key, sample in self._samples.items()}
+
+    def timeout(self, key: Hashable, attempt: int = 0) -> float:
+        """Return the response timeout for key, doubled for each retransmit."""
+        sample = self._samples.get(key)
+        if sample is None:
+            timeout = self._initial
+        else:
+            timeout = sample.srtt + _K * sample.rttvar
+        timeout = max(self._minimum, timeout) * (1 << attempt)
+        return min(self._maximum, timeout)
+
+    def clear(self) -> None:
+        """Forget all estimates."""
+        self._samples.clear()
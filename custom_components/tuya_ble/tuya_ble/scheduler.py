@@ -0,0 +1,188 @@
+"""Scheduling of connection attempts and of the outbound frames of a device."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+import heapq
+import itertools
+
+from bleak.backends.device import BLEDevice
+
+from .const import CONNECT_SLOTS_PER_SOURCE, OPERATION_PRIORITY_COMMAND
+from .exceptions import TuyaBLEOperationSupersededError
+
+DEFAULT_SOURCE = "default"
+
+
+def get_connection_source(ble_device: BLEDevice) -> str:
+    """Return the adapter or proxy a device is reached through."""
+    details = ble_device.details
+    if isinstance(details, dict) and (source := details.get("source")):
+        return str(source)
+    return DEFAULT_SOURCE
+
+
+@dataclass
+class _SourceSlots:
+    limit: int
+    active: int = 0
+    # (priority, order, future) of waiting connects, lowest first.
+    waiters: list[tuple[int, int, asyncio.Future[None]]] = field(default_factory=list)
+
+
+class TuyaBLEConnectScheduler:
+    """Bounds concurrent connection attempts per adapter, by priority."""
+
+    def __init__(self, default_limit: int = CONNECT_SLOTS_PER_SOURCE) -> None:
+        if default_limit < 1:
+            raise ValueError("Connection slot limit must be at least 1")
+        self._default_limit = default_limit
+        self._sources: dict[str, _SourceSlots] = {}
+        self._order = itertools.count()
+
+    def _get_source(self, source: str) -> _SourceSlots:
+        slots = self._sources.get(source)
+        if slots is None:
+            slots = self._sources[source] = _SourceSlots(self._default_limit)
+        return slots
+
+    def set_limit(self, source: str, limit: int) -> None:
+        """Set how many connects may run at once through source."""
+        if limit < 1:
+            raise ValueError("Connection slot limit must be at least 1")
+        self._get_source(source).limit = limit
+        self._wake(source)
+
+    def active(self, source: str) -> int:
+        """Return the number of connects running through source."""
+        slots = self._sources.get(source)
+        return slots.active if slots else 0
+
+    def waiting(self, source: str) -> int:
+        """Return the number of connects queued for source."""
+        slots = self._sources.get(source)
+        return len(slots.waiters) if slots else 0
+
+    def _wake(self, source: str) -> None:
+        slots = self._sources[source]
+        while slots.waiters and slots.active < slots.limit:
+            _, _, waiter = heapq.heappop(slots.waiters)
+            if not waiter.done():
+                slots.active += 1
+                waiter.set_result(None)
+
+    async def _acquire(self, source: str, priority: int) -> None:
+        slots = self._get_source(source)
+        if slots.active < slots.limit and not slots.waiters:
+            slots.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(slots.waiters, (priority, next(self._order), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted as we were cancelled, pass the slot on.
+                self._release(source)
+            else:
+                slots.waiters = [
+                    item for item in slots.waiters if item[2] is not waiter
+                ]
+                heapq.heapify(slots.waiters)
+            raise
+
+    def _release(self, source: str) -> None:
+        self._sources[source].active -= 1
+        self._wake(source)
+
+    @asynccontextmanager
+    async def slot(self, source: str, priority: int = 0) -> AsyncIterator[None]:
+        """Hold one connection slot of source, lower priority values go first."""
+        await self._acquire(source, priority)
+        try:
+            yield
+        finally:
+            self._release(source)
+
+
+connect_scheduler = TuyaBLEConnectScheduler()
+
+
+class TuyaBLEOperationScheduler:
+    """Runs the outbound operations of a device one at a time, by priority."""
+
+    def __init__(self) -> None:
+        self._busy = False
+        # (priority, order, future, key) of waiting operations, lowest first.
+        self._waiters: list[tuple[int, int, asyncio.Future[None], Hashable | None]] = []
+        self._order = itertools.count()
+
+    def locked(self) -> bool:
+        """Return whether an operation is running."""
+        return self._busy
+
+    def waiting(self) -> int:
+        """Return the number of queued operations."""
+        return len(self._waiters)
+
+    def _supersede(self, key: Hashable) -> None:
+        waiters = []
+        for item in self._waiters:
+            if item[3] == key:
+                if not item[2].done():
+                    item[2].set_exception(TuyaBLEOperationSupersededError())
+            else:
+                waiters.append(item)
+        if len(waiters) != len(self._waiters):
+            heapq.heapify(waiters)
+            self._waiters = waiters
+
+    def _wake(self) -> None:
+        while self._waiters and not self._busy:
+            _, _, waiter, _ = heapq.heappop(self._waiters)
+            if not waiter.done():
+                self._busy = True
+                waiter.set_result(None)
+
+    async def _acquire(self, priority: int, key: Hashable | None) -> None:
+        if key is not None:
+            self._supersede(key)
+        if not self._busy and not self._waiters:
+            self._busy = True
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), waiter, key))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted as we were cancelled, pass the turn on.
+                self._release()
+            else:
+                self._waiters = [
+                    item for item in self._waiters if item[2] is not waiter
+                ]
+                heapq.heapify(self._waiters)
+            raise
+
+    def _release(self) -> None:
+        self._busy = False
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: int = OPERATION_PRIORITY_COMMAND, key: Hashable | None = None
+    ) -> AsyncIterator[None]:
+        """Hold the device for one operation, lower priority values go first.
+
+        A queued operation with the same key is dropped, raising
+        TuyaBLEOperationSupersededError to its caller.
+        """
+        await self._acquire(priority, key)
+        try:
+            yield
+        finally:
+            self._release()
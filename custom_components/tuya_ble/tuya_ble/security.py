@@ -5,6 +5,18 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 import hashlib
 
+from Crypto.Cipher import AES
+
+
+AES_BLOCK_SIZE = 16
+
+# CBC encryption chains every block into the next, so the cached ECB context
+# has to be called once per block from Python. A CBC cipher cannot reuse the
+# cached key schedule: pycryptodome hands the expanded key to the CBC mode,
+# which owns and frees it. Longer frames therefore use a one-shot CBC cipher,
+# whose key expansion costs about as much as chaining two blocks by hand.
+_CHAINED_ENCRYPT_MAX_LENGTH = 2 * AES_BLOCK_SIZE
+
 
 @dataclass(frozen=True, slots=True)
 class TuyaBLESecurityMaterial:
@@ -66,3 +78,54 @@ class TuyaBLESecurityMaterial:
     def session_flag(self) -> int:
         """Return the Tuya security level for authenticated packets."""
         return 15 if self.protocol_v2 else 5
+
+
+class TuyaBLECipher:
+    """AES-CBC around a key schedule that is expanded only once per key."""
+
+    __slots__ = ("_ecb", "_key")
+
+    def __init__(self, key: bytes) -> None:
+        self._key = bytes(key)
+        self._ecb = AES.new(self._key, AES.MODE_ECB)
+
+    @property
+    def key(self) -> bytes:
+        """Return the AES key of this context."""
+        return self._key
+
+    def encrypt(self, iv: bytes, data: bytes) -> bytes:
+        """Encrypt block-aligned data in CBC mode with the given IV."""
+        length = len(data)
+        if length % AES_BLOCK_SIZE:
+            raise ValueError("Data must be aligned to the AES block size")
+        if length > _CHAINED_ENCRYPT_MAX_LENGTH:
+            return AES.new(self._key, AES.MODE_CBC, iv).encrypt(data)
+
+        encrypt_block = self._ecb.encrypt
+        result = bytearray()
+        previous = int.from_bytes(iv, "big")
+        for pos in range(0, length, AES_BLOCK_SIZE):
+            block = int.from_bytes(data[pos : pos + AES_BLOCK_SIZE], "big")
+            encrypted = encrypt_block(
+                (block ^ previous).to_bytes(AES_BLOCK_SIZE, "big")
+            )
+            result += encrypted
+            previous = int.from_bytes(encrypted, "big")
+        return bytes(result)
+
+    def decrypt(self, iv: bytes, data: bytes) -> bytes:
+        """Decrypt block-aligned data in CBC mode with the given IV."""
+        length = len(data)
+        if length % AES_BLOCK_SIZE:
+            raise ValueError("Data must be aligned to the AES block size")
+        if not length:
+            return b""
+
+        # CBC decryption has no chaining dependency: decrypt every block in a
+        # single ECB call, then XOR with the IV followed by the ciphertext
+        # shifted by one block.
+        decrypted = int.from_bytes(self._ecb.decrypt(data), "big")
+        chain = int.from_bytes(iv, "big") << (8 * (length - AES_BLOCK_SIZE))
+        chain |= int.from_bytes(data[: length - AES_BLOCK_SIZE], "big")
+        return (decrypted ^ chain).to_bytes(length, "big")
@@ -6,8 +6,11 @@ import hashlib
 import logging
 import secrets
 import time
-from collections.abc import Callable, Hashable
-from struct import pack, unpack
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Hashable, Iterable, Mapping
+from contextlib import asynccontextmanager
+from struct import Struct, pack
+from types import MappingProxyType
 from dataclasses import dataclass
 from typing import Any
 
@@ -30,12 +33,26 @@ from .const import (
     CHARACTERISTIC_NOTIFY,
     CHARACTERISTIC_NOTIFY_FD50,
     CHARACTERISTIC_WRITE,
+    CONNECT_ATTEMPTS,
+    CONNECT_RETRY_BUDGET,
+    CONNECT_PRIORITY_CATEGORIES,
+    CONNECT_PRIORITY_DEFAULT,
+    DATAPOINT_COALESCE_DELAY,
     GATT_MTU,
+    GATT_WRITE_WINDOW,
+    IDLE_DISCONNECT_CATEGORIES,
+    IDLE_DISCONNECT_DEFAULT,
     MANUFACTURER_DATA_ID,
-    RESPONSE_WAIT_TIMEOUT,
+    OPERATION_PRIORITY_COMMAND,
+    OPERATION_PRIORITY_POLL,
+    OPERATION_PRIORITY_RESPONSE,
+    RECONNECT_ADVERTISEMENT_MAX_AGE,
+    RECONNECT_RSSI_MIN,
+    RESPONSE_RETRANSMITS,
     SERVICE_CHARACTERISTICS,
     SERVICE_UUID_TEMP,
     SERVICE_UUIDS,
+    WRITE_SUPPRESSION_WINDOW,
     TuyaBLECode,
     TuyaBLEDataPointType,
 )
@@ -44,6 +61,8 @@ from ..const import (
     DPType,
 )
 
+from .connections import connection_manager
+from .crc import crc16
 from .exceptions import (
     TuyaBLEError,
     TuyaBLEDataCRCError,
@@ -51,9 +70,22 @@ from .exceptions import (
     TuyaBLEDataLengthError,
     TuyaBLEDeviceError,
     TuyaBLEEnumValueError,
+    TuyaBLEOperationSupersededError,
 )
-from .manager import AbstaractTuyaBLEDeviceManager, TuyaBLEDeviceCredentials
-from .security import TuyaBLESecurityMaterial
+from .klv import decode_datapoints, encode_datapoints
+from .manager import (
+    AbstaractTuyaBLEDeviceManager,
+    TuyaBLEDeviceCredentials,
+    TuyaBLEGattProfile,
+)
+from .reconnect import TuyaBLEReconnectPolicy
+from .rtt import TuyaBLERTTEstimator
+from .scheduler import (
+    TuyaBLEOperationScheduler,
+    connect_scheduler,
+    get_connection_source,
+)
+from .security import TuyaBLECipher, TuyaBLESecurityMaterial
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -65,6 +97,21 @@ BLEAK_EXCEPTIONS = (*BLEAK_RETRY_EXCEPTIONS, OSError)
 FD50_DEVICE_INFO_PRODUCT_IDS = frozenset({"jntxv3q4"})
 
 
+# seq_num, response_to, code and data length; then data, CRC16 and zero
+# padding up to the AES block size.
+FRAME_HEADER = Struct(">IIHH")
+FRAME_CRC = Struct(">H")
+
+# Longest frame a device can send: security flag and IV, then the AES padded
+# header, largest data and CRC16. Longer declared lengths are corrupt.
+MAX_FRAME_LENGTH = (
+    1 + 16 + (FRAME_HEADER.size + 0xFFFF + FRAME_CRC.size + 15) // 16 * 16
+)
+
+# Reserved flag byte and DP sequence number leading a protocol-v4 DP write.
+DPS_V4_HEADER = Struct(">BI")
+
+
 # @dataclass
 class TuyaBLEEntityDescription:
     # Added to info that we get from the cloud
@@ -79,6 +126,19 @@ class TuyaBLEEntityDescription:
 
 
 class TuyaBLEDataPoint:
+    __slots__ = (
+        "_changed",
+        "_changed_by_device",
+        "_flags",
+        "_id",
+        "_owner",
+        "_reported_at",
+        "_reported_value",
+        "_timestamp",
+        "_type",
+        "_value",
+    )
+
     def __init__(
         self,
         owner: TuyaBLEDataPoints,
@@ -90,9 +150,14 @@ class TuyaBLEDataPoint:
     ) -> None:
         self._owner = owner
         self._id = id
+        self._timestamp = timestamp
+        self._flags = flags
+        self._type = type
         self._value = value
         self._changed_by_device = False
-        self._update_from_device(timestamp, flags, type, value)
+        self._changed = False
+        self._reported_value: bytes | bool | int | str | None = None
+        self._reported_at: float | None = None
 
     def __repr__(self) -> str:
         return f"<TuyaBLEDataPoint id={self.id} timestamp={self.timestamp} type={self.type} flags={self.flags} value={self.value}>"
@@ -104,11 +169,30 @@ class TuyaBLEDataPoint:
         type: TuyaBLEDataPointType,
         value: bytes | bool | int | str,
     ) -> None:
+        # A report differing from a local write is a change too: the device
+        # did not take the written value.
+        self._changed = (
+            self._reported_at is None
+            or self._type != type
+            or self._reported_value != value
+            or self._value != value
+        )
         self._timestamp = timestamp
         self._flags = flags
         self._type = type
         self._changed_by_device = self._value != value
         self._value = value
+        self._reported_value = value
+        self._reported_at = time.monotonic()
+        self._owner._owner._update_status(self)
+
+    def _is_current(self) -> bool:
+        """Return whether the value is the one the device reported recently."""
+        return (
+            self._reported_at is not None
+            and self._value == self._reported_value
+            and time.monotonic() - self._reported_at <= WRITE_SUPPRESSION_WINDOW
+        )
 
     def _get_value(self) -> bytes:
         match self._type:
@@ -152,10 +236,16 @@ class TuyaBLEDataPoint:
     def changed_by_device(self) -> bool:
         return self._changed_by_device
 
+    @property
+    def changed(self) -> bool:
+        """Return whether the last report differed from the one before it."""
+        return self._changed
+
     def __str__(self):
         return f"{self}"
 
     async def set_value(self, value: bytes | bool | int | str) -> None:
+        current = self._is_current()
         match self._type:
             case TuyaBLEDataPointType.DT_RAW | TuyaBLEDataPointType.DT_BITMAP:
                 self._value = bytes(value)
@@ -174,17 +264,43 @@ class TuyaBLEDataPoint:
                 self._value = str(value)
 
         self._changed_by_device = False
+        self._owner._owner._update_status(self)
+        if (
+            current
+            and self._value == self._reported_value
+            and self._owner._suppress_write(self._id)
+        ):
+            return
         await self._owner._update_from_user(self._id)
 
 
 class TuyaBLEDataPoints:
     """Models DPs"""
 
+    __slots__ = (
+        "_datapoints",
+        "_last_data_received",
+        "_momentary",
+        "_owner",
+        "_queue_task",
+        "_queued_datapoints",
+        "_queued_sent",
+        "_suppressed_writes",
+        "_update_started",
+        "_updated_datapoints",
+    )
+
     def __init__(self, owner: TuyaBLEDevice) -> None:
         self._owner = owner
         self._datapoints: dict[int, TuyaBLEDataPoint] = {}
         self._update_started: int = 0
-        self._updated_datapoints: list[int] = []
+        # Ordered sets of datapoint ids to send, a rewrite moves an id last.
+        self._updated_datapoints: dict[int, None] = {}
+        self._queued_datapoints: dict[int, None] = {}
+        self._queued_sent: asyncio.Future[None] | None = None
+        self._queue_task: asyncio.Task[None] | None = None
+        self._momentary: set[int] = set()
+        self._suppressed_writes = 0
         self._last_data_received: datetime | None = None
 
     def __len__(self) -> int:
@@ -201,6 +317,18 @@ class TuyaBLEDataPoints:
         """Last data received"""
         return self._last_data_received
 
+    @property
+    def suppressed_writes(self) -> int:
+        """Number of writes skipped because the device already had the value."""
+        return self._suppressed_writes
+
+    def set_momentary(self, id: int, momentary: bool = True) -> None:
+        """Mark a datapoint as a command that is sent even if the value is unchanged."""
+        if momentary:
+            self._momentary.add(id)
+        else:
+            self._momentary.discard(id)
+
     def has_id(self, id: int, type: TuyaBLEDataPointType | None = None) -> bool:
         return (id in self._datapoints) and (
             (type is None) or (self._datapoints[id].type == type)
@@ -218,6 +346,7 @@ class TuyaBLEDataPoints:
             return datapoint
         datapoint = TuyaBLEDataPoint(self, id, time.time(), 0, type, value)
         self._datapoints[id] = datapoint
+        self._owner._update_status(datapoint)
         return datapoint
 
     def begin_update(self) -> None:
@@ -227,8 +356,9 @@ class TuyaBLEDataPoints:
         if self._update_started > 0:
             self._update_started -= 1
             if self._update_started == 0 and len(self._updated_datapoints) > 0:
-                await self._owner._send_datapoints(self._updated_datapoints)
-                self._updated_datapoints = []
+                datapoint_ids = list(self._updated_datapoints)
+                self._updated_datapoints = {}
+                await self._owner._send_datapoints(datapoint_ids)
 
     def _update_from_device(
         self,
@@ -237,26 +367,75 @@ class TuyaBLEDataPoints:
         flags: int,
         type: TuyaBLEDataPointType,
         value: bytes | bool | int | str,
-    ) -> None:
+    ) -> TuyaBLEDataPoint:
         self._last_data_received = datetime.now(timezone.utc)
         dp = self._datapoints.get(dp_id)
-        if dp:
-            dp._update_from_device(timestamp, flags, type, value)
-        else:
-            self._datapoints[dp_id] = TuyaBLEDataPoint(
+        if not dp:
+            dp = self._datapoints[dp_id] = TuyaBLEDataPoint(
                 self, dp_id, timestamp, flags, type, value
             )
+        dp._update_from_device(timestamp, flags, type, value)
+        return dp
+
+    def _forget_reports(self) -> None:
+        """Stop trusting reported values, the device may change while away."""
+        for datapoint in self._datapoints.values():
+            datapoint._reported_at = None
+
+    def _suppress_write(self, dp_id: int) -> bool:
+        """Skip writing the current value again, unless the datapoint is momentary."""
+        if dp_id in self._momentary:
+            return False
+        self._suppressed_writes += 1
+        _LOGGER.debug(
+            "%s: Not writing datapoint %s, the device already has the value",
+            self._owner.address,
+            dp_id,
+        )
+        return True
 
     async def _update_from_user(self, dp_id: int) -> None:
         if self._update_started > 0:
-            if dp_id in self._updated_datapoints:
-                self._updated_datapoints.remove(dp_id)
-            self._updated_datapoints.append(dp_id)
+            self._updated_datapoints.pop(dp_id, None)
+            self._updated_datapoints[dp_id] = None
         else:
-            await self._owner._send_datapoints([dp_id])
-
-
-global_connect_lock = asyncio.Lock()
+            await self._queue_from_user(dp_id)
+
+    async def _queue_from_user(self, dp_id: int) -> None:
+        """Queue a written datapoint and wait until the frame with it is sent."""
+        self._queued_datapoints.pop(dp_id, None)
+        self._queued_datapoints[dp_id] = None
+        loop = asyncio.get_running_loop()
+        if self._queued_sent is None:
+            self._queued_sent = loop.create_future()
+        sent = self._queued_sent
+        if self._queue_task is None:
+            self._queue_task = loop.create_task(self._send_queued())
+        await asyncio.shield(sent)
+
+    async def _send_queued(self) -> None:
+        """Send queued datapoints, one frame at a time, until none are left."""
+        try:
+            while self._queued_datapoints:
+                sent = self._queued_sent
+                try:
+                    await asyncio.sleep(DATAPOINT_COALESCE_DELAY)
+                    datapoint_ids = list(self._queued_datapoints)
+                    self._queued_datapoints = {}
+                    self._queued_sent = None
+                    await self._owner._send_datapoints(datapoint_ids)
+                except asyncio.CancelledError:
+                    if self._queued_sent is sent:
+                        self._queued_datapoints = {}
+                        self._queued_sent = None
+                    sent.cancel()
+                    raise
+                except Exception as ex:  # noqa: BLE001 - raised to the writers
+                    sent.set_exception(ex)
+                else:
+                    sent.set_result(None)
+        finally:
+            self._queue_task = None
 
 
 @dataclass
@@ -290,14 +469,33 @@ class TuyaBLEDevice:
         self._device_info: TuyaBLEDeviceCredentials | None = None
         self._ble_device = ble_device
         self._advertisement_data = advertisement_data
-        self._operation_lock = asyncio.Lock()
+        # Frame-level protocol trace goes to a per-device child logger, so a
+        # single device can be set to DEBUG without tracing all of them.
+        self._trace_logger = _LOGGER.getChild(
+            ble_device.address.replace(":", "").replace("-", "").lower()
+        )
+        self._operation_lock = TuyaBLEOperationScheduler()
         self._connect_lock = asyncio.Lock()
         self._client: BleakClientWithServiceCache | None = None
         self._characteristic_notify = CHARACTERISTIC_NOTIFY
         self._characteristic_write = CHARACTERISTIC_WRITE
+        self._gatt_mtu = GATT_MTU
+        self._write_window = GATT_WRITE_WINDOW
+        self._connect_priority: int | None = None
+        self._reconnect_policy = TuyaBLEReconnectPolicy()
+        self._reconnect_wanted = False
+        self._reconnect_not_before = 0.0
+        self._reconnect_task: asyncio.Task[None] | None = None
+        self._reconnect_timer: asyncio.TimerHandle | None = None
+        self._reconnect_rssi_min = RECONNECT_RSSI_MIN
+        self._last_seen: float | None = None
+        self._idle_timeout: float | None = None
+        self._idle_timeout_set = False
+        self._idle_client: BleakClientWithServiceCache | None = None
         self._expected_disconnect = False
         self._connected_callbacks: list[Callable[[], None]] = []
         self._callbacks: list[Callable[[list[TuyaBLEDataPoint]], None]] = []
+        self._changed_callbacks: list[Callable[[list[TuyaBLEDataPoint]], None]] = []
         self._disconnected_callbacks: list[Callable[[], None]] = []
         self._current_seq_num = 1
         self._seq_num_lock = asyncio.Lock()
@@ -317,19 +515,31 @@ class TuyaBLEDevice:
         self._login_key: bytes | None = None
         self._session_key: bytes | None = None
         self._security_material: TuyaBLESecurityMaterial | None = None
+        self._ciphers: dict[int, TuyaBLECipher] = {}
 
         self._is_paired = False
+        self._gatt_profile: TuyaBLEGattProfile | None = None
+        self._fd50_handshake = False
+        self._connect_time: float | None = None
 
         self._input_buffer: bytearray | None = None
+        self._input_view: memoryview | None = None
+        self._input_length = 0
         self._input_expected_packet_num = 0
         self._input_expected_length = 0
         self._input_expected_responses: dict[int, asyncio.Future[int] | None] = {}
+        self._rtt = TuyaBLERTTEstimator()
         # self._input_future: asyncio.Future[int] | None = None
 
         self._datapoints = TuyaBLEDataPoints(self)
 
         self._function = {}
         self._status_range = {}
+        self._schema_cache: dict[Hashable, Any] = {}
+        self._status: dict[str, Any] = {}
+        self._status_view: Mapping[str, Any] = MappingProxyType(self._status)
+        # Codes of each datapoint in the status, None until it is built.
+        self._status_codes: dict[int, list[str]] | None = None
 
     def set_ble_device_and_advertisement_data(
         self, ble_device: BLEDevice, advertisement_data: AdvertisementData
@@ -337,11 +547,58 @@ class TuyaBLEDevice:
         """Set the ble device."""
         self._ble_device = ble_device
         self._advertisement_data = advertisement_data
+        self._last_seen = time.monotonic()
+        if self._reconnect_policy.half_open():
+            _LOGGER.debug("%s: Advertising again; RSSI: %s", self.address, self.rssi)
+        if self._reconnect_wanted:
+            self._maybe_reconnect()
+
+    def _maybe_reconnect(self) -> None:
+        """Start a wanted reconnect if the device is advertising usably."""
+        self._reconnect_timer = None
+        if not self._reconnect_wanted or self._expected_disconnect:
+            return
+        if self._client and self._client.is_connected:
+            self._reconnect_wanted = False
+            return
+        if self._reconnect_task is not None or self._reconnect_policy.is_open:
+            return
+        now = time.monotonic()
+        if now < self._reconnect_not_before:
+            return
+        if (
+            self._last_seen is None
+            or now - self._last_seen > RECONNECT_ADVERTISEMENT_MAX_AGE
+        ):
+            return
+        rssi = self.rssi
+        if rssi is not None and rssi < self._reconnect_rssi_min:
+            return
+        self._start_reconnect()
+
+    def _start_reconnect(self) -> None:
+        """Start a reconnect unless one is already running."""
+        if self._reconnect_task is None:
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    def _schedule_reconnect(self, delay: float) -> None:
+        """Retry on the first usable advertisement once delay has passed."""
+        self._reconnect_wanted = True
+        self._reconnect_not_before = time.monotonic() + delay
+        if self._reconnect_timer is not None:
+            self._reconnect_timer.cancel()
+        self._reconnect_timer = asyncio.get_running_loop().call_later(
+            delay, self._maybe_reconnect
+        )
 
     async def initialize(self) -> None:
         _LOGGER.debug("%s: Initializing", self.address)
         if await self._update_device_info():
             self._decode_advertisement_data()
+        if self._device_manager:
+            self._gatt_profile = await self._device_manager.get_gatt_profile(
+                self.address
+            )
 
     def _requires_fd50_device_info_handshake(self) -> bool:
         """Return whether this device needs the TuyaOS FD50 login framing."""
@@ -373,7 +630,15 @@ class TuyaBLEDevice:
 
     async def update(self) -> None:
         _LOGGER.debug("%s: Updating", self.address)
-        await self._send_packet(TuyaBLECode.FUN_SENDER_DEVICE_STATUS, bytes())
+        try:
+            await self._send_packet(
+                TuyaBLECode.FUN_SENDER_DEVICE_STATUS,
+                bytes(),
+                priority=OPERATION_PRIORITY_POLL,
+                key=TuyaBLECode.FUN_SENDER_DEVICE_STATUS,
+            )
+        except TuyaBLEOperationSupersededError:
+            _LOGGER.debug("%s: Status request replaced by a newer one", self.address)
 
     async def _update_device_info(self) -> bool:
         if self._device_info is None:
@@ -396,6 +661,7 @@ class TuyaBLEDevice:
         return self._device_info is not None
 
     def append_functions(self, function: list[dict], status_range: list[dict]) -> None:
+        self._invalidate_schema()
         if function:
             for f in function:
                 dpcode = f.get("code")
@@ -429,6 +695,13 @@ class TuyaBLEDevice:
                 if f := self.status_range.get(key) and not f.values:
                     f.values = values
 
+        self._invalidate_schema()
+
+    def _invalidate_schema(self) -> None:
+        """Drop values resolved from the functions and status ranges."""
+        self._schema_cache.clear()
+        self._status_codes = None
+
     def _decode_advertisement_data(self) -> None:
         raw_product_id: bytes | None = None
         # raw_product_key: bytes | None = None
@@ -547,6 +820,15 @@ class TuyaBLEDevice:
     def status_range(self) -> dict(str, dict):
         return self._status_range
 
+    @property
+    def schema_cache(self) -> dict[Hashable, Any]:
+        """Values resolved from the functions and status ranges.
+
+        Cleared when descriptions are added; callers changing the functions
+        or status ranges directly have to clear it themselves.
+        """
+        return self._schema_cache
+
     @property
     def device_version(self) -> str:
         return self._device_version
@@ -559,27 +841,153 @@ class TuyaBLEDevice:
     def protocol_version(self) -> str:
         return self._protocol_version_str
 
+    @property
+    def gatt_mtu(self) -> int:
+        """Return the payload size of a single GATT write."""
+        return self._gatt_mtu
+
+    @property
+    def is_connected(self) -> bool:
+        """Return whether the device is connected and paired."""
+        return bool(self._client and self._client.is_connected and self._is_paired)
+
+    @property
+    def holds_connection(self) -> bool:
+        """Return whether the device holds a live BLE connection."""
+        return bool(self._client and self._client.is_connected)
+
+    @property
+    def is_busy(self) -> bool:
+        """Return whether a connect, write or response wait is in progress."""
+        return bool(
+            self._connect_lock.locked()
+            or self._operation_lock.locked()
+            or self._input_expected_responses
+        )
+
+    @property
+    def idle_timeout(self) -> float | None:
+        """Return the idle seconds before disconnecting, None stays connected."""
+        if self._idle_timeout_set:
+            return self._idle_timeout
+        return IDLE_DISCONNECT_CATEGORIES.get(self.category, IDLE_DISCONNECT_DEFAULT)
+
+    @idle_timeout.setter
+    def idle_timeout(self, timeout: float | None) -> None:
+        """Override the idle timeout of the device category."""
+        self._idle_timeout = timeout
+        self._idle_timeout_set = True
+
+    @property
+    def connect_source(self) -> str:
+        """Return the adapter or proxy the device is reached through."""
+        return get_connection_source(self._ble_device)
+
+    @property
+    def connect_priority(self) -> int:
+        """Return the connect queue priority, lower values connect first."""
+        if self._connect_priority is not None:
+            return self._connect_priority
+        return CONNECT_PRIORITY_CATEGORIES.get(self.category, CONNECT_PRIORITY_DEFAULT)
+
+    @connect_priority.setter
+    def connect_priority(self, priority: int | None) -> None:
+        """Override the connect priority, None follows the device category."""
+        self._connect_priority = priority
+
+    @property
+    def reconnect_pending(self) -> bool:
+        """Return whether the device waits for an advertisement to reconnect."""
+        return self._reconnect_wanted
+
+    @property
+    def reconnect_rssi_min(self) -> int:
+        """Return the weakest advertisement RSSI that triggers a reconnect."""
+        return self._reconnect_rssi_min
+
+    @reconnect_rssi_min.setter
+    def reconnect_rssi_min(self, rssi: int) -> None:
+        """Set the weakest advertisement RSSI that triggers a reconnect."""
+        self._reconnect_rssi_min = rssi
+
+    @property
+    def reconnect_state(self) -> str:
+        """Return the reconnect circuit breaker state."""
+        return self._reconnect_policy.state
+
+    @property
+    def connect_time(self) -> float | None:
+        """Return the seconds the last connect took until paired."""
+        return self._connect_time
+
+    @property
+    def suppressed_writes(self) -> int:
+        """Return the number of writes skipped as the value was already current."""
+        return self._datapoints.suppressed_writes
+
+    @property
+    def response_rtt(self) -> dict[str, float]:
+        """Return the smoothed response time in ms per request code."""
+        return {
+            code.name: round(rtt * 1000, 1)
+            for code, rtt in self._rtt.smoothed_rtts().items()
+        }
+
+    @property
+    def write_window(self) -> int:
+        """Return how many GATT writes may be in flight at once."""
+        return self._write_window
+
+    @write_window.setter
+    def write_window(self, window: int) -> None:
+        """Set how many GATT writes may be in flight, 1 writes serially."""
+        if window < 1:
+            raise ValueError("GATT write window must be at least 1")
+        self._write_window = window
+
+    @property
+    def protocol_trace(self) -> bool:
+        """Return whether frames of this device are traced."""
+        return self._trace_logger.isEnabledFor(logging.DEBUG)
+
+    @protocol_trace.setter
+    def protocol_trace(self, enabled: bool) -> None:
+        """Force frame tracing on, or fall back to the module log level."""
+        self._trace_logger.setLevel(logging.DEBUG if enabled else logging.NOTSET)
+
     @property
     def datapoints(self) -> TuyaBLEDataPoints:
         """Get datapoints exposed by device."""
         return self._datapoints
 
     @property
-    def status(self) -> dict[str, Any]:
+    def status(self) -> Mapping[str, Any]:
         """Get current datapoints values."""
-
-        result = {}
-        dps = self.datapoints._datapoints
-        if dps:
-            order = [self.status_range, self.function]
-            for functions in order:
-                for dpcode in functions:
-                    f = functions[dpcode]
-                    dpid = f.dp_id
-                    v = dps.get(dpid)
-                    if v:
-                        result[dpcode] = v.value
-        return result
+        if self._status_codes is None:
+            self._build_status()
+        return self._status_view
+
+    def _build_status(self) -> None:
+        """Index the codes of each datapoint and fill the status from scratch."""
+        dp_ids: dict[str, int] = {}
+        for functions in (self.status_range, self.function):
+            for dpcode, f in functions.items():
+                dp_ids[dpcode] = f.dp_id
+
+        self._status_codes = {}
+        self._status.clear()
+        dps = self._datapoints._datapoints
+        for dpcode, dp_id in dp_ids.items():
+            self._status_codes.setdefault(dp_id, []).append(dpcode)
+            if dp := dps.get(dp_id):
+                self._status[dpcode] = dp.value
+
+    def _update_status(self, datapoint: TuyaBLEDataPoint) -> None:
+        """Copy a new datapoint value into the status."""
+        if self._status_codes is None:
+            return
+        for dpcode in self._status_codes.get(datapoint.id, ()):
+            self._status[dpcode] = datapoint.value
 
     def datapoint_log_payload(self) -> dict[Hashable, Any]:
         """Creates a dict of printable values"""
@@ -621,21 +1029,36 @@ class TuyaBLEDevice:
         self._connected_callbacks.append(callback)
         return unregister_callback
 
-    def _fire_callbacks(self, datapoints: list[TuyaBLEDataPoint]) -> None:
-        """Fire the callbacks."""
+    def _fire_callbacks(
+        self,
+        datapoints: list[TuyaBLEDataPoint],
+        changed: list[TuyaBLEDataPoint] | None = None,
+    ) -> None:
+        """Fire the callbacks, with the changed datapoints for changed only ones."""
         for callback in self._callbacks:
             callback(datapoints)
+        if changed is None:
+            changed = datapoints
+        if changed:
+            for callback in self._changed_callbacks:
+                callback(changed)
 
     def register_callback(
         self,
         callback: Callable[[list[TuyaBLEDataPoint]], None],
+        changed_only: bool = False,
     ) -> Callable[[], None]:
-        """Register a callback to be called when the state changes."""
+        """Register a callback to be called when the state changes.
+
+        With changed_only, reports repeating the previous value are left out
+        and the callback is not called for frames without a change.
+        """
+        callbacks = self._changed_callbacks if changed_only else self._callbacks
 
         def unregister_callback() -> None:
-            self._callbacks.remove(callback)
+            callbacks.remove(callback)
 
-        self._callbacks.append(callback)
+        callbacks.append(callback)
         return unregister_callback
 
     def _fire_disconnected_callbacks(self) -> None:
@@ -662,13 +1085,25 @@ class TuyaBLEDevice:
     async def stop(self) -> None:
         """Stop the TuyaBLE."""
         _LOGGER.debug("%s: Stop", self.address)
+        connection_manager.forget(self)
         await self._execute_disconnect()
 
     def _disconnected(self, client: BleakClientWithServiceCache) -> None:
         """Disconnected callback."""
+        # Callbacks of clients let go of arrive late, possibly while a newer
+        # connection is up, and must leave its state alone.
+        if client is self._idle_client:
+            _LOGGER.debug("%s: Disconnected while idle", self.address)
+            return
+        if self._client is not None and client is not self._client:
+            _LOGGER.debug("%s: Previous connection disconnected", self.address)
+            return
         was_paired = self._is_paired
         self._is_paired = False
         self._clean_input()
+        self._ciphers.clear()
+        self._datapoints._forget_reports()
+        self._gatt_mtu = GATT_MTU
         if self._expected_disconnect:
             _LOGGER.debug(
                 "%s: Disconnected from device; RSSI: %s",
@@ -679,6 +1114,9 @@ class TuyaBLEDevice:
             return
         dropped_client = self._client
         self._client = None
+        connection_manager.release(self)
+        # The link was up until now, which is as good as an advertisement.
+        self._last_seen = time.monotonic()
         _LOGGER.warning(
             "%s: Device unexpectedly disconnected; RSSI: %s",
             self.address,
@@ -735,6 +1173,9 @@ class TuyaBLEDevice:
         acts on the device, so there is nothing here for it to disturb.
         """
         await self._release_client(client)
+        if self._reconnect_task is not None:
+            return
+        self._reconnect_task = asyncio.current_task()
         await self._reconnect()
 
     def _disconnect(self) -> None:
@@ -749,8 +1190,39 @@ class TuyaBLEDevice:
         )
         await self._execute_disconnect()
 
+    async def _execute_idle_disconnect(self) -> None:
+        """Release an idle connection, the next command reconnects."""
+        async with self._connect_lock:
+            client = self._client
+            if (
+                self._operation_lock.locked()
+                or self._input_expected_responses
+                or not (client and client.is_connected)
+            ):
+                connection_manager.settle(self)
+                return
+            self._idle_client = client
+            self._client = None
+            self._is_paired = False
+            try:
+                await client.stop_notify(self._characteristic_notify)
+                await client.disconnect()
+            except Exception:  # noqa: BLE001 - the slot is given up either way
+                _LOGGER.debug("%s: Idle disconnect failed", self.address, exc_info=True)
+            finally:
+                connection_manager.settle(self)
+        self._clean_input()
+        self._ciphers.clear()
+        self._datapoints._forget_reports()
+        async with self._seq_num_lock:
+            self._current_seq_num = 1
+
     async def _execute_disconnect(self) -> None:
         """Execute disconnection."""
+        self._reconnect_wanted = False
+        if self._reconnect_timer is not None:
+            self._reconnect_timer.cancel()
+            self._reconnect_timer = None
         async with self._connect_lock:
             client = self._client
             self._expected_disconnect = True
@@ -758,13 +1230,23 @@ class TuyaBLEDevice:
             if client and client.is_connected:
                 await client.stop_notify(self._characteristic_notify)
                 await client.disconnect()
+        connection_manager.release(self)
         self._clean_input()
+        self._ciphers.clear()
+        self._datapoints._forget_reports()
         async with self._seq_num_lock:
             self._current_seq_num = 1
 
     async def _ensure_connected(self) -> None:
         """Ensure connection to device is established."""
-        global global_connect_lock
+        if self._expected_disconnect or self.is_connected:
+            return
+        try:
+            await self._int_ensure_connected()
+        finally:
+            connection_manager.settle(self)
+
+    async def _int_ensure_connected(self) -> None:
         if self._expected_disconnect:
             return
         if self._connect_lock.locked():
@@ -777,22 +1259,53 @@ class TuyaBLEDevice:
         if self._client and self._client.is_connected and self._is_paired:
             return
         async with self._connect_lock:
+            started = time.monotonic()
             # Check again while holding the lock
             await asyncio.sleep(0.01)
             if self._client and self._client.is_connected and self._is_paired:
                 return
-            attempts_count = 100
-            while attempts_count > 0:
-                attempts_count -= 1
-                if attempts_count == 0:
-                    _LOGGER.error(
-                        "%s: Connecting, all attempts failed; RSSI: %s",
-                        self.address,
-                        self.rssi,
-                    )
-                    raise BleakNotFoundError()
+            policy = self._reconnect_policy
+            if policy.is_open:
+                _LOGGER.debug(
+                    "%s: Not connecting until the device advertises again",
+                    self.address,
+                )
+                raise BleakNotFoundError()
+            not_found = False
+            logging_in = False
+            for attempt in range(CONNECT_ATTEMPTS):
+                if attempt > 0:
+                    if logging_in:
+                        self._forget_gatt_profile()
+                    # Give the slot back while backing off, so a device that
+                    # cannot be reached does not keep it from others.
+                    connection_manager.settle(self)
+                    policy.record_failure(not_found)
+                    if policy.is_open:
+                        _LOGGER.warning(
+                            "%s: Device repeatedly not found, not connecting"
+                            " until it advertises again; RSSI: %s",
+                            self.address,
+                            self.rssi,
+                        )
+                        raise BleakNotFoundError()
+                    delay = policy.next_delay()
+                    if time.monotonic() - started + delay > CONNECT_RETRY_BUDGET:
+                        _LOGGER.error(
+                            "%s: Connecting, gave up after %s attempts; RSSI: %s",
+                            self.address,
+                            attempt,
+                            self.rssi,
+                        )
+                        raise BleakNotFoundError()
+                    await asyncio.sleep(delay)
+                not_found = False
+                logging_in = False
+                await connection_manager.acquire(self)
                 try:
-                    async with global_connect_lock:
+                    async with connect_scheduler.slot(
+                        self.connect_source, self.connect_priority
+                    ):
                         _LOGGER.debug(
                             "%s: Connecting; RSSI: %s", self.address, self.rssi
                         )
@@ -811,6 +1324,7 @@ class TuyaBLEDevice:
                         self.rssi,
                         exc_info=True,
                     )
+                    not_found = True
                     continue
                 except BLEAK_EXCEPTIONS as ex:
                     if "Bluetooth is already shutdown" in str(ex):
@@ -836,18 +1350,12 @@ class TuyaBLEDevice:
                 if client and client.is_connected:
                     _LOGGER.debug("%s: Connected; RSSI: %s", self.address, self.rssi)
                     self._client = client
-                    self._characteristic_notify = CHARACTERISTIC_NOTIFY
-                    self._characteristic_write = CHARACTERISTIC_WRITE
-                    # Support for additional GATT characteristics from @Shirkamdev
-                    for notify_uuid, write_uuid in SERVICE_CHARACTERISTICS.values():
-                        if client.services.get_characteristic(notify_uuid):
-                            self._characteristic_notify = notify_uuid
-                            self._characteristic_write = write_uuid
-                            break
+                    self._apply_gatt_profile(client)
+                    self._update_gatt_mtu(client)
                     try:
                         notify_kwargs = (
                             {"bluez": {"use_start_notify": True}}
-                            if self._requires_fd50_device_info_handshake()
+                            if self._fd50_handshake
                             else {}
                         )
                         await self._client.start_notify(
@@ -873,15 +1381,12 @@ class TuyaBLEDevice:
                     continue
 
                 if self._client and self._client.is_connected:
+                    logging_in = True
                     _LOGGER.debug("%s: Sending device info request", self.address)
                     try:
                         if not await self._send_packet_while_connected(
                             TuyaBLECode.FUN_SENDER_DEVICE_INFO,
-                            (
-                                b"\x00\xf3"
-                                if self._requires_fd50_device_info_handshake()
-                                else bytes(0)
-                            ),
+                            (b"\x00\xf3" if self._fd50_handshake else bytes(0)),
                             0,
                             True,
                         ):
@@ -940,12 +1445,37 @@ class TuyaBLEDevice:
                 else:
                     continue
 
+                policy.record_success()
+                self._connect_time = time.monotonic() - started
+                _LOGGER.debug(
+                    "%s: Paired in %.0f ms", self.address, self._connect_time * 1000
+                )
+                profile = TuyaBLEGattProfile(
+                    self._characteristic_notify,
+                    self._characteristic_write,
+                    self._fd50_handshake,
+                )
+                if profile != self._gatt_profile:
+                    self._gatt_profile = profile
+                    await self._save_gatt_profile(profile)
                 break
+            else:
+                if logging_in:
+                    self._forget_gatt_profile()
+                policy.record_failure(not_found)
+                _LOGGER.error(
+                    "%s: Connecting, all attempts failed; RSSI: %s",
+                    self.address,
+                    self.rssi,
+                )
+                raise BleakNotFoundError()
 
         if self._client:
             if self._client.is_connected:
                 if self._is_paired:
                     _LOGGER.debug("%s: Successfully connected", self.address)
+                    self._idle_client = None
+                    connection_manager.track(self)
                     self._fire_connected_callbacks()
                 else:
                     _LOGGER.error("%s: Connected but not paired", self.address)
@@ -954,9 +1484,79 @@ class TuyaBLEDevice:
         else:
             _LOGGER.error("%s: No client device", self.address)
 
+    def _apply_gatt_profile(self, client: BleakClientWithServiceCache) -> None:
+        """Use the stored GATT profile if the device still offers it."""
+        profile = self._gatt_profile
+        if profile is not None:
+            if client.services.get_characteristic(profile.characteristic_notify):
+                self._characteristic_notify = profile.characteristic_notify
+                self._characteristic_write = profile.characteristic_write
+                self._fd50_handshake = profile.fd50_handshake
+                return
+            _LOGGER.debug(
+                "%s: Stored GATT profile no longer matches, probing", self.address
+            )
+            self._gatt_profile = None
+        self._select_characteristics(client)
+        self._fd50_handshake = self._requires_fd50_device_info_handshake()
+
+    def _forget_gatt_profile(self) -> None:
+        """Probe again after a failed login, the stored profile may be stale."""
+        if self._gatt_profile is not None:
+            _LOGGER.debug(
+                "%s: Login failed with the stored GATT profile, probing again",
+                self.address,
+            )
+            self._gatt_profile = None
+
+    async def _save_gatt_profile(self, profile: TuyaBLEGattProfile) -> None:
+        if not self._device_manager:
+            return
+        try:
+            await self._device_manager.save_gatt_profile(self.address, profile)
+        except Exception:  # noqa: BLE001 - it only costs a probe next time
+            _LOGGER.debug(
+                "%s: Storing GATT profile failed", self.address, exc_info=True
+            )
+
+    def _select_characteristics(self, client: BleakClientWithServiceCache) -> None:
+        """Pick the notify and write characteristics the device offers."""
+        self._characteristic_notify = CHARACTERISTIC_NOTIFY
+        self._characteristic_write = CHARACTERISTIC_WRITE
+        # Support for additional GATT characteristics from @Shirkamdev
+        for notify_uuid, write_uuid in SERVICE_CHARACTERISTICS.values():
+            if client.services.get_characteristic(notify_uuid):
+                self._characteristic_notify = notify_uuid
+                self._characteristic_write = write_uuid
+                break
+
+    def _update_gatt_mtu(self, client: BleakClientWithServiceCache) -> None:
+        """Size outgoing fragments from the negotiated ATT MTU."""
+        self._gatt_mtu = GATT_MTU
+        characteristic = client.services.get_characteristic(self._characteristic_write)
+        if characteristic is None:
+            return
+        try:
+            # bleak reports the ATT MTU minus the 3 byte write command header.
+            size = characteristic.max_write_without_response_size
+        except Exception:  # noqa: BLE001 - backend specific, fall back to 20
+            _LOGGER.debug("%s: Reading MTU failed", self.address, exc_info=True)
+            return
+        if isinstance(size, int) and size > GATT_MTU:
+            self._gatt_mtu = size
+        _LOGGER.debug("%s: GATT write size: %s", self.address, self._gatt_mtu)
+
     async def _reconnect(self) -> None:
         """Attempt a reconnect"""
+        try:
+            await self._int_reconnect()
+        finally:
+            if self._reconnect_task is asyncio.current_task():
+                self._reconnect_task = None
+
+    async def _int_reconnect(self) -> None:
         _LOGGER.debug("%s: Reconnect, ensuring connection", self.address)
+        self._reconnect_wanted = False
         async with self._seq_num_lock:
             self._current_seq_num = 1
         try:
@@ -973,26 +1573,19 @@ class TuyaBLEDevice:
                     self.address,
                 )
                 return
+            delay = self._reconnect_policy.next_delay()
             _LOGGER.debug(
-                "%s: Reconnect, failed to ensure connection - backing off",
+                "%s: Reconnect, failed to ensure connection - retrying on an"
+                " advertisement after %.1fs",
                 self.address,
+                delay,
                 exc_info=True,
             )
-            await asyncio.sleep(BLEAK_BACKOFF_TIME)
-            _LOGGER.debug("%s: Reconnecting again", self.address)
-            asyncio.create_task(self._reconnect())
+            self._schedule_reconnect(delay)
 
     @staticmethod
     def _calc_crc16(data: bytes) -> int:
-        crc = 0xFFFF
-        for byte in data:
-            crc ^= byte & 255
-            for _ in range(8):
-                tmp = crc & 1
-                crc >>= 1
-                if tmp != 0:
-                    crc ^= 0xA001
-        return crc
+        return crc16(data)
 
     @staticmethod
     def _pack_int(value: int) -> bytearray:
@@ -1026,6 +1619,19 @@ class TuyaBLEDevice:
         else:
             return (result, start_pos + offset)
 
+    @staticmethod
+    def _encode_frame(
+        seq_num: int, response_to: int, code: TuyaBLECode, data: bytes
+    ) -> bytearray:
+        """Build the padded plaintext frame in one preallocated buffer."""
+        data_end = FRAME_HEADER.size + len(data)
+        crc_end = data_end + FRAME_CRC.size
+        raw = bytearray((crc_end + 15) & ~15)
+        FRAME_HEADER.pack_into(raw, 0, seq_num, response_to, code.value, len(data))
+        raw[FRAME_HEADER.size : data_end] = data
+        FRAME_CRC.pack_into(raw, data_end, crc16(memoryview(raw)[:data_end]))
+        return raw
+
     def _build_packets(
         self,
         seq_num: int,
@@ -1033,30 +1639,20 @@ class TuyaBLEDevice:
         data: bytes,
         response_to: int = 0,
     ) -> list[bytes]:
-        key: bytes
         iv = secrets.token_bytes(16)
         security_flag: bytes
         fd50_device_info = (
-            code == TuyaBLECode.FUN_SENDER_DEVICE_INFO
-            and self._requires_fd50_device_info_handshake()
+            code == TuyaBLECode.FUN_SENDER_DEVICE_INFO and self._fd50_handshake
         )
         if code == TuyaBLECode.FUN_SENDER_DEVICE_INFO:
-            key = self._login_key
-            security_flag = pack(">B", self._security_material.login_flag)
+            flag = self._security_material.login_flag
         else:
-            key = self._session_key
-            security_flag = pack(">B", self._security_material.session_flag)
+            flag = self._security_material.session_flag
+        cipher = self._get_cipher(flag)
+        security_flag = pack(">B", flag)
 
-        raw = bytearray()
-        raw += pack(">IIHH", seq_num, response_to, code.value, len(data))
-        raw += data
-        crc = self._calc_crc16(raw)
-        raw += pack(">H", crc)
-        while len(raw) % 16 != 0:
-            raw += b"\x00"
-
-        cipher = AES.new(key, AES.MODE_CBC, iv)
-        encrypted = security_flag + iv + cipher.encrypt(raw)
+        raw = self._encode_frame(seq_num, response_to, code, data)
+        encrypted = security_flag + iv + cipher.encrypt(iv, raw)
 
         command = []
         packet_num = 0
@@ -1074,7 +1670,7 @@ class TuyaBLEDevice:
                 packet += pack(">B", packet_protocol_version << 4)
 
             data_part = encrypted[
-                pos:pos + GATT_MTU - len(packet)  # fmt: skip
+                pos:pos + self._gatt_mtu - len(packet)  # fmt: skip
             ]
             packet += data_part
             command.append(packet)
@@ -1096,6 +1692,8 @@ class TuyaBLEDevice:
         data: bytes,
         wait_for_response: bool = True,
         # retry: int | None = None,
+        priority: int = OPERATION_PRIORITY_COMMAND,
+        key: Hashable | None = None,
     ) -> None:
         """Send packet to device and optional read response."""
         if self._expected_disconnect:
@@ -1103,7 +1701,9 @@ class TuyaBLEDevice:
         await self._ensure_connected()
         if self._expected_disconnect:
             return
-        await self._send_packet_while_connected(code, data, 0, wait_for_response)
+        await self._send_packet_while_connected(
+            code, data, 0, wait_for_response, priority, key
+        )
 
     async def _send_response(
         self,
@@ -1113,7 +1713,9 @@ class TuyaBLEDevice:
     ) -> None:
         """Send response to received packet."""
         if self._client and self._client.is_connected:
-            await self._send_packet_while_connected(code, data, response_to, False)
+            await self._send_packet_while_connected(
+                code, data, response_to, False, OPERATION_PRIORITY_RESPONSE
+            )
 
     async def _send_packet_while_connected(
         self,
@@ -1122,49 +1724,97 @@ class TuyaBLEDevice:
         response_to: int,
         wait_for_response: bool,
         # retry: int | None = None
+        priority: int = OPERATION_PRIORITY_COMMAND,
+        key: Hashable | None = None,
     ) -> bool:
         """Send packet to device and optional read response."""
         result = True
         future: asyncio.Future | None = None
         seq_num = await self._get_seq_num()
+        connection_manager.touch(self)
         if wait_for_response:
             future = asyncio.Future()
             self._input_expected_responses[seq_num] = future
 
-        if response_to > 0:
-            _LOGGER.debug(
-                "%s: Sending packet: #%s %s in response to #%s",
-                self.address,
-                seq_num,
-                code.name,
-                response_to,
-            )
-        else:
+        if self._trace_logger.isEnabledFor(logging.DEBUG):
+            if response_to > 0:
+                self._trace_logger.debug(
+                    "%s: Sending packet: #%s %s in response to #%s",
+                    self.address,
+                    seq_num,
+                    code.name,
+                    response_to,
+                )
+            else:
+                self._trace_logger.debug(
+                    "%s: Sending packet: #%s %s",
+                    self.address,
+                    seq_num,
+                    code.name,
+                )
+        packets: list[bytes] = self._build_packets(seq_num, code, data, response_to)
+        try:
+            await self._int_send_packet_while_connected(packets, priority, key)
+            if future:
+                result = await self._wait_for_response(
+                    code, seq_num, future, packets, priority
+                )
+        finally:
+            if future:
+                self._input_expected_responses.pop(seq_num, None)
+
+        return result
+
+    async def _wait_for_response(
+        self,
+        code: TuyaBLECode,
+        seq_num: int,
+        future: asyncio.Future[int],
+        packets: list[bytes],
+        priority: int = OPERATION_PRIORITY_COMMAND,
+    ) -> bool:
+        """Wait for the response to a sent frame, retransmitting it on timeout."""
+        attempt = 0
+        while True:
+            timeout = self._rtt.timeout(code, attempt)
+            sent = time.monotonic()
+            done, _ = await asyncio.wait((future,), timeout=timeout)
+            if done:
+                future.result()
+                # The answer to a retransmitted frame may belong to either
+                # copy, so only first attempts are sampled.
+                if attempt == 0:
+                    self._rtt.add_sample(code, time.monotonic() - sent)
+                return True
+            if (
+                attempt >= RESPONSE_RETRANSMITS
+                or self._expected_disconnect
+                or not (self._client and self._client.is_connected)
+            ):
+                break
+            attempt += 1
             _LOGGER.debug(
-                "%s: Sending packet: #%s %s",
+                "%s: No response to #%s %s in %.1f s, retransmitting; RSSI: %s",
                 self.address,
                 seq_num,
                 code.name,
+                timeout,
+                self.rssi,
             )
-        packets: list[bytes] = self._build_packets(seq_num, code, data, response_to)
-        await self._int_send_packet_while_connected(packets)
-        if future:
-            try:
-                await asyncio.wait_for(future, RESPONSE_WAIT_TIMEOUT)
-            except asyncio.TimeoutError:
-                _LOGGER.error(
-                    "%s: timeout receiving response, RSSI: %s",
-                    self.address,
-                    self.rssi,
-                )
-                result = False
-            self._input_expected_responses.pop(seq_num, None)
+            await self._int_send_packet_while_connected(packets, priority)
 
-        return result
+        _LOGGER.error(
+            "%s: timeout receiving response, RSSI: %s",
+            self.address,
+            self.rssi,
+        )
+        return False
 
     async def _int_send_packet_while_connected(
         self,
         packets: list[bytes],
+        priority: int = OPERATION_PRIORITY_COMMAND,
+        key: Hashable | None = None,
     ) -> None:
         if self._operation_lock.locked():
             _LOGGER.debug(
@@ -1173,7 +1823,7 @@ class TuyaBLEDevice:
                 self.address,
                 self.rssi,
             )
-        async with self._operation_lock:
+        async with self._operation_lock.slot(priority, key):
             try:
                 await self._send_packets_locked(packets)
             except BleakNotFoundError:
@@ -1223,7 +1873,7 @@ class TuyaBLEDevice:
             if self._is_paired:
                 asyncio.create_task(self._resend_packets(packets))
             else:
-                asyncio.create_task(self._reconnect())
+                self._start_reconnect()
             raise BleakError from ex
         except BleakError as ex:
             if "Bluetooth is already shutdown" in str(ex):
@@ -1242,42 +1892,61 @@ class TuyaBLEDevice:
             if self._is_paired:
                 asyncio.create_task(self._resend_packets(packets))
             else:
-                asyncio.create_task(self._reconnect())
+                self._start_reconnect()
             raise
 
     async def _int_send_packets_locked(self, packets: list[bytes]) -> None:
         """Execute command and read response."""
-        for packet in packets:
-            if self._client:
-                try:
-                    # _LOGGER.debug("%s: Sending packet: %s", self.address, packet.hex())
-                    await self._client.write_gatt_char(
-                        self._characteristic_write,
-                        packet,
-                        False,
-                    )
-                except Exception as ex:
-                    if "Bluetooth is already shutdown" in str(ex):
-                        _LOGGER.debug(
-                            "%s: Bluetooth is already shutdown during sending packet",
-                            self.address,
+        client = self._client
+        if not client:
+            _LOGGER.error(
+                "%s: Client disconnected during sending packet",
+                self.address,
+                exc_info=True,
+            )
+            raise BleakError()
+
+        # Writes without response are queued in order, up to the write window,
+        # instead of waiting for the backend to accept each fragment in turn.
+        loop = asyncio.get_running_loop()
+        pending: deque[asyncio.Future[None]] = deque()
+        try:
+            for packet in packets:
+                if len(pending) >= self._write_window:
+                    await pending.popleft()
+                pending.append(
+                    loop.create_task(
+                        client.write_gatt_char(
+                            self._characteristic_write,
+                            packet,
+                            False,
                         )
-                        raise BleakError("Bluetooth is already shutdown") from ex
-                    _LOGGER.error(
-                        "%s: Error during sending packet",
-                        self.address,
-                        exc_info=True,
                     )
-                    if self._client and self._client.is_connected:
-                        self._disconnected(self._client)
-                    raise BleakError()
-            else:
-                _LOGGER.error(
-                    "%s: Client disconnected during sending packet",
+                )
+            while pending:
+                await pending.popleft()
+        except Exception as ex:
+            if "Bluetooth is already shutdown" in str(ex):
+                _LOGGER.debug(
+                    "%s: Bluetooth is already shutdown during sending packet",
                     self.address,
-                    exc_info=True,
                 )
-                raise BleakError()
+                raise BleakError("Bluetooth is already shutdown") from ex
+            _LOGGER.error(
+                "%s: Error during sending packet",
+                self.address,
+                exc_info=True,
+            )
+            if self._client and self._client.is_connected:
+                self._disconnected(self._client)
+            raise BleakError()
+        finally:
+            # Fragments of an aborted or cancelled frame must not interleave
+            # with the next one.
+            if pending:
+                for write in pending:
+                    write.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
 
     def _get_key(self, security_flag: int) -> bytes:
         if security_flag == 1:
@@ -1291,6 +1960,17 @@ class TuyaBLEDevice:
         if security_flag == 15:
             return self._session_key
 
+    def _get_cipher(self, security_flag: int) -> TuyaBLECipher:
+        """Return the AES context for a security level, reusing its key schedule."""
+        key = self._get_key(security_flag)
+        if key is None:
+            raise TuyaBLEDataFormatError()
+        cipher = self._ciphers.get(security_flag)
+        if cipher is None or cipher.key != key:
+            cipher = TuyaBLECipher(key)
+            self._ciphers[security_flag] = cipher
+        return cipher
+
     def _parse_timestamp(self, data: bytes, start_pos: int) -> tuple(float, int):
         timestamp: float
         pos = start_pos
@@ -1315,11 +1995,10 @@ class TuyaBLEDevice:
             case _:
                 raise TuyaBLEDataFormatError()
 
-        _LOGGER.debug(
-            "%s: Received timestamp: %s",
-            self.address,
-            time.ctime(timestamp),
-        )
+        if self._trace_logger.isEnabledFor(logging.DEBUG):
+            self._trace_logger.debug(
+                "%s: Received timestamp: %s", self.address, time.ctime(timestamp)
+            )
         return (timestamp, end_pos)
 
     def _parse_datapoints(
@@ -1331,49 +2010,28 @@ class TuyaBLEDevice:
         length_size: int,
     ) -> int:
         """Parse Tuya KLV datapoints with the requested value-length width."""
-        if length_size not in (1, 2):
-            raise ValueError("Tuya KLV length width must be one or two bytes")
+        decoded, pos = decode_datapoints(data, start_pos, length_size)
 
         datapoints: list[TuyaBLEDataPoint] = []
-
-        pos = start_pos
-        header_size = 2 + length_size
-        while len(data) - pos >= header_size:
-            id: int = data[pos]
-            pos += 1
-            _type: int = data[pos]
-            if _type > TuyaBLEDataPointType.DT_BITMAP.value:
-                raise TuyaBLEDataFormatError()
-            type: TuyaBLEDataPointType = TuyaBLEDataPointType(_type)
-            pos += 1
-            data_len = int.from_bytes(data[pos : pos + length_size], "big")
-            pos += length_size
-            next_pos = pos + data_len
-            if next_pos > len(data):
-                raise TuyaBLEDataLengthError()
-            raw_value = data[pos:next_pos]
-            match type:
-                case TuyaBLEDataPointType.DT_RAW | TuyaBLEDataPointType.DT_BITMAP:
-                    value = raw_value
-                case TuyaBLEDataPointType.DT_BOOL:
-                    value = int.from_bytes(raw_value, "big") != 0
-                case TuyaBLEDataPointType.DT_VALUE | TuyaBLEDataPointType.DT_ENUM:
-                    value = int.from_bytes(raw_value, "big", signed=True)
-                case TuyaBLEDataPointType.DT_STRING:
-                    value = raw_value.decode()
-
-            _LOGGER.debug(
-                "%s: Received datapoint update, id: %s, type: %s: value: %s",
-                self.address,
-                id,
-                type.name,
-                value,
+        changed: list[TuyaBLEDataPoint] = []
+        trace = self._trace_logger.isEnabledFor(logging.DEBUG)
+        for id, type, value in decoded:
+            if trace:
+                self._trace_logger.debug(
+                    "%s: Received datapoint update, id: %s, type: %s: value: %s",
+                    self.address,
+                    id,
+                    type.name,
+                    value,
+                )
+            datapoint = self._datapoints._update_from_device(
+                id, timestamp, flags, type, value
             )
-            self._datapoints._update_from_device(id, timestamp, flags, type, value)
-            datapoints.append(self._datapoints[id])
-            pos = next_pos
+            datapoints.append(datapoint)
+            if datapoint.changed:
+                changed.append(datapoint)
 
-        self._fire_callbacks(datapoints)
+        self._fire_callbacks(datapoints, changed)
         return pos
 
     def _parse_datapoints_v3(
@@ -1409,6 +2067,9 @@ class TuyaBLEDevice:
                 srand = data[6:12]
                 self._session_key = self._security_material.session_key(srand)
                 self._auth_key = data[14:46]
+                self._ciphers[self._security_material.session_flag] = TuyaBLECipher(
+                    self._session_key
+                )
 
             case TuyaBLECode.FUN_SENDER_PAIR:
                 if len(data) != 1:
@@ -1530,37 +2191,38 @@ class TuyaBLEDevice:
                     future.set_exception(TuyaBLEDeviceError(result))
 
     def _clean_input(self) -> None:
+        if self._input_view is not None:
+            self._input_view.release()
         self._input_buffer = None
+        self._input_view = None
+        self._input_length = 0
         self._input_expected_packet_num = 0
         self._input_expected_length = 0
 
     def _parse_input(self) -> None:
-        security_flag = self._input_buffer[0]
-        key = self._get_key(security_flag)
-        iv = self._input_buffer[1:17]
-        encrypted = self._input_buffer[17:]
-
-        self._clean_input()
-
-        cipher = AES.new(key, AES.MODE_CBC, iv)
-        raw = cipher.decrypt(encrypted)
+        view = self._input_view
+        if len(view) < 17:
+            raise TuyaBLEDataLengthError()
+        # The cipher reads IV and payload straight out of the reassembly
+        # buffer; the plaintext is the only copy made of the frame.
+        try:
+            raw = self._get_cipher(view[0]).decrypt(view[1:17], view[17:])
+        finally:
+            self._clean_input()
 
         seq_num: int
         response_to: int
         _code: int
         length: int
-        seq_num, response_to, _code, length = unpack(">IIHH", raw[:12])
+        seq_num, response_to, _code, length = FRAME_HEADER.unpack_from(raw)
 
         data_end_pos = length + 12
         raw_length = len(raw)
         if raw_length < data_end_pos:
             raise TuyaBLEDataLengthError()
         if raw_length > data_end_pos:
-            calc_crc = self._calc_crc16(raw[:data_end_pos])
-            (data_crc,) = unpack(
-                ">H",
-                raw[data_end_pos:data_end_pos + 2]  # fmt: skip
-            )
+            calc_crc = self._calc_crc16(memoryview(raw)[:data_end_pos])
+            (data_crc,) = FRAME_CRC.unpack_from(raw, data_end_pos)
             if calc_crc != data_crc:
                 raise TuyaBLEDataCRCError()
         data = raw[12:data_end_pos]
@@ -1569,37 +2231,43 @@ class TuyaBLEDevice:
         try:
             code = TuyaBLECode(_code)
         except ValueError:
-            _LOGGER.debug(
-                "%s: Received unknown message: #%s %x, response to #%s, data %s",
-                self.address,
-                seq_num,
-                _code,
-                response_to,
-                data.hex(),
-            )
+            if self._trace_logger.isEnabledFor(logging.DEBUG):
+                self._trace_logger.debug(
+                    "%s: Received unknown message: #%s %x, response to #%s, data %s",
+                    self.address,
+                    seq_num,
+                    _code,
+                    response_to,
+                    data.hex(),
+                )
             return
 
-        if response_to != 0:
-            _LOGGER.debug(
-                "%s: Received: #%s %s, response to #%s",
-                self.address,
-                seq_num,
-                code.name,
-                response_to,
-            )
-        else:
-            _LOGGER.debug(
-                "%s: Received: #%s %s",
-                self.address,
-                seq_num,
-                code.name,
-            )
+        if self._trace_logger.isEnabledFor(logging.DEBUG):
+            if response_to != 0:
+                self._trace_logger.debug(
+                    "%s: Received: #%s %s, response to #%s",
+                    self.address,
+                    seq_num,
+                    code.name,
+                    response_to,
+                )
+            else:
+                self._trace_logger.debug(
+                    "%s: Received: #%s %s",
+                    self.address,
+                    seq_num,
+                    code.name,
+                )
 
+        connection_manager.touch(self)
         self._handle_command_or_response(seq_num, response_to, code, data)
 
     def _notification_handler(self, _sender: int, data: bytearray) -> None:
         """Handle notification responses."""
-        _LOGGER.debug("%s: Packet received: %s", self.address, data.hex())
+        if self._trace_logger.isEnabledFor(logging.DEBUG):
+            self._trace_logger.debug(
+                "%s: Packet received: %s", self.address, data.hex()
+            )
 
         pos: int = 0
         packet_num: int
@@ -1625,10 +2293,36 @@ class TuyaBLEDevice:
 
         if packet_num == self._input_expected_packet_num:
             if packet_num == 0:
-                self._input_buffer = bytearray()
                 self._input_expected_length, pos = self._unpack_int(data, pos)
                 pos += 1
-            self._input_buffer += data[pos:]
+                if self._input_expected_length > MAX_FRAME_LENGTH:
+                    _LOGGER.error(
+                        "%s: Frame length %s in notifications exceeds %s",
+                        self.address,
+                        self._input_expected_length,
+                        MAX_FRAME_LENGTH,
+                    )
+                    self._clean_input()
+                    return
+                # The first packet declares the size of the whole frame, so
+                # the reassembly buffer is allocated once and filled in place.
+                self._input_buffer = bytearray(self._input_expected_length)
+                self._input_view = memoryview(self._input_buffer)
+                self._input_length = 0
+            start = self._input_length
+            end = start + len(data) - pos
+            if end > self._input_expected_length:
+                _LOGGER.error(
+                    "%s: Unexpected length of data in notifications, "
+                    "received %s expected %s",
+                    self.address,
+                    end,
+                    self._input_expected_length,
+                )
+                self._clean_input()
+                return
+            self._input_view[start:end] = memoryview(data)[pos:]
+            self._input_length = end
             self._input_expected_packet_num += 1
         else:
             _LOGGER.error(
@@ -1640,18 +2334,7 @@ class TuyaBLEDevice:
             self._clean_input()
             return
 
-        if len(self._input_buffer) > self._input_expected_length:
-            _LOGGER.error(
-                "%s: Unexpected length of data in notifications, "
-                "received %s expected %s",
-                self.address,
-                len(self._input_buffer),
-                self._input_expected_length,
-            )
-            self._clean_input()
-            return
-
-        if len(self._input_buffer) == self._input_expected_length:
+        if self._input_length == self._input_expected_length:
             try:
                 self._parse_input()
             except TuyaBLEError as err:
@@ -1664,29 +2347,25 @@ class TuyaBLEDevice:
                 self._clean_input()
                 return
 
-    def _encode_datapoints(self, datapoint_ids: list[int], length_size: int) -> bytes:
+    def _encode_datapoints(
+        self, datapoint_ids: list[int], length_size: int, reserved: int = 0
+    ) -> bytearray:
         """Encode datapoints with the requested Tuya KLV value-length width."""
-        if length_size not in (1, 2):
-            raise ValueError("Tuya KLV length width must be one or two bytes")
-
-        data = bytearray()
+        datapoints: list[tuple[int, int, bytes]] = []
+        trace = self._trace_logger.isEnabledFor(logging.DEBUG)
         for dp_id in datapoint_ids:
             dp = self._datapoints[dp_id]
-            value = dp._get_value()
-            _LOGGER.debug(
-                "%s: Sending datapoint update, id: %s, type: %s: value: %s",
-                self.address,
-                dp.id,
-                dp.type.name,
-                dp.value,
-            )
-            if length_size == 1:
-                data += pack(">BBB", dp.id, int(dp.type.value), len(value))
-            else:
-                data += pack(">BBH", dp.id, int(dp.type.value), len(value))
-            data += value
+            if trace:
+                self._trace_logger.debug(
+                    "%s: Sending datapoint update, id: %s, type: %s: value: %s",
+                    self.address,
+                    dp.id,
+                    dp.type.name,
+                    dp.value,
+                )
+            datapoints.append((dp.id, dp.type.value, dp._get_value()))
 
-        return bytes(data)
+        return encode_datapoints(datapoints, length_size, reserved)
 
     async def _send_datapoints_v3(self, datapoint_ids: list[int]) -> None:
         """Send new values using the protocol-v3 DP command."""
@@ -1696,8 +2375,8 @@ class TuyaBLEDevice:
     async def _send_datapoints_v4(self, datapoint_ids: list[int]) -> None:
         """Send new values using the protocol-v4 DP command."""
         dp_seq_num = await self._get_seq_num()
-        data = pack(">BI", 0, dp_seq_num)
-        data += self._encode_datapoints(datapoint_ids, 2)
+        data = self._encode_datapoints(datapoint_ids, 2, DPS_V4_HEADER.size)
+        DPS_V4_HEADER.pack_into(data, 0, 0, dp_seq_num)
         await self._send_packet(TuyaBLECode.FUN_SENDER_DPS_V4, data)
 
     async def _send_datapoints(self, datapoint_ids: list[int]) -> None:
@@ -1709,6 +2388,27 @@ class TuyaBLEDevice:
         else:
             raise TuyaBLEDeviceError(0)
 
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[TuyaBLEDataPoints]:
+        """Send the datapoints written in the block as one frame when it ends.
+
+        Leaving the block waits until the frame is sent. The block should only
+        write datapoints: writes from elsewhere while it waits join the frame.
+        """
+        self._datapoints.begin_update()
+        try:
+            yield self._datapoints
+        finally:
+            await self._datapoints.end_update()
+
+    async def write_datapoints(
+        self, values: Iterable[tuple[TuyaBLEDataPoint, bytes | bool | int | str]]
+    ) -> None:
+        """Write datapoints in one transaction."""
+        async with self.transaction():
+            for datapoint, value in values:
+                await datapoint.set_value(value)
+
     async def set_multiple_values(self, dp_updates: dict[int, Any]) -> None:
         """Set multiple datapoint values in a single atomic BLE payload."""
         updated_dps = []
@@ -1729,6 +2429,7 @@ class TuyaBLEDevice:
             elif dp.type == TuyaBLEDataPointType.DT_STRING:
                 dp._value = str(value)
             dp._changed_by_device = False
+            self._update_status(dp)
             updated_dps.append(dp)
 
         if not updated_dps:
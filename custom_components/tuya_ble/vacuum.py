@@ -57,7 +57,7 @@ from homeassistant.const import Platform
 
 from .const import DOMAIN
 from .devices import TuyaBLEData, TuyaBLEEntity, TuyaBLEProductInfo
-from .tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
+from .tuya_ble import TuyaBLEDataPoint, TuyaBLEDataPointType, TuyaBLEDevice
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -252,6 +252,14 @@ class TuyaBLEVacuumEntity(TuyaBLEEntity, StateVacuumEntity):
         self._attr_supported_features = features
         self._attr_fan_speed_list = list(vac_mapping.fan_speed_list)
 
+    def _get_datapoint_ids(self) -> frozenset[int] | None:
+        return self._get_mapping_datapoint_ids(
+            self._vac,
+            self._vac.dp_start_bool,
+            self._vac.dp_status,
+            self._vac.dp_mode,
+        )
+
     # ------------------------------------------------------------------ helpers
 
     def _dp_value(self, dp_id: int | None) -> Any:
@@ -260,32 +268,50 @@ class TuyaBLEVacuumEntity(TuyaBLEEntity, StateVacuumEntity):
         dp = self._device.datapoints[dp_id]
         return dp.value if dp else None
 
-    def _send_bool(self, dp_id: int, value: bool) -> None:
+    def _bool_write(self, dp_id: int, value: bool) -> tuple[TuyaBLEDataPoint, bool]:
         dp = self._device.datapoints.get_or_create(
             dp_id, TuyaBLEDataPointType.DT_BOOL, value
         )
-        self._hass.create_task(dp.set_value(value))
+        return dp, value
 
-    def _send_enum(self, dp_id: int, value: int) -> None:
+    def _enum_write(self, dp_id: int, value: int) -> tuple[TuyaBLEDataPoint, int]:
         dp = self._device.datapoints.get_or_create(
             dp_id, TuyaBLEDataPointType.DT_ENUM, value
         )
-        self._hass.create_task(dp.set_value(value))
+        return dp, value
 
-    def _send_start(self) -> None:
+    def _start_writes(self) -> list[tuple[TuyaBLEDataPoint, bool | int]]:
         if self._vac.dp_start_bool is not None:
-            self._send_bool(self._vac.dp_start_bool, True)
-        elif self._vac.dp_start_enum is not None:
-            self._send_enum(self._vac.dp_start_enum, self._vac.start_enum_value)
-
-    def _send_stop(self) -> None:
+            return [self._bool_write(self._vac.dp_start_bool, True)]
+        if self._vac.dp_start_enum is not None:
+            return [
+                self._enum_write(self._vac.dp_start_enum, self._vac.start_enum_value)
+            ]
+        return []
+
+    def _stop_writes(self) -> list[tuple[TuyaBLEDataPoint, bool | int]]:
         if self._vac.dp_start_bool is not None:
-            self._send_bool(self._vac.dp_start_bool, False)
-        elif (
+            return [self._bool_write(self._vac.dp_start_bool, False)]
+        if (
             self._vac.dp_start_enum is not None
             and self._vac.stop_enum_value is not None
         ):
-            self._send_enum(self._vac.dp_start_enum, self._vac.stop_enum_value)
+            return [
+                self._enum_write(self._vac.dp_start_enum, self._vac.stop_enum_value)
+            ]
+        return []
+
+    def _send_bool(self, dp_id: int, value: bool) -> None:
+        self.send_dp_values([self._bool_write(dp_id, value)])
+
+    def _send_enum(self, dp_id: int, value: int) -> None:
+        self.send_dp_values([self._enum_write(dp_id, value)])
+
+    def _send_start(self) -> None:
+        self.send_dp_values(self._start_writes())
+
+    def _send_stop(self) -> None:
+        self.send_dp_values(self._stop_writes())
 
     # --------------------------------------------------------------- HA state
 
@@ -353,6 +379,7 @@ class TuyaBLEVacuumEntity(TuyaBLEEntity, StateVacuumEntity):
             return
         lst = self._vac.fan_speed_list
         idx = lst.index(fan_speed) if fan_speed in lst else 0
-        self._send_enum(self._vac.dp_mode, idx)
-        # Start cleaning when mode selected
-        self._send_start()
+        # Start cleaning when mode selected, in the same frame as the mode
+        self.send_dp_values(
+            [self._enum_write(self._vac.dp_mode, idx), *self._start_writes()]
+        )
@@ -1,11 +1,13 @@
 """Init tuya_ble tests"""
 
+import os
 from typing import Any
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 from bleak.backends.device import BLEDevice
 from homeassistant.components.binary_sensor import BinarySensorEntityDescription
 from homeassistant.core import HomeAssistant
+import pytest
 
 from habluetooth.central_manager import CentralBluetoothManager
 
@@ -19,6 +21,7 @@ from custom_components.tuya_ble.devices import (
 from custom_components.tuya_ble.cloud import HASSTuyaBLEDeviceManager
 from custom_components.tuya_ble.binary_sensor import TuyaBLEBinarySensorMapping
 from custom_components.tuya_ble.tuya_ble import TuyaBLEDataPointType
+from custom_components.tuya_ble.tuya_ble.manager import TuyaBLEDeviceCredentials
 
 DEVICE_NAME = "1234"
 DEVICE_ADDRESS = "00:11:22:33:44:55"
@@ -30,6 +33,13 @@ DEVICE_CONFIG = {
     "friendly_name": "Local 3G",
 }
 
+# Benchmarks print their timings instead of asserting them and only run on
+# request: TUYA_BLE_BENCHMARK=1 pytest -s
+benchmark = pytest.mark.skipif(
+    not os.environ.get("TUYA_BLE_BENCHMARK"),
+    reason="set TUYA_BLE_BENCHMARK=1 to run benchmarks",
+)
+
 mock_ble_device = BLEDevice(
     name="MockTuyaDevice", address=DEVICE_ADDRESS, rssi=-70, details=""
 )
@@ -42,6 +52,32 @@ CentralBluetoothManager.manager.async_ble_device_from_address.side_effect = (
 )
 
 
+def make_device(
+    address: str = "11:22:33:44:55:66",
+    details: Any = "",
+    *,
+    manager: Any = None,
+    category: str | None = None,
+    stub_sends: bool = False,
+) -> TuyaBLEDevice:
+    """Return a protocol-level device that is never connected.
+
+    category gives the device minimal cloud credentials and stub_sends
+    replaces datapoint writes with an AsyncMock.
+    """
+    ble_device = BLEDevice(
+        name="tuya-ble-test", address=address, details=details, rssi=-50
+    )
+    device = TuyaBLEDevice(Mock() if manager is None else manager, ble_device)
+    if category is not None:
+        device._device_info = TuyaBLEDeviceCredentials(
+            "uuid", "key", "id", category, "pid", None, None, None, None, None
+        )
+    if stub_sends:
+        device._send_datapoints = AsyncMock()
+    return device
+
+
 def _dp_type_for_value(value: Any) -> TuyaBLEDataPointType:
     if isinstance(value, bool):
         return TuyaBLEDataPointType.DT_BOOL
@@ -0,0 +1,120 @@
+"""Tests for advertisement-triggered reconnects."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDevice
+from custom_components.tuya_ble.tuya_ble.reconnect import TuyaBLEReconnectPolicy
+
+from . import make_device
+
+RETRY_DELAY = 0.01
+
+
+def _make_device() -> TuyaBLEDevice:
+    device = make_device()
+    device._reconnect_policy = TuyaBLEReconnectPolicy(
+        base=RETRY_DELAY, cap=RETRY_DELAY, rng=lambda: 1.0
+    )
+    return device
+
+
+def _advertise(device: TuyaBLEDevice, rssi: int = -60) -> None:
+    device.set_ble_device_and_advertisement_data(device._ble_device, Mock(rssi=rssi))
+
+
+async def _failed_reconnect(device: TuyaBLEDevice) -> None:
+    with patch.object(device, "_ensure_connected", AsyncMock(side_effect=OSError)):
+        await device._reconnect()
+
+
+async def test_retry_waits_for_an_advertisement() -> None:
+    """A failed reconnect is not retried blindly once its backoff expires."""
+    device = _make_device()
+    await _failed_reconnect(device)
+    assert device.reconnect_pending
+
+    with patch.object(device, "_reconnect", AsyncMock()) as reconnect:
+        await asyncio.sleep(RETRY_DELAY * 3)
+        reconnect.assert_not_awaited()
+
+        _advertise(device)
+        await asyncio.sleep(0)
+
+    reconnect.assert_awaited_once()
+
+
+async def test_advertisements_during_backoff_wait_for_the_delay() -> None:
+    """Adverts inside the backoff only arm the retry, the timer fires it."""
+    device = _make_device()
+    await _failed_reconnect(device)
+
+    with patch.object(device, "_reconnect", AsyncMock()) as reconnect:
+        _advertise(device)
+        await asyncio.sleep(0)
+        reconnect.assert_not_awaited()
+
+        await asyncio.sleep(RETRY_DELAY * 3)
+
+    reconnect.assert_awaited_once()
+
+
+async def test_burst_of_advertisements_starts_one_reconnect() -> None:
+    """Reconnects are coalesced per device."""
+    device = _make_device()
+    await _failed_reconnect(device)
+    await asyncio.sleep(RETRY_DELAY * 2)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _reconnect() -> None:
+        started.set()
+        await release.wait()
+
+    with patch.object(device, "_ensure_connected", side_effect=_reconnect) as ensure:
+        for _ in range(5):
+            _advertise(device)
+        await started.wait()
+        _advertise(device)
+        release.set()
+        await device._reconnect_task
+
+    assert ensure.await_count == 1
+    assert device._reconnect_task is None
+    assert not device.reconnect_pending
+
+
+async def test_weak_advertisement_does_not_trigger() -> None:
+    """Adverts below the RSSI floor are ignored."""
+    device = _make_device()
+    device.reconnect_rssi_min = -80
+    await _failed_reconnect(device)
+    await asyncio.sleep(RETRY_DELAY * 2)
+
+    with patch.object(device, "_reconnect", AsyncMock()) as reconnect:
+        _advertise(device, rssi=-95)
+        await asyncio.sleep(0)
+        reconnect.assert_not_awaited()
+
+        _advertise(device, rssi=-70)
+        await asyncio.sleep(0)
+
+    reconnect.assert_awaited_once()
+
+
+async def test_drop_reconnects_at_once_and_stop_cancels_retries() -> None:
+    """The link just dropped counts as seen; stopping forgets the retry."""
+    device = _make_device()
+    client = Mock(disconnect=AsyncMock())
+    device._client = client
+    device._is_paired = True
+
+    with patch.object(device, "_ensure_connected", AsyncMock(side_effect=OSError)):
+        device._disconnected(client)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert device.reconnect_pending
+
+    await device.stop()
+    assert not device.reconnect_pending
+    assert device._reconnect_timer is None
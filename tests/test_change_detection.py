@@ -0,0 +1,93 @@
+"""Tests for telling reports that change a value from repeated ones."""
+
+from struct import pack
+from unittest.mock import AsyncMock, Mock, patch
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.tuya_ble.const import FINGERBOT_BUTTON_EVENT
+from custom_components.tuya_ble.devices import TuyaBLECoordinator
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
+from custom_components.tuya_ble.tuya_ble.klv import encode_datapoints
+
+from . import make_device
+
+
+def _report(device: TuyaBLEDevice, *values: tuple[int, int]) -> None:
+    """Feed a v3 datapoint frame with (dp id, integer value) pairs."""
+    data = encode_datapoints(
+        [
+            (dp_id, TuyaBLEDataPointType.DT_VALUE.value, pack(">i", value))
+            for dp_id, value in values
+        ],
+        1,
+    )
+    device._parse_datapoints_v3(0, 0, bytes(data), 0)
+
+
+async def test_repeated_reports_are_tagged_unchanged() -> None:
+    """Changed-only callbacks get changed datapoints, others every report."""
+    device = make_device()
+    reports = Mock()
+    changes = Mock()
+    device.register_callback(reports)
+    device.register_callback(changes, changed_only=True)
+
+    _report(device, (1, 20), (2, 50))
+    assert [dp.id for dp in changes.call_args.args[0]] == [1, 2]
+
+    _report(device, (1, 20), (2, 51))
+    assert device.datapoints[2].changed
+    assert not device.datapoints[1].changed
+    assert [dp.id for dp in changes.call_args.args[0]] == [2]
+
+    changes.reset_mock()
+    _report(device, (1, 20), (2, 51))
+    changes.assert_not_called()
+    assert reports.call_count == 3
+
+
+async def test_repeated_reports_write_no_state(hass: HomeAssistant) -> None:
+    """A sensor re-reporting its value updates nothing, a repeated press does."""
+    device = make_device()
+    coordinator = TuyaBLECoordinator(hass, device)
+    sensor = Mock()
+    coordinator.async_add_listener(sensor, frozenset((1,)))
+    button = Mock()
+    coordinator.async_add_report_listener(button, frozenset((2,)))
+
+    _report(device, (1, 20), (2, 0))
+    sensor.reset_mock()
+    button.reset_mock()
+    for _ in range(3):
+        _report(device, (1, 20), (2, 0))
+
+    sensor.assert_not_called()
+    assert button.call_count == 3
+
+
+async def test_rejected_writes_are_reported_as_changes(hass: HomeAssistant) -> None:
+    """A report undoing a local write updates the entity and fires the event."""
+    device = make_device()
+    device._send_datapoints = AsyncMock()
+    coordinator = TuyaBLECoordinator(hass, device)
+    entity = Mock()
+    coordinator.async_add_listener(entity, frozenset((1,)))
+    events = async_capture_events(hass, FINGERBOT_BUTTON_EVENT)
+    fingerbot = Mock(fingerbot=Mock(switch=1, manual_control=1))
+
+    with patch(
+        "custom_components.tuya_ble.devices.get_device_product_info",
+        return_value=fingerbot,
+    ):
+        _report(device, (1, 0))
+        await device.datapoints[1].set_value(1)
+        entity.reset_mock()
+        _report(device, (1, 0))
+        await hass.async_block_till_done()
+
+    assert device.datapoints[1].changed
+    assert device.datapoints[1].value == 0
+    entity.assert_called_once()
+    assert len(events) == 1
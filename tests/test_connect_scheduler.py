@@ -0,0 +1,119 @@
+"""Tests for the adapter-aware connection scheduler."""
+
+import asyncio
+
+import pytest
+
+from custom_components.tuya_ble.tuya_ble.scheduler import (
+    DEFAULT_SOURCE,
+    TuyaBLEConnectScheduler,
+    get_connection_source,
+)
+
+from . import make_device
+
+CONNECT_TIME = 0.02
+
+
+class _Tracker:
+    def __init__(self, scheduler: TuyaBLEConnectScheduler) -> None:
+        self.scheduler = scheduler
+        self.order: list[str] = []
+        self.max_active: dict[str, int] = {}
+
+    async def connect(self, name: str, source: str, priority: int = 0) -> None:
+        async with self.scheduler.slot(source, priority):
+            self.order.append(name)
+            self.max_active[source] = max(
+                self.max_active.get(source, 0), self.scheduler.active(source)
+            )
+            await asyncio.sleep(CONNECT_TIME)
+
+
+async def test_connects_are_bounded_per_source() -> None:
+    """Each adapter runs up to its limit, adapters run side by side."""
+    tracker = _Tracker(TuyaBLEConnectScheduler(default_limit=3))
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await asyncio.gather(
+        *(
+            tracker.connect(f"{source}{n}", source)
+            for n in range(6)
+            for source in ("hci0", "proxy")
+        )
+    )
+    elapsed = loop.time() - start
+
+    assert tracker.max_active == {"hci0": 3, "proxy": 3}
+    # 12 connects over 2 adapters of 3 slots take 2 rounds, not 12.
+    assert elapsed < CONNECT_TIME * 4
+    assert tracker.scheduler.active("hci0") == 0
+    assert tracker.scheduler.waiting("hci0") == 0
+
+
+async def test_waiting_connects_are_granted_by_priority() -> None:
+    """Queued connects go lowest priority value first, FIFO within one."""
+    scheduler = TuyaBLEConnectScheduler(default_limit=1)
+    tracker = _Tracker(scheduler)
+
+    async with scheduler.slot("hci0"):
+        tasks = [
+            asyncio.create_task(tracker.connect(name, "hci0", priority))
+            for name, priority in (("valve", 10), ("lock", 0), ("sensor", 10))
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.waiting("hci0") == 3
+    await asyncio.gather(*tasks)
+
+    assert tracker.order == ["lock", "valve", "sensor"]
+
+
+async def test_cancelled_waiter_does_not_leak_a_slot() -> None:
+    """A connect cancelled while queued leaves the slots intact."""
+    scheduler = TuyaBLEConnectScheduler(default_limit=1)
+
+    async with scheduler.slot("hci0"):
+        waiter = asyncio.create_task(scheduler.slot("hci0").__aenter__())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    assert scheduler.active("hci0") == 0
+    assert scheduler.waiting("hci0") == 0
+    async with scheduler.slot("hci0"):
+        assert scheduler.active("hci0") == 1
+
+
+async def test_raising_the_limit_wakes_waiters() -> None:
+    """Limits can be tuned per adapter at runtime."""
+    scheduler = TuyaBLEConnectScheduler(default_limit=1)
+
+    async with scheduler.slot("proxy"):
+        waiter = asyncio.create_task(scheduler.slot("proxy").__aenter__())
+        await asyncio.sleep(0)
+        scheduler.set_limit("proxy", 2)
+        await waiter
+        assert scheduler.active("proxy") == 2
+
+    with pytest.raises(ValueError):
+        scheduler.set_limit("proxy", 0)
+
+
+def test_device_source_and_priority() -> None:
+    """The adapter comes from the BLE device, priority from the category."""
+    lock = make_device(
+        details={"source": "AA:BB:CC:DD:EE:FF", "path": "/org/bluez/hci0"},
+        category="ms",
+    )
+    valve = make_device(category="sfkzq")
+
+    assert get_connection_source(lock._ble_device) == "AA:BB:CC:DD:EE:FF"
+    assert get_connection_source(valve._ble_device) == DEFAULT_SOURCE
+    assert lock.connect_priority < valve.connect_priority
+
+    valve.connect_priority = -1
+    assert valve.connect_priority == -1
+    valve.connect_priority = None
+    assert valve.connect_priority > lock.connect_priority
@@ -0,0 +1,162 @@
+"""Tests for the per-adapter connection budget."""
+
+import asyncio
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDevice
+from custom_components.tuya_ble.tuya_ble.connections import TuyaBLEConnectionManager
+from custom_components.tuya_ble.tuya_ble.reconnect import TuyaBLEReconnectPolicy
+
+from . import make_device
+
+
+@pytest.fixture
+def manager() -> Iterator[TuyaBLEConnectionManager]:
+    manager = TuyaBLEConnectionManager(default_limit=2)
+    with patch(
+        "custom_components.tuya_ble.tuya_ble.tuya_ble.connection_manager", manager
+    ):
+        yield manager
+    for device in list(manager._activity):
+        manager.forget(device)
+
+
+def _make_device(
+    address: str, source: str = "hci0", idle_timeout: float | None = 60.0
+) -> TuyaBLEDevice:
+    device = make_device(address, {"source": source})
+    device.idle_timeout = idle_timeout
+    return device
+
+
+async def _connect(
+    manager: TuyaBLEConnectionManager, device: TuyaBLEDevice, timeout: float = 1.0
+) -> None:
+    await manager.acquire(device, timeout)
+    client = Mock(is_connected=True, stop_notify=AsyncMock())
+
+    async def _disconnect() -> None:
+        client.is_connected = False
+        device._disconnected(client)
+
+    client.disconnect = AsyncMock(side_effect=_disconnect)
+    device._client = client
+    device._is_paired = True
+    manager.settle(device)
+    manager.track(device)
+
+
+async def test_limit_applies_per_source(manager: TuyaBLEConnectionManager) -> None:
+    """Each adapter has its own budget."""
+    await _connect(manager, _make_device("11:22:33:44:55:01"))
+    await _connect(manager, _make_device("11:22:33:44:55:02"))
+    await _connect(manager, _make_device("11:22:33:44:55:03", "proxy"))
+
+    assert manager.occupancy("hci0") == 2
+    assert manager.occupancy("proxy") == 1
+    assert manager.evictions("hci0") == 0
+
+    with pytest.raises(ValueError):
+        manager.set_limit("hci0", 0)
+
+
+async def test_full_source_evicts_least_recently_active(
+    manager: TuyaBLEConnectionManager,
+) -> None:
+    """The idle device used longest ago gives up its slot, quietly."""
+    first = _make_device("11:22:33:44:55:01")
+    second = _make_device("11:22:33:44:55:02")
+    third = _make_device("11:22:33:44:55:03")
+    await _connect(manager, first)
+    await _connect(manager, second)
+    manager.touch(first)
+
+    await _connect(manager, third)
+
+    assert first.is_connected
+    assert not second.is_connected
+    assert not second.reconnect_pending
+    assert third.is_connected
+    assert manager.occupancy("hci0") == 2
+    assert manager.evictions("hci0") == 1
+    assert manager.wait_time(third) is not None
+
+
+async def test_busy_devices_keep_their_slot(
+    manager: TuyaBLEConnectionManager,
+) -> None:
+    """A device waiting for a response is not evicted; the requester times out."""
+    manager.set_limit("hci0", 1)
+    busy = _make_device("11:22:33:44:55:01")
+    await _connect(manager, busy)
+    busy._input_expected_responses[1] = asyncio.get_running_loop().create_future()
+
+    with pytest.raises(TimeoutError):
+        await _connect(manager, _make_device("11:22:33:44:55:02"), timeout=0.02)
+
+    assert busy.is_connected
+    assert manager.waiting("hci0") == 0
+    assert manager.evictions("hci0") == 0
+
+
+async def test_lost_connections_free_their_slot(
+    manager: TuyaBLEConnectionManager,
+) -> None:
+    """Slots of connections that went away unnoticed are reclaimed."""
+    manager.set_limit("hci0", 1)
+    lost = _make_device("11:22:33:44:55:01")
+    await _connect(manager, lost)
+    lost._client.is_connected = False
+
+    await _connect(manager, _make_device("11:22:33:44:55:02"), timeout=0.02)
+
+    assert manager.occupancy("hci0") == 1
+    assert manager.evictions("hci0") == 0
+
+
+async def test_unreachable_device_frees_its_slot_between_attempts(
+    manager: TuyaBLEConnectionManager,
+) -> None:
+    """A device backing off after a failed attempt does not hold the slot."""
+    manager.set_limit("hci0", 1)
+    unreachable = _make_device("11:22:33:44:55:01")
+    unreachable._reconnect_policy = TuyaBLEReconnectPolicy(base=0.05, cap=0.05)
+    attempted = asyncio.Event()
+
+    async def _establish(*_args, **_kwargs):
+        attempted.set()
+        raise TimeoutError
+
+    with patch(
+        "custom_components.tuya_ble.tuya_ble.tuya_ble.establish_connection",
+        AsyncMock(side_effect=_establish),
+    ):
+        connecting = asyncio.create_task(unreachable._ensure_connected())
+        await attempted.wait()
+        await asyncio.sleep(0)
+
+        assert manager.occupancy("hci0") == 0
+        await _connect(manager, _make_device("11:22:33:44:55:02"), timeout=0.02)
+        connecting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await connecting
+
+    assert manager.occupancy("hci0") == 1
+
+
+async def test_devices_pushing_state_are_not_evicted(
+    manager: TuyaBLEConnectionManager,
+) -> None:
+    """A sensor without an idle timeout would never come back, so it stays."""
+    manager.set_limit("hci0", 1)
+    sensor = _make_device("11:22:33:44:55:01", idle_timeout=None)
+    await _connect(manager, sensor)
+
+    with pytest.raises(TimeoutError):
+        await _connect(manager, _make_device("11:22:33:44:55:02"), timeout=0.02)
+
+    assert sensor.is_connected
+    assert manager.evictions("hci0") == 0
@@ -0,0 +1,68 @@
+"""Tests for the Tuya BLE frame CRC16."""
+
+import os
+import timeit
+
+import pytest
+
+from custom_components.tuya_ble.tuya_ble.crc import crc16
+
+from . import benchmark
+
+
+PAYLOAD_SIZES = (20, 64, 256, 1024, 4096)
+
+
+def _bitwise_crc16(data: bytes) -> int:
+    """The original bit-by-bit implementation, kept as the reference."""
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte & 255
+        for _ in range(8):
+            tmp = crc & 1
+            crc >>= 1
+            if tmp != 0:
+                crc ^= 0xA001
+    return crc
+
+
+def test_crc16_known_value() -> None:
+    """CRC-16/MODBUS check value for the standard test vector."""
+    assert crc16(b"123456789") == 0x4B37
+    assert crc16(b"") == 0xFFFF
+
+
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def test_crc16_matches_bitwise_reference(size: int) -> None:
+    """The table lookup produces exactly the same CRC as the bit loop."""
+    data = os.urandom(size)
+
+    assert crc16(data) == _bitwise_crc16(data)
+    assert crc16(bytearray(data)) == _bitwise_crc16(data)
+    assert crc16(memoryview(data)) == _bitwise_crc16(data)
+
+
+def test_crc16_can_be_continued() -> None:
+    """Feeding a frame in two parts gives the CRC of the whole frame."""
+    data = os.urandom(100)
+
+    assert crc16(data[40:], crc16(data[:40])) == crc16(data)
+
+
+
+@benchmark
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def test_crc16_benchmark(size: int) -> None:
+    """Time the table lookup against the bit loop for every frame size."""
+    data = os.urandom(size)
+    number = max(1, 20000 // size)
+
+    bitwise = min(
+        timeit.repeat(lambda: _bitwise_crc16(data), number=number, repeat=3)
+    )
+    table = min(timeit.repeat(lambda: crc16(data), number=number, repeat=3))
+
+    print(
+        f"crc16 {size:>5} bytes: bitwise {bitwise * 1e6 / number:8.1f} us, "
+        f"table {table * 1e6 / number:8.1f} us, speedup x{bitwise / table:.1f}"
+    )
@@ -0,0 +1,102 @@
+"""Tests for coalescing datapoint writes into shared frames."""
+
+import asyncio
+
+import pytest
+
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
+from custom_components.tuya_ble.tuya_ble.exceptions import TuyaBLEEnumValueError
+
+from . import make_device
+
+
+def _datapoint(device: TuyaBLEDevice, dp_id: int):
+    return device.datapoints.get_or_create(dp_id, TuyaBLEDataPointType.DT_VALUE, 0)
+
+
+async def test_scene_writes_share_one_frame() -> None:
+    """Writes made together go out in one frame, in the order they came."""
+    device = make_device(stub_sends=True)
+
+    await asyncio.gather(
+        *(_datapoint(device, dp_id).set_value(dp_id * 10) for dp_id in (3, 1, 2))
+    )
+
+    device._send_datapoints.assert_awaited_once_with([3, 1, 2])
+
+
+async def test_last_write_wins() -> None:
+    """A datapoint written twice is sent once, with the newer value."""
+    device = make_device(stub_sends=True)
+    first = _datapoint(device, 1)
+    second = _datapoint(device, 2)
+
+    await asyncio.gather(first.set_value(5), second.set_value(1), first.set_value(7))
+
+    device._send_datapoints.assert_awaited_once_with([2, 1])
+    assert first.value == 7
+
+
+async def test_writes_during_a_send_wait_for_the_next_frame() -> None:
+    """A slider drag becomes one frame in flight and one with the latest value."""
+    device = make_device(stub_sends=True)
+    in_flight = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _send(datapoint_ids: list[int]) -> None:
+        in_flight.set()
+        await release.wait()
+
+    device._send_datapoints.side_effect = _send
+    slider = _datapoint(device, 4)
+    first = asyncio.create_task(slider.set_value(10))
+    await in_flight.wait()
+    later = [asyncio.create_task(slider.set_value(value)) for value in (20, 30, 40)]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(first, *later)
+
+    assert device._send_datapoints.await_args_list == [(([4],),), (([4],),)]
+    assert slider.value == 40
+
+
+async def test_send_errors_reach_every_writer() -> None:
+    """All writes sharing a frame see its failure."""
+    device = make_device(stub_sends=True)
+    device._send_datapoints.side_effect = TimeoutError
+
+    results = await asyncio.gather(
+        _datapoint(device, 1).set_value(1),
+        _datapoint(device, 2).set_value(2),
+        return_exceptions=True,
+    )
+
+    assert [type(result) for result in results] == [TimeoutError, TimeoutError]
+    device._send_datapoints.side_effect = None
+    await _datapoint(device, 3).set_value(3)
+    device._send_datapoints.assert_awaited_with([3])
+
+
+async def test_explicit_batches_are_sent_at_once() -> None:
+    """begin_update/end_update still send when the batch ends."""
+    device = make_device(stub_sends=True)
+
+    device.datapoints.begin_update()
+    await _datapoint(device, 1).set_value(1)
+    await _datapoint(device, 2).set_value(2)
+    device._send_datapoints.assert_not_awaited()
+    await device.datapoints.end_update()
+
+    device._send_datapoints.assert_awaited_once_with([1, 2])
+
+
+async def test_rejected_values_are_not_queued() -> None:
+    """Invalid enum values fail before anything is queued."""
+    device = make_device(stub_sends=True)
+    datapoint = device.datapoints.get_or_create(1, TuyaBLEDataPointType.DT_ENUM, 0)
+
+    with pytest.raises(TuyaBLEEnumValueError):
+        await datapoint.set_value(-1)
+
+    await asyncio.sleep(0)
+    device._send_datapoints.assert_not_awaited()
@@ -0,0 +1,71 @@
+"""Tests for resolving DP codes once per device schema."""
+
+from unittest.mock import patch
+
+from homeassistant.components.sensor import SensorEntityDescription
+from homeassistant.core import HomeAssistant
+
+from custom_components.tuya_ble.base import IntegerTypeData
+from custom_components.tuya_ble.const import DPCode, DPType
+from custom_components.tuya_ble.devices import TuyaBLECoordinator, TuyaBLEProductInfo
+from custom_components.tuya_ble.sensor import TuyaBLESensor, TuyaBLESensorMapping
+from custom_components.tuya_ble.tuya_ble.tuya_ble import TuyaBLEEntityDescription
+
+from . import make_device
+
+BRIGHTNESS = '{"min": 10, "max": 1000, "scale": 0, "step": 1}'
+
+
+def _make_entity(hass: HomeAssistant) -> TuyaBLESensor:
+    device = make_device()
+    device.append_functions(
+        [{"code": "bright_value", "dp_id": 4, "type": "Integer", "values": BRIGHTNESS}],
+        [{"code": "battery_percentage", "dp_id": 8, "type": "Integer", "values": "{}"}],
+    )
+    return TuyaBLESensor(
+        hass,
+        TuyaBLECoordinator(hass, device),
+        device,
+        TuyaBLEProductInfo("Lock"),
+        TuyaBLESensorMapping(
+            dp_id=8, description=SensorEntityDescription(key="battery_percentage")
+        ),
+    )
+
+
+async def test_lookups_are_resolved_once(hass: HomeAssistant) -> None:
+    """Repeated lookups do not parse the type data again."""
+    entity = _make_entity(hass)
+
+    with patch.object(
+        IntegerTypeData, "from_json", wraps=IntegerTypeData.from_json
+    ) as from_json:
+        for _ in range(3):
+            bright = entity.find_dpcode(DPCode.BRIGHT_VALUE, dptype=DPType.INTEGER)
+            assert entity.find_dpcode("bright_value", dptype=DPType.INTEGER) is bright
+            assert entity.find_dpid(DPCode.BRIGHT_VALUE) == 4
+            assert entity.get_dptype(DPCode.BATTERY_PERCENTAGE) == DPType.INTEGER
+
+    assert (bright.min, bright.max) == (10, 1000)
+    from_json.assert_called_once()
+
+
+async def test_new_descriptions_invalidate_lookups(hass: HomeAssistant) -> None:
+    """Codes added later are found, including ones missing before."""
+    entity = _make_entity(hass)
+    assert entity.find_dpid(DPCode.SWITCH) is None
+    assert entity.find_dpids(DPCode.SWITCH, DPCode.BRIGHT_VALUE) == frozenset((4,))
+
+    description = TuyaBLEEntityDescription()
+    description.function = [
+        {"code": "switch", "dp_id": 1, "type": "Boolean", "values": "{}"}
+    ]
+    description.status_range = []
+    entity.device.update_description(description)
+    assert entity.find_dpid(DPCode.SWITCH) == 1
+    assert entity.find_dpids(DPCode.SWITCH, DPCode.BRIGHT_VALUE) == frozenset((1, 4))
+
+    entity.device.append_functions(
+        [{"code": "switch", "dp_id": 2, "type": "Boolean", "values": "{}"}], []
+    )
+    assert entity.find_dpid(DPCode.SWITCH) == 2
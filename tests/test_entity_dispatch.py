@@ -0,0 +1,77 @@
+"""Tests for notifying only the entities of updated datapoints."""
+
+import time
+from unittest.mock import Mock
+
+from homeassistant.components.sensor import SensorEntityDescription
+from homeassistant.core import HomeAssistant
+
+from custom_components.tuya_ble.devices import TuyaBLECoordinator, TuyaBLEProductInfo
+from custom_components.tuya_ble.sensor import TuyaBLESensor, TuyaBLESensorMapping
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
+
+from . import make_device
+
+
+def _update(coordinator: TuyaBLECoordinator, device: TuyaBLEDevice, dp_id: int):
+    device.datapoints._update_from_device(
+        dp_id, time.time(), 0, TuyaBLEDataPointType.DT_VALUE, 1
+    )
+    coordinator._async_handle_update([device.datapoints[dp_id]])
+
+
+async def test_updates_reach_only_entities_of_their_datapoints(
+    hass: HomeAssistant,
+) -> None:
+    """A battery tick on a device with 30 entities updates one of them."""
+    device = make_device()
+    coordinator = TuyaBLECoordinator(hass, device)
+    entities = [Mock() for _ in range(30)]
+    for dp_id, entity in enumerate(entities, 1):
+        coordinator.async_add_listener(entity, frozenset((dp_id,)))
+    any_update = Mock()
+    coordinator.async_add_listener(any_update)
+
+    _update(coordinator, device, 7)
+    for entity in entities:
+        entity.reset_mock()
+    any_update.reset_mock()
+    _update(coordinator, device, 7)
+
+    assert [dp_id for dp_id, e in enumerate(entities, 1) if e.called] == [7]
+    any_update.assert_called_once()
+
+
+async def test_connection_changes_reach_every_entity(hass: HomeAssistant) -> None:
+    """Availability changes are not filtered by datapoint."""
+    device = make_device()
+    coordinator = TuyaBLECoordinator(hass, device)
+    entity = Mock()
+    remove = coordinator.async_add_listener(entity, frozenset((1,)))
+
+    coordinator._async_handle_connect()
+    entity.assert_called_once()
+
+    remove()
+    _update(coordinator, device, 1)
+    entity.assert_called_once()
+
+
+async def test_entities_subscribe_to_their_mapping(hass: HomeAssistant) -> None:
+    """Mapped datapoints are used, getters may read any datapoint."""
+    device = make_device()
+    coordinator = TuyaBLECoordinator(hass, device)
+    description = SensorEntityDescription(key="battery_percentage")
+
+    def _sensor(mapping: TuyaBLESensorMapping) -> TuyaBLESensor:
+        return TuyaBLESensor(
+            hass, coordinator, device, TuyaBLEProductInfo("Lock"), mapping
+        )
+
+    plain = _sensor(TuyaBLESensorMapping(dp_id=8, description=description))
+    computed = _sensor(
+        TuyaBLESensorMapping(dp_id=8, description=description, getter=Mock())
+    )
+
+    assert plain._get_datapoint_ids() == frozenset((8,))
+    assert computed._get_datapoint_ids() is None
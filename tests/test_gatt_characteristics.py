@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, Mock, call, patch
 import pytest
 from bleak.backends.device import BLEDevice
 from custom_components.tuya_ble.tuya_ble import TuyaBLEDevice
+from custom_components.tuya_ble.tuya_ble.connections import connection_manager
 from custom_components.tuya_ble.tuya_ble.manager import TuyaBLEDeviceCredentials
 from custom_components.tuya_ble.tuya_ble.const import TuyaBLECode
 from custom_components.tuya_ble.cloud import HASSTuyaBLEDeviceManager
@@ -245,3 +246,73 @@ async def test_yzd02b_fd50_device_info_handshake(hass: HomeAssistant) -> None:
             b"\x00\xf3",
         )
         assert packets[0][2] == 0x20
+        # An irrigation timer is idle-managed; unloading the entry forgets it.
+        connection_manager.forget(device)
+
+
+@pytest.mark.asyncio
+async def test_negotiated_mtu_sizes_fragments(hass: HomeAssistant) -> None:
+    """Frames are fragmented to the negotiated MTU instead of 20 bytes."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "devices": CONFIG,
+            "address": "11:22:33:44:55:66",
+        },
+        title="Mock TuyaBLE",
+    )
+    entry.add_to_hass(hass)
+
+    ble_device = BLEDevice(
+        name="bob", address="11:22:33:44:55:66", details="", rssi=-50
+    )
+    manager = HASSTuyaBLEDeviceManager(hass, entry.options.copy())
+    credentials = TuyaBLEDeviceCredentials(
+        uuid="12345678901234567890",
+        local_key="wV[NcWGUSFF`dSgO",
+        device_id="767823809c9c1f458745",
+        category="ms",
+        product_id="kpn4zaf7",
+        device_name="Mock Lock",
+        product_model="BSTUOKEY",
+        product_name="BSTUOKEY",
+        functions=[],
+        status_range=[],
+    )
+
+    with patch.object(manager, "get_device_credentials", return_value=credentials):
+        device = TuyaBLEDevice(manager, ble_device)
+        await device.initialize()
+        device._is_paired = True
+        device._session_key = bytes(16)
+
+        write_char = Mock()
+        write_char.max_write_without_response_size = 244
+        client = Mock()
+        client.is_connected = True
+        client.start_notify = AsyncMock()
+        client.services.get_characteristic = Mock(
+            side_effect=lambda uuid: {
+                "00000002-0000-1001-8001-00805f9b07d0": Mock(),
+                "00000001-0000-1001-8001-00805f9b07d0": write_char,
+            }.get(uuid)
+        )
+
+        assert device.gatt_mtu == 20
+        with (
+            patch(
+                "custom_components.tuya_ble.tuya_ble.tuya_ble.establish_connection",
+                return_value=client,
+            ),
+            patch.object(device, "_send_packet_while_connected", return_value=True),
+        ):
+            await device._ensure_connected()
+
+        assert device.gatt_mtu == 244
+        packets = device._build_packets(1, TuyaBLECode.FUN_SENDER_DPS, bytes(60))
+        assert len(packets) == 1
+
+        device._expected_disconnect = True
+        device._disconnected(client)
+        assert device.gatt_mtu == 20
+        assert len(device._build_packets(1, TuyaBLECode.FUN_SENDER_DPS, bytes(60))) > 1
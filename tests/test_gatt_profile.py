@@ -0,0 +1,144 @@
+"""Tests for the persisted GATT characteristic selection."""
+
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.tuya_ble.cloud import HASSTuyaBLEDeviceManager
+from custom_components.tuya_ble.const import GATT_PROFILES_STORAGE_KEY
+from custom_components.tuya_ble.tuya_ble import (
+    TuyaBLEDeviceCredentials,
+    TuyaBLEGattProfile,
+)
+from custom_components.tuya_ble.tuya_ble.const import (
+    CHARACTERISTIC_NOTIFY,
+    CHARACTERISTIC_NOTIFY_FD50,
+    CHARACTERISTIC_WRITE,
+    CHARACTERISTIC_WRITE_FD50,
+)
+from custom_components.tuya_ble.tuya_ble.reconnect import TuyaBLEReconnectPolicy
+
+from . import make_device
+
+ADDRESS = "11:22:33:44:55:66"
+ESTABLISH_CONNECTION = (
+    "custom_components.tuya_ble.tuya_ble.tuya_ble.establish_connection"
+)
+FD50_PROFILE = TuyaBLEGattProfile(
+    CHARACTERISTIC_NOTIFY_FD50, CHARACTERISTIC_WRITE_FD50, True
+)
+
+
+async def test_profiles_are_stored_per_address(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Profiles survive the manager and can be forgotten again."""
+    manager = HASSTuyaBLEDeviceManager(hass, {})
+    assert await manager.get_gatt_profile(ADDRESS) is None
+
+    await manager.save_gatt_profile(ADDRESS, FD50_PROFILE)
+
+    assert hass_storage[GATT_PROFILES_STORAGE_KEY]["data"] == {
+        ADDRESS: {
+            "characteristic_notify": CHARACTERISTIC_NOTIFY_FD50,
+            "characteristic_write": CHARACTERISTIC_WRITE_FD50,
+            "fd50_handshake": True,
+        }
+    }
+    other = HASSTuyaBLEDeviceManager(hass, {})
+    assert await other.get_gatt_profile(ADDRESS) == FD50_PROFILE
+
+    await other.save_gatt_profile(ADDRESS, None)
+    assert await manager.get_gatt_profile(ADDRESS) is None
+
+
+async def _connect(
+    profile: TuyaBLEGattProfile | None,
+    offered: set[str],
+    logins: list[bool] | None = None,
+):
+    manager = AsyncMock()
+    manager.get_device_credentials.return_value = TuyaBLEDeviceCredentials(
+        "uuid", "0123456789abcdef", "id", "wsdcg", "pid", None, None, None, None, None
+    )
+    manager.get_gatt_profile.return_value = profile
+    device = make_device(ADDRESS, manager=manager)
+    await device.initialize()
+    device._is_paired = True
+    device._reconnect_policy = TuyaBLEReconnectPolicy(base=0.001, cap=0.001)
+
+    client = Mock(
+        is_connected=True,
+        start_notify=AsyncMock(),
+        stop_notify=AsyncMock(),
+        disconnect=AsyncMock(),
+    )
+    client.services.get_characteristic = Mock(
+        side_effect=lambda uuid: Mock() if uuid in offered else None
+    )
+    with (
+        patch(ESTABLISH_CONNECTION, return_value=client),
+        patch.object(
+            device,
+            "_send_packet_while_connected",
+            side_effect=logins or None,
+            return_value=True,
+        ),
+    ):
+        await device._ensure_connected()
+    return device, manager, client
+
+
+async def test_stored_profile_skips_the_probe() -> None:
+    """The stored pair and handshake mode are used as they are."""
+    device, manager, client = await _connect(
+        FD50_PROFILE, {CHARACTERISTIC_NOTIFY_FD50, CHARACTERISTIC_WRITE_FD50}
+    )
+
+    assert [c.args[0] for c in client.services.get_characteristic.call_args_list] == [
+        CHARACTERISTIC_NOTIFY_FD50,
+        CHARACTERISTIC_WRITE_FD50,
+    ]
+    assert device._fd50_handshake
+    client.start_notify.assert_awaited_once_with(
+        CHARACTERISTIC_NOTIFY_FD50,
+        device._notification_handler,
+        bluez={"use_start_notify": True},
+    )
+    manager.save_gatt_profile.assert_not_awaited()
+    await device.stop()
+
+
+async def test_stale_profile_is_replaced() -> None:
+    """A profile the device no longer matches is probed again and stored."""
+    device, manager, client = await _connect(
+        FD50_PROFILE, {CHARACTERISTIC_NOTIFY, CHARACTERISTIC_WRITE}
+    )
+
+    assert device._characteristic_notify == CHARACTERISTIC_NOTIFY
+    assert not device._fd50_handshake
+    manager.save_gatt_profile.assert_awaited_once_with(
+        ADDRESS,
+        TuyaBLEGattProfile(CHARACTERISTIC_NOTIFY, CHARACTERISTIC_WRITE, False),
+    )
+    await device.stop()
+
+
+async def test_failed_login_probes_the_profile_again() -> None:
+    """A stored handshake mode that no longer logs in is derived anew."""
+    device, manager, client = await _connect(
+        FD50_PROFILE,
+        {CHARACTERISTIC_NOTIFY_FD50, CHARACTERISTIC_WRITE_FD50},
+        [False, True, True],
+    )
+
+    assert device._characteristic_notify == CHARACTERISTIC_NOTIFY_FD50
+    assert not device._fd50_handshake
+    manager.save_gatt_profile.assert_awaited_once_with(
+        ADDRESS,
+        TuyaBLEGattProfile(
+            CHARACTERISTIC_NOTIFY_FD50, CHARACTERISTIC_WRITE_FD50, False
+        ),
+    )
+    await device.stop()
@@ -0,0 +1,120 @@
+"""Tests for pipelined GATT writes."""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+from bleak.exc import BleakError
+import pytest
+
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDevice
+
+from . import benchmark, make_device
+
+WRITE_DELAY = 0.02
+
+
+class _FakeClient:
+    """Backend that takes a fixed time to accept every write."""
+
+    def __init__(self, fail_at: int | None = None) -> None:
+        self.is_connected = True
+        self.written: list[bytes] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._fail_at = fail_at
+
+    async def write_gatt_char(self, uuid: str, data: bytes, response: bool) -> None:
+        assert response is False
+        self.written.append(data)
+        index = len(self.written) - 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(WRITE_DELAY)
+            if index == self._fail_at:
+                raise BleakError("write failed")
+        finally:
+            self.in_flight -= 1
+
+
+def _make_device(client: _FakeClient) -> TuyaBLEDevice:
+    device = make_device()
+    device._client = client
+    return device
+
+
+async def _send(window: int, packets: list[bytes]) -> _FakeClient:
+    client = _FakeClient()
+    device = _make_device(client)
+    device.write_window = window
+    await device._int_send_packets_locked(packets)
+    return client
+
+
+async def test_fragments_are_written_in_order_within_the_window() -> None:
+    """All fragments go out in order with at most `window` in flight."""
+    packets = [bytes([n]) * 20 for n in range(10)]
+
+    client = await _send(4, packets)
+
+    assert client.written == packets
+    assert client.max_in_flight == 4
+    assert client.in_flight == 0
+
+
+@benchmark
+async def test_pipelined_write_benchmark() -> None:
+    """Time a multi-fragment frame written serially and pipelined."""
+    packets = [bytes([n]) * 20 for n in range(8)]
+    timings = {}
+    for window in (1, 4):
+        start = time.perf_counter()
+        await _send(window, packets)
+        timings[window] = time.perf_counter() - start
+
+    print(
+        f"8 fragments: serial {timings[1] * 1e3:.0f} ms, "
+        f"pipelined {timings[4] * 1e3:.0f} ms"
+    )
+
+
+async def test_failed_write_cancels_the_rest_of_the_burst() -> None:
+    """A failing fragment aborts the frame and reports the drop once."""
+    client = _FakeClient(fail_at=1)
+    device = _make_device(client)
+    device._disconnected = Mock()
+
+    with pytest.raises(BleakError):
+        await device._int_send_packets_locked([bytes(20)] * 8)
+
+    await asyncio.sleep(WRITE_DELAY * 2)
+    assert client.in_flight == 0
+    assert len(client.written) < 8
+    device._disconnected.assert_called_once_with(client)
+
+
+async def test_cancelled_send_stops_its_writes() -> None:
+    """Writes still queued when a send is cancelled do not reach the device."""
+    client = _FakeClient()
+    device = _make_device(client)
+    device.write_window = 4
+    send = asyncio.create_task(device._int_send_packets_locked([bytes(20)] * 8))
+    await asyncio.sleep(WRITE_DELAY / 2)
+
+    send.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await send
+
+    assert client.in_flight == 0
+    assert len(client.written) == 4
+    await asyncio.sleep(WRITE_DELAY * 2)
+    assert len(client.written) == 4
+
+
+def test_write_window_must_allow_one_write() -> None:
+    """A window of zero would never write anything."""
+    device = _make_device(_FakeClient())
+
+    with pytest.raises(ValueError):
+        device.write_window = 0
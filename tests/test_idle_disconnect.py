@@ -0,0 +1,126 @@
+"""Tests for disconnecting idle devices."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDevice
+from custom_components.tuya_ble.tuya_ble.connections import TuyaBLEConnectionManager
+from custom_components.tuya_ble.tuya_ble.const import TuyaBLECode
+
+from . import make_device
+
+SWEEP = 0.01
+
+
+def _make_device(category: str, idle_timeout: float | None = None) -> TuyaBLEDevice:
+    device = make_device(category=category)
+    if idle_timeout is not None:
+        device.idle_timeout = idle_timeout
+    client = Mock(is_connected=True, stop_notify=AsyncMock())
+
+    async def _disconnect() -> None:
+        client.is_connected = False
+        device._disconnected(client)
+
+    client.disconnect = AsyncMock(side_effect=_disconnect)
+    device._client = client
+    device._is_paired = True
+    return device
+
+
+def test_idle_timeout_follows_category() -> None:
+    """Fingerbots and valves let go of their connection, sensors keep it."""
+    assert _make_device("szjqr").idle_timeout == 60.0
+    assert _make_device("sfkzq").idle_timeout == 60.0
+    assert _make_device("wsdcg").idle_timeout is None
+
+    sensor = _make_device("wsdcg")
+    sensor.idle_timeout = 30.0
+    assert sensor.idle_timeout == 30.0
+    sensor.idle_timeout = None
+    assert sensor.idle_timeout is None
+
+
+async def test_idle_devices_are_disconnected_quietly() -> None:
+    """Only idle devices with a timeout are released, without reconnecting."""
+    manager = TuyaBLEConnectionManager(sweep_interval=SWEEP)
+    valve = _make_device("sfkzq", idle_timeout=SWEEP)
+    sensor = _make_device("wsdcg")
+    valve_client = valve._client
+    disconnected = Mock()
+    valve.register_disconnected_callback(disconnected)
+
+    manager.track(valve)
+    manager.track(sensor)
+    await asyncio.sleep(SWEEP * 4)
+
+    valve_client.disconnect.assert_awaited_once()
+    assert not valve.is_connected
+    assert not valve.reconnect_pending
+    disconnected.assert_not_called()
+    assert sensor.is_connected
+    sensor._client.disconnect.assert_not_awaited()
+
+    manager.forget(valve)
+    manager.forget(sensor)
+
+
+async def test_activity_and_pending_responses_keep_the_connection() -> None:
+    """Traffic pushes the idle deadline out, a pending response blocks it."""
+    manager = TuyaBLEConnectionManager(sweep_interval=SWEEP)
+    valve = _make_device("sfkzq", idle_timeout=SWEEP * 5)
+    manager.track(valve)
+
+    for _ in range(6):
+        await asyncio.sleep(SWEEP)
+        manager.touch(valve)
+    assert valve.is_connected
+
+    valve._input_expected_responses[1] = asyncio.get_running_loop().create_future()
+    await asyncio.sleep(SWEEP * 8)
+    assert valve.is_connected
+
+    valve._input_expected_responses.clear()
+    await asyncio.sleep(SWEEP * 8)
+    assert not valve.is_connected
+    manager.forget(valve)
+
+
+async def test_next_command_reconnects_on_demand() -> None:
+    """A command after an idle disconnect connects again first."""
+    valve = _make_device("sfkzq")
+    await valve._execute_idle_disconnect()
+    assert not valve.is_connected
+
+    with (
+        patch.object(valve, "_ensure_connected", AsyncMock()) as ensure,
+        patch.object(valve, "_send_packet_while_connected", AsyncMock()) as send,
+    ):
+        await valve._send_packet(TuyaBLECode.FUN_SENDER_DEVICE_STATUS, bytes())
+
+    ensure.assert_awaited_once()
+    send.assert_awaited_once()
+
+
+async def test_late_disconnect_of_old_client_keeps_new_connection() -> None:
+    """A disconnect callback arriving after a reconnect changes nothing."""
+    valve = _make_device("sfkzq")
+    old_client = valve._client
+    old_client.disconnect = AsyncMock()
+    await valve._execute_idle_disconnect()
+
+    valve._client = Mock(is_connected=True)
+    valve._idle_client = None
+    valve._is_paired = True
+    valve._gatt_mtu = 244
+    valve._ciphers[5] = Mock()
+    disconnected = Mock()
+    valve.register_disconnected_callback(disconnected)
+
+    valve._disconnected(old_client)
+
+    assert valve.is_connected
+    assert valve._gatt_mtu == 244
+    assert 5 in valve._ciphers
+    assert not valve.reconnect_pending
+    disconnected.assert_not_called()
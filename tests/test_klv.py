@@ -0,0 +1,162 @@
+"""Tests for the Tuya KLV datapoint codec."""
+
+import random
+import timeit
+
+import pytest
+
+from custom_components.tuya_ble.tuya_ble.const import TuyaBLEDataPointType
+from custom_components.tuya_ble.tuya_ble.exceptions import (
+    TuyaBLEDataFormatError,
+    TuyaBLEDataLengthError,
+)
+from custom_components.tuya_ble.tuya_ble.klv import (
+    decode_datapoints,
+    encode_datapoints,
+)
+
+from . import benchmark
+
+
+def _reference_decode(data: bytes, start_pos: int, length_size: int) -> list:
+    """The original per-byte decoder, kept as the reference."""
+    result = []
+    pos = start_pos
+    header_size = 2 + length_size
+    while len(data) - pos >= header_size:
+        id = data[pos]
+        pos += 1
+        _type = data[pos]
+        if _type > TuyaBLEDataPointType.DT_BITMAP.value:
+            raise TuyaBLEDataFormatError()
+        type = TuyaBLEDataPointType(_type)
+        pos += 1
+        data_len = int.from_bytes(data[pos : pos + length_size], "big")
+        pos += length_size
+        next_pos = pos + data_len
+        if next_pos > len(data):
+            raise TuyaBLEDataLengthError()
+        raw_value = data[pos:next_pos]
+        match type:
+            case TuyaBLEDataPointType.DT_RAW | TuyaBLEDataPointType.DT_BITMAP:
+                value = raw_value
+            case TuyaBLEDataPointType.DT_BOOL:
+                value = int.from_bytes(raw_value, "big") != 0
+            case TuyaBLEDataPointType.DT_VALUE | TuyaBLEDataPointType.DT_ENUM:
+                value = int.from_bytes(raw_value, "big", signed=True)
+            case TuyaBLEDataPointType.DT_STRING:
+                value = raw_value.decode()
+        result.append((id, type, value))
+        pos = next_pos
+    return result
+
+
+def _synthetic_payload(count: int, length_size: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    data = bytearray()
+    for dp_id in range(1, count + 1):
+        dp_type = rng.randrange(6)
+        match dp_type:
+            case 1:
+                value = bytes([rng.randrange(2)])
+            case 2:
+                value = rng.randrange(-(2**31), 2**31).to_bytes(4, "big", signed=True)
+            case 3:
+                value = "".join(rng.choice("abcdef") for _ in range(8)).encode()
+            case 4:
+                value = bytes([rng.randrange(8)])
+            case _:
+                value = rng.randbytes(rng.randrange(1, 12))
+        data += dp_id.to_bytes(1, "big") + dp_type.to_bytes(1, "big")
+        data += len(value).to_bytes(length_size, "big") + value
+    return bytes(data)
+
+
+@pytest.mark.parametrize("length_size", (1, 2))
+def test_decode_matches_reference(length_size: int) -> None:
+    """The struct decoder yields the same ids, types and values."""
+    data = b"\x00\x01\x02" + _synthetic_payload(50, length_size)
+
+    decoded, pos = decode_datapoints(data, 3, length_size)
+
+    assert decoded == _reference_decode(data, 3, length_size)
+    assert pos == len(data)
+    for _, dp_type, value in decoded:
+        if dp_type in (TuyaBLEDataPointType.DT_RAW, TuyaBLEDataPointType.DT_BITMAP):
+            assert type(value) is bytes
+
+
+def test_decode_stops_before_a_partial_header() -> None:
+    """Trailing bytes shorter than a header are left for the caller."""
+    decoded, pos = decode_datapoints(bytes.fromhex("01 01 01 01 02 01"), 0, 1)
+
+    assert decoded == [(1, TuyaBLEDataPointType.DT_BOOL, True)]
+    assert pos == 4
+
+
+def test_decode_rejects_bad_payloads() -> None:
+    """Unknown types, truncated values and bad widths are errors."""
+    with pytest.raises(TuyaBLEDataFormatError):
+        decode_datapoints(bytes.fromhex("01 06 01 00"), 0, 1)
+    with pytest.raises(TuyaBLEDataLengthError):
+        decode_datapoints(bytes.fromhex("01 02 0004 0000"), 0, 2)
+    with pytest.raises(ValueError):
+        decode_datapoints(bytes(), 0, 3)
+
+
+@benchmark
+@pytest.mark.parametrize("length_size", (1, 2))
+def test_decode_benchmark(length_size: int) -> None:
+    """Time the struct decoder against the per-byte decoder on 50 DPs."""
+    data = _synthetic_payload(50, length_size)
+    number = 500
+
+    reference = min(
+        timeit.repeat(
+            lambda: _reference_decode(data, 0, length_size), number=number, repeat=3
+        )
+    )
+    decoder = min(
+        timeit.repeat(
+            lambda: decode_datapoints(data, 0, length_size), number=number, repeat=3
+        )
+    )
+
+    print(
+        f"KLV v{length_size + 2} 50 DPs: reference "
+        f"{reference * 1e6 / number:7.1f} us, struct {decoder * 1e6 / number:7.1f} us, "
+        f"speedup x{reference / decoder:.1f}"
+    )
+
+
+@pytest.mark.parametrize("length_size", (1, 2))
+def test_encode_round_trips_through_decoder(length_size: int) -> None:
+    """Encoded payloads decode back to the same datapoints."""
+    data = _synthetic_payload(50, length_size)
+    decoded, _ = decode_datapoints(data, 0, length_size)
+    raw_values = [
+        (dp_id, dp_type.value, data_value)
+        for (dp_id, dp_type, _), data_value in zip(
+            decoded, _raw_values(data, length_size), strict=True
+        )
+    ]
+
+    assert encode_datapoints(raw_values, length_size) == data
+
+
+def test_encode_reserves_command_header() -> None:
+    """Reserved leading bytes are zeroed and the payload follows them."""
+    encoded = encode_datapoints([(105, 1, b"\x01"), (106, 2, bytes(4))], 2, 5)
+
+    assert encoded == bytes.fromhex("00 00000000 69 01 0001 01 6a 02 0004 00000000")
+
+
+def _raw_values(data: bytes, length_size: int) -> list[bytes]:
+    values = []
+    pos = 0
+    while pos < len(data):
+        data_len = int.from_bytes(data[pos + 2 : pos + 2 + length_size], "big")
+        pos += 2 + length_size
+        values.append(data[pos : pos + data_len])
+        pos += data_len
+    return values
@@ -119,3 +119,23 @@ async def test_light(hass: HomeAssistant) -> None:
     await hass.async_block_till_done()
     device._send_datapoints.assert_any_call([1])
     assert device.datapoints[1].value is True
+    assert device.datapoints[1].value is True
+
+    # Switch and brightness from one action go out in one frame
+    device.function[DPCode.BRIGHT_VALUE] = TuyaBLEDeviceFunction(
+        code=DPCode.BRIGHT_VALUE,
+        dp_id=3,
+        type=DPType.INTEGER,
+        values=None,
+    )
+    device.datapoints._update_from_device(1, 0, 0, TuyaBLEDataPointType.DT_BOOL, False)
+    device._send_datapoints.reset_mock()
+    entity._send_command(
+        [
+            {"code": DPCode.SWITCH_LED, "value": True},
+            {"code": DPCode.BRIGHT_VALUE, "value": 500},
+        ]
+    )
+    await hass.async_block_till_done()
+    device._send_datapoints.assert_awaited_once_with([1, 3])
+    assert device.datapoints[3].value == 500
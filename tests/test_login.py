@@ -0,0 +1,142 @@
+"""Tests for the login after connecting."""
+
+import asyncio
+import secrets
+from unittest.mock import AsyncMock, Mock, patch
+
+from custom_components.tuya_ble.tuya_ble import (
+    TuyaBLEDevice,
+    TuyaBLEDeviceCredentials,
+)
+from custom_components.tuya_ble.tuya_ble.const import (
+    CHARACTERISTIC_NOTIFY,
+    CHARACTERISTIC_WRITE,
+    TuyaBLECode,
+)
+from custom_components.tuya_ble.tuya_ble.security import TuyaBLESecurityMaterial
+
+from . import make_device
+
+ESTABLISH_CONNECTION = (
+    "custom_components.tuya_ble.tuya_ble.tuya_ble.establish_connection"
+)
+LOCAL_KEY = "0123456789abcdef"
+AUTH_KEY = bytes(range(32))
+# One way air time of a GATT operation.
+LATENCY = 0.005
+
+
+def _make_device() -> TuyaBLEDevice:
+    device = make_device()
+    material = TuyaBLESecurityMaterial(LOCAL_KEY)
+    device._device_info = TuyaBLEDeviceCredentials(
+        "uuid", LOCAL_KEY, "id", "wsdcg", "pid", None, None, None, None, None
+    )
+    device._security_material = material
+    device._local_key = material.pairing_login_key
+    device._login_key = material.login_key
+    return device
+
+
+class _FakePeripheral(TuyaBLEDevice):
+    """Device side of the login, answering device info and pairing requests."""
+
+    def __init__(self, client: "_FakeClient") -> None:
+        super().__init__(Mock(), client.device._ble_device)
+        self._client_side = client
+        self._device_info = client.device._device_info
+        self._security_material = client.device._security_material
+        self._login_key = client.device._login_key
+
+    def _handle_command_or_response(
+        self, seq_num: int, response_to: int, code: TuyaBLECode, data: bytes
+    ) -> None:
+        if code == TuyaBLECode.FUN_SENDER_DEVICE_INFO:
+            srand = secrets.token_bytes(6)
+            self._session_key = self._security_material.session_key(srand)
+            reply = bytearray(46)
+            reply[0:4] = bytes((1, 0, 3, 3))
+            reply[6:12] = srand
+            reply[14:46] = AUTH_KEY
+        elif code == TuyaBLECode.FUN_SENDER_PAIR:
+            reply = bytearray(1)
+        else:
+            return
+        packets = self._build_packets(seq_num, code, bytes(reply), seq_num)
+        asyncio.get_running_loop().call_later(
+            LATENCY, self._client_side.notify, packets
+        )
+
+
+class _FakeClient:
+    """A connected bleak client with a Tuya device on the other end."""
+
+    def __init__(self, device: TuyaBLEDevice) -> None:
+        self.device = device
+        self.is_connected = True
+        self.services = Mock()
+        self.services.get_characteristic = Mock(side_effect=self._characteristic)
+        self._handler = None
+        self._peripheral = _FakePeripheral(self)
+
+    def _characteristic(self, uuid: str) -> Mock | None:
+        if uuid in (CHARACTERISTIC_NOTIFY, CHARACTERISTIC_WRITE):
+            return Mock(max_write_without_response_size=20)
+        return None
+
+    async def start_notify(self, _uuid: str, handler, **_kwargs) -> None:
+        await asyncio.sleep(LATENCY * 2)
+        self._handler = handler
+
+    async def stop_notify(self, _uuid: str) -> None:
+        self._handler = None
+
+    async def write_gatt_char(self, _uuid: str, data: bytes, _response) -> None:
+        self._peripheral._notification_handler(0, bytearray(data))
+
+    async def disconnect(self) -> None:
+        self.is_connected = False
+        self.device._disconnected(self)
+
+    def notify(self, packets: list[bytes]) -> None:
+        if self._handler is not None and self.is_connected:
+            for packet in packets:
+                self._handler(0, bytearray(packet))
+
+
+async def _connect(device: TuyaBLEDevice) -> float:
+    async def _establish(*_args, **_kwargs) -> _FakeClient:
+        await asyncio.sleep(LATENCY * 2)
+        return _FakeClient(device)
+
+    with patch(ESTABLISH_CONNECTION, AsyncMock(side_effect=_establish)):
+        await device._ensure_connected()
+    assert device.is_connected
+    return device.connect_time
+
+
+async def test_reconnect_logs_in_again() -> None:
+    """Every link gets a fresh session and records how long the login took."""
+    device = _make_device()
+    assert await _connect(device) > 0
+    first_key = device._session_key
+    assert device.device_version == "1.0"
+
+    await device._execute_idle_disconnect()
+    await _connect(device)
+
+    assert device._session_key != first_key
+    await device.stop()
+
+
+async def test_changed_gatt_layout_is_probed_again() -> None:
+    """A device whose GATT layout changed is probed on the next connect."""
+    device = _make_device()
+    await _connect(device)
+    await device._execute_idle_disconnect()
+    device._gatt_profile.characteristic_notify = "0000fd50-0000-1000-8000-00805f9b34fb"
+
+    await _connect(device)
+
+    assert device._characteristic_notify == CHARACTERISTIC_NOTIFY
+    await device.stop()
@@ -0,0 +1,113 @@
+"""Tests for reassembling notifications into Tuya BLE frames."""
+
+from unittest.mock import Mock
+
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDevice
+from custom_components.tuya_ble.tuya_ble.const import TuyaBLECode
+from custom_components.tuya_ble.tuya_ble.security import TuyaBLESecurityMaterial
+
+from . import make_device
+
+
+LOCAL_KEY = "0123456789abcdef"
+DEVICE_RANDOM = bytes.fromhex("010203040506")
+
+
+def _make_device() -> TuyaBLEDevice:
+    device = make_device()
+    material = TuyaBLESecurityMaterial(LOCAL_KEY)
+    device._security_material = material
+    device._login_key = material.login_key
+    device._session_key = material.session_key(DEVICE_RANDOM)
+    device._protocol_version = 4
+    device._handle_command_or_response = Mock()
+    return device
+
+
+def test_multi_packet_frame_is_reassembled() -> None:
+    """Fragments are written into one buffer and decoded once complete."""
+    device = _make_device()
+    payload = bytes(range(96))
+    packets = device._build_packets(7, TuyaBLECode.FUN_RECEIVE_DP_V4, payload, 3)
+    assert len(packets) > 1
+
+    for packet in packets[:-1]:
+        device._notification_handler(0, bytearray(packet))
+        device._handle_command_or_response.assert_not_called()
+    device._notification_handler(0, bytearray(packets[-1]))
+
+    device._handle_command_or_response.assert_called_once_with(
+        7, 3, TuyaBLECode.FUN_RECEIVE_DP_V4, payload
+    )
+    assert device._input_buffer is None
+    assert device._input_view is None
+
+
+def test_consecutive_frames_reuse_nothing_from_previous_frame() -> None:
+    """Each frame starts from a freshly sized buffer."""
+    device = _make_device()
+    first = device._build_packets(1, TuyaBLECode.FUN_RECEIVE_DP, bytes(40))
+    second = device._build_packets(2, TuyaBLECode.FUN_RECEIVE_DP, b"\x01\x01\x01\x01")
+
+    for packet in first + second:
+        device._notification_handler(0, bytearray(packet))
+
+    assert device._handle_command_or_response.call_count == 2
+    device._handle_command_or_response.assert_called_with(
+        2, 0, TuyaBLECode.FUN_RECEIVE_DP, b"\x01\x01\x01\x01"
+    )
+
+
+def test_missing_packet_discards_partial_frame() -> None:
+    """A gap in packet numbers drops the frame instead of decoding garbage."""
+    device = _make_device()
+    packets = device._build_packets(7, TuyaBLECode.FUN_RECEIVE_DP, bytes(96))
+    assert len(packets) > 2
+
+    device._notification_handler(0, bytearray(packets[0]))
+    device._notification_handler(0, bytearray(packets[2]))
+
+    assert device._input_buffer is None
+    device._handle_command_or_response.assert_not_called()
+
+
+def test_oversized_packet_discards_partial_frame() -> None:
+    """Data beyond the declared frame length is rejected."""
+    device = _make_device()
+    packets = device._build_packets(7, TuyaBLECode.FUN_RECEIVE_DP, bytes(96))
+
+    device._notification_handler(0, bytearray(packets[0]))
+    device._notification_handler(0, bytearray(packets[1]) + bytes(256))
+
+    assert device._input_buffer is None
+    device._handle_command_or_response.assert_not_called()
+
+
+def test_corrupted_frame_is_rejected_and_buffer_released() -> None:
+    """A CRC failure is logged and leaves the device ready for the next frame."""
+    device = _make_device()
+    packets = device._build_packets(7, TuyaBLECode.FUN_RECEIVE_DP, bytes(8))
+    corrupted = bytearray(packets[-1])
+    corrupted[-1] ^= 0xFF
+
+    for packet in packets[:-1]:
+        device._notification_handler(0, bytearray(packet))
+    device._notification_handler(0, corrupted)
+
+    assert device._input_view is None
+    device._handle_command_or_response.assert_not_called()
+
+
+def test_oversized_frame_length_is_rejected() -> None:
+    """A first packet declaring more than a frame can hold allocates nothing."""
+    device = _make_device()
+    # Packet 0 declaring a length of 0x0FFFFFFF, protocol version 4.
+    device._notification_handler(0, bytearray(b"\x00\xff\xff\xff\x7f\x40\x01"))
+
+    assert device._input_buffer is None
+    assert device._input_expected_packet_num == 0
+
+    packets = device._build_packets(1, TuyaBLECode.FUN_RECEIVE_DP, bytes(40))
+    for packet in packets:
+        device._notification_handler(0, bytearray(packet))
+    device._handle_command_or_response.assert_called_once()
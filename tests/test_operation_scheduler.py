@@ -0,0 +1,105 @@
+"""Tests for the priority order of outbound frames of a device."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from custom_components.tuya_ble.tuya_ble.const import (
+    OPERATION_PRIORITY_COMMAND,
+    OPERATION_PRIORITY_POLL,
+    OPERATION_PRIORITY_RESPONSE,
+    TuyaBLECode,
+)
+from custom_components.tuya_ble.tuya_ble.exceptions import (
+    TuyaBLEOperationSupersededError,
+)
+from custom_components.tuya_ble.tuya_ble.scheduler import TuyaBLEOperationScheduler
+
+from . import make_device
+
+
+async def _run(scheduler: TuyaBLEOperationScheduler, order: list, name, *args):
+    async with scheduler.slot(*args):
+        order.append(name)
+
+
+async def test_higher_priorities_go_first() -> None:
+    """Queued operations run by priority, in arrival order within one."""
+    scheduler = TuyaBLEOperationScheduler()
+    order = []
+    async with scheduler.slot():
+        tasks = [
+            asyncio.create_task(_run(scheduler, order, name, priority))
+            for name, priority in (
+                ("poll", OPERATION_PRIORITY_POLL),
+                ("command 1", OPERATION_PRIORITY_COMMAND),
+                ("ack", OPERATION_PRIORITY_RESPONSE),
+                ("command 2", OPERATION_PRIORITY_COMMAND),
+            )
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.waiting() == 4
+
+    await asyncio.gather(*tasks)
+    assert order == ["ack", "command 1", "command 2", "poll"]
+    assert not scheduler.locked()
+
+
+async def test_queued_operation_is_superseded() -> None:
+    """A newer operation with the same key replaces the queued one."""
+    scheduler = TuyaBLEOperationScheduler()
+    order = []
+    async with scheduler.slot():
+        first = asyncio.create_task(
+            _run(scheduler, order, "first", OPERATION_PRIORITY_POLL, "status")
+        )
+        await asyncio.sleep(0)
+        second = asyncio.create_task(
+            _run(scheduler, order, "second", OPERATION_PRIORITY_POLL, "status")
+        )
+        await asyncio.sleep(0)
+        assert scheduler.waiting() == 1
+
+    with pytest.raises(TuyaBLEOperationSupersededError):
+        await first
+    await second
+    assert order == ["second"]
+
+
+async def test_device_sends_acks_before_commands_and_polls() -> None:
+    """Acks jump the queue and a burst of status polls is sent once."""
+    device = make_device()
+    device._client = Mock(is_connected=True)
+    device._ensure_connected = AsyncMock()
+    device._build_packets = Mock(
+        side_effect=lambda seq_num, code, data, response_to: [(seq_num, code)]
+    )
+    sent = []
+
+    async def _send(packets) -> None:
+        seq_num, code = packets[0]
+        sent.append(code)
+        if future := device._input_expected_responses.get(seq_num):
+            future.set_result(0)
+
+    device._send_packets_locked = AsyncMock(side_effect=_send)
+
+    async with device._operation_lock.slot():
+        tasks = [
+            asyncio.create_task(device.update()),
+            asyncio.create_task(device.update()),
+            asyncio.create_task(device._send_packet(TuyaBLECode.FUN_SENDER_DPS, b"")),
+            asyncio.create_task(
+                device._send_response(TuyaBLECode.FUN_RECEIVE_DP, b"", 7)
+            ),
+        ]
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(*tasks)
+    assert sent == [
+        TuyaBLECode.FUN_RECEIVE_DP,
+        TuyaBLECode.FUN_SENDER_DPS,
+        TuyaBLECode.FUN_SENDER_DEVICE_STATUS,
+    ]
+    assert not device._input_expected_responses
@@ -0,0 +1,86 @@
+"""Tests for the per-device protocol trace."""
+
+import logging
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDevice
+
+from . import make_device
+
+MODULE_LOGGER = "custom_components.tuya_ble.tuya_ble.tuya_ble"
+
+
+class _NoHex(bytearray):
+    def hex(self, *args, **kwargs) -> str:
+        raise AssertionError("hex() evaluated while tracing is off")
+
+
+def _make_device(address: str) -> TuyaBLEDevice:
+    device = make_device(address)
+    device._handle_command_or_response = Mock()
+    return device
+
+
+@pytest.fixture(autouse=True)
+def _module_log_level():
+    logger = logging.getLogger(MODULE_LOGGER)
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    yield
+    logger.setLevel(level)
+
+
+def test_trace_off_does_not_format_packets(caplog: pytest.LogCaptureFixture) -> None:
+    """Nothing is hex-encoded when the device is not traced."""
+    device = _make_device("11:22:33:44:55:01")
+
+    caplog.handler.setLevel(logging.DEBUG)
+    with patch.object(device._trace_logger, "debug") as debug:
+        device._notification_handler(0, _NoHex(b"\x01\x02"))
+        device._parse_timestamp(bytes.fromhex("01 66aabbcc"), 0)
+
+    debug.assert_not_called()
+    assert not device.protocol_trace
+    assert "Packet received" not in caplog.text
+
+
+def test_trace_can_be_enabled_for_one_device(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """A traced device logs frames while its neighbours stay quiet."""
+    traced = _make_device("11:22:33:44:55:02")
+    quiet = _make_device("11:22:33:44:55:03")
+    traced.protocol_trace = True
+
+    caplog.handler.setLevel(logging.DEBUG)
+    try:
+        traced._parse_datapoints_v3(0, 0, bytes.fromhex("01 01 01 01"), 0)
+        quiet._parse_datapoints_v3(0, 0, bytes.fromhex("02 01 01 01"), 0)
+        traced._notification_handler(0, bytearray(b"\x01\xab"))
+        quiet._notification_handler(0, _NoHex(b"\x01\xcd"))
+    finally:
+        traced.protocol_trace = False
+
+    assert traced.protocol_trace is False
+    assert quiet.protocol_trace is False
+    assert "id: 1, type: DT_BOOL" in caplog.text
+    assert "id: 2" not in caplog.text
+    assert "01ab" in caplog.text
+    assert "01cd" not in caplog.text
+
+
+def test_trace_follows_module_debug_level(caplog: pytest.LogCaptureFixture) -> None:
+    """Enabling DEBUG for the module still traces every device."""
+    device = _make_device("11:22:33:44:55:04")
+
+    with caplog.at_level(logging.DEBUG, logger=MODULE_LOGGER):
+        assert device.protocol_trace
+        device._parse_timestamp(bytes.fromhex("01 66aabbcc"), 0)
+        device._parse_datapoints_v4(
+            0, 0, bytes.fromhex("0b 02 0004 00000057"), 0
+        )
+
+    assert "Received timestamp" in caplog.text
+    assert "id: 11, type: DT_VALUE: value: 87" in caplog.text
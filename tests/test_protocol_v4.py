@@ -11,6 +11,7 @@ from custom_components.tuya_ble.tuya_ble import (
     TuyaBLEDevice,
 )
 from custom_components.tuya_ble.tuya_ble.const import TuyaBLECode
+from custom_components.tuya_ble.tuya_ble.crc import crc16
 from custom_components.tuya_ble.tuya_ble.exceptions import TuyaBLEDeviceError
 
 
@@ -61,6 +62,20 @@ async def test_protocol_v3_write_keeps_one_byte_datapoint_length() -> None:
     )
 
 
+def test_frame_layout_has_header_crc_and_block_padding() -> None:
+    """Plaintext frames keep the header, CRC16 and AES block padding."""
+    data = bytes.fromhex("00 01020304 69 01 0001 01")
+
+    raw = TuyaBLEDevice._encode_frame(7, 3, TuyaBLECode.FUN_SENDER_DPS_V4, data)
+
+    header = bytes.fromhex("00000007 00000003 0027 000a")
+    assert raw[:12] == header
+    assert raw[12:22] == data
+    assert raw[22:24] == crc16(header + data).to_bytes(2, "big")
+    assert raw[24:] == bytes(8)
+    assert len(TuyaBLEDevice._encode_frame(1, 0, TuyaBLECode.FUN_SENDER_DPS, bytes(2))) == 16
+
+
 async def test_protocol_v4_atomic_write_uses_v4_encoder() -> None:
     """Atomic writes dispatch through the protocol-specific encoder."""
     device = _make_device()
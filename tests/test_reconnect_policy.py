@@ -0,0 +1,133 @@
+"""Tests for reconnect backoff and the not-found circuit breaker."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+from bleak_retry_connector import BleakNotFoundError
+import pytest
+
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDevice
+from custom_components.tuya_ble.tuya_ble.reconnect import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    TuyaBLEReconnectPolicy,
+)
+
+from . import make_device
+
+ESTABLISH_CONNECTION = "custom_components.tuya_ble.tuya_ble.tuya_ble.establish_connection"
+CONNECT_RETRY_BUDGET = "custom_components.tuya_ble.tuya_ble.tuya_ble.CONNECT_RETRY_BUDGET"
+
+
+def _make_device() -> TuyaBLEDevice:
+    device = make_device()
+    device._reconnect_policy = TuyaBLEReconnectPolicy(base=0.001, cap=0.004)
+    return device
+
+
+def test_backoff_is_exponential_with_full_jitter() -> None:
+    """Delays double per failure up to the cap, scaled by a random factor."""
+    policy = TuyaBLEReconnectPolicy(base=0.5, cap=10.0, rng=lambda: 1.0)
+
+    ceilings = []
+    for _ in range(7):
+        ceilings.append(policy.next_delay())
+        policy.record_failure(False)
+
+    assert ceilings == [0.5, 1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+    assert TuyaBLEReconnectPolicy(base=0.5, rng=lambda: 0.25).next_delay() == 0.125
+
+    policy.record_success()
+    assert policy.next_delay() == 0.5
+
+
+def test_breaker_opens_on_repeated_not_found() -> None:
+    """Only consecutive not-found failures open the breaker."""
+    policy = TuyaBLEReconnectPolicy(threshold=3)
+
+    policy.record_failure(True)
+    policy.record_failure(True)
+    policy.record_failure(False)
+    policy.record_failure(True)
+    policy.record_failure(True)
+    assert policy.state == BREAKER_CLOSED
+
+    policy.record_failure(True)
+    assert policy.is_open
+    assert policy.state == BREAKER_OPEN
+
+
+def test_breaker_half_opens_on_advertisement() -> None:
+    """An advertisement allows attempts again; a miss reopens at once."""
+    policy = TuyaBLEReconnectPolicy(threshold=2)
+    policy.record_failure(True)
+    policy.record_failure(True)
+
+    assert policy.half_open()
+    assert not policy.half_open()
+    assert policy.state == BREAKER_HALF_OPEN
+    assert not policy.is_open
+
+    policy.record_failure(True)
+    assert policy.is_open
+
+    policy.half_open()
+    policy.record_success()
+    assert policy.state == BREAKER_CLOSED
+
+
+async def test_absent_device_stops_connecting_until_it_advertises() -> None:
+    """An out-of-range device fails fast instead of retrying forever."""
+    device = _make_device()
+    establish = AsyncMock(side_effect=BleakNotFoundError())
+
+    with patch(ESTABLISH_CONNECTION, establish):
+        with pytest.raises(BleakNotFoundError):
+            await device._ensure_connected()
+        assert establish.await_count == 5
+        assert device.reconnect_state == BREAKER_OPEN
+
+        with pytest.raises(BleakNotFoundError):
+            await device._ensure_connected()
+        assert establish.await_count == 5
+
+
+async def test_parked_reconnect_resumes_on_advertisement() -> None:
+    """A reconnect waiting on an open breaker restarts with the next advert."""
+    device = _make_device()
+    establish = AsyncMock(side_effect=BleakNotFoundError())
+
+    with patch(ESTABLISH_CONNECTION, establish):
+        await device._reconnect()
+    assert device.reconnect_pending
+    assert device.reconnect_state == BREAKER_OPEN
+    await asyncio.sleep(0.01)
+
+    with patch.object(device, "_reconnect", AsyncMock()) as reconnect:
+        device.set_ble_device_and_advertisement_data(
+            device._ble_device, Mock(rssi=-60)
+        )
+        await asyncio.sleep(0)
+
+    reconnect.assert_awaited_once()
+    assert device.reconnect_state == BREAKER_HALF_OPEN
+
+
+async def test_connect_gives_up_within_its_retry_budget() -> None:
+    """Growing backoff does not keep one connect, and its lock, for minutes."""
+    device = _make_device()
+    device._reconnect_policy = TuyaBLEReconnectPolicy(base=0.05, cap=60.0)
+    device._reconnect_policy._failures = 20
+    establish = AsyncMock(side_effect=TimeoutError())
+
+    with (
+        patch(ESTABLISH_CONNECTION, establish),
+        patch(CONNECT_RETRY_BUDGET, 0.1),
+        patch.object(device._reconnect_policy, "_random", lambda: 1.0),
+    ):
+        with pytest.raises(BleakNotFoundError):
+            await device._ensure_connected()
+
+    assert establish.await_count == 1
+    assert not device._connect_lock.locked()
@@ -0,0 +1,127 @@
+"""Tests for adaptive response timeouts and retransmission."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDevice
+from custom_components.tuya_ble.tuya_ble.const import TuyaBLECode
+from custom_components.tuya_ble.tuya_ble.exceptions import TuyaBLEDeviceError
+from custom_components.tuya_ble.tuya_ble.rtt import TuyaBLERTTEstimator
+
+from . import make_device
+
+
+def _make_device() -> TuyaBLEDevice:
+    device = make_device()
+    device._client = Mock(is_connected=True)
+    device._build_packets = Mock(side_effect=lambda seq_num, *args: [bytes([seq_num])])
+    device._rtt = TuyaBLERTTEstimator(initial=0.05, minimum=0.01, maximum=0.2)
+    return device
+
+
+def _answer_on(device: TuyaBLEDevice, writes: int, result: int = 0) -> AsyncMock:
+    """Answer the pending request once it has been written `writes` times."""
+
+    async def _write(packets: list[bytes], *_args) -> None:
+        if send.await_count == writes:
+            future = device._input_expected_responses.pop(packets[0][0])
+            asyncio.get_running_loop().call_later(
+                0.005,
+                future.set_result if result == 0 else future.set_exception,
+                result if result == 0 else TuyaBLEDeviceError(result),
+            )
+
+    send = AsyncMock(side_effect=_write)
+    device._int_send_packet_while_connected = send
+    return send
+
+
+def test_timeout_follows_smoothed_rtt_within_bounds() -> None:
+    """Unknown codes use the initial timeout, known ones track the RTT."""
+    rtt = TuyaBLERTTEstimator(initial=5.0, minimum=1.0, maximum=20.0)
+    assert rtt.timeout("dps") == 5.0
+    assert rtt.smoothed_rtt("dps") is None
+
+    for _ in range(20):
+        rtt.add_sample("dps", 0.3)
+
+    assert rtt.smoothed_rtt("dps") == pytest.approx(0.3)
+    assert rtt.timeout("dps") == 1.0
+    assert rtt.timeout("dps", attempt=1) == 2.0
+    assert rtt.timeout("status") == 5.0
+
+    rtt.add_sample("pair", 12.0)
+    assert rtt.timeout("pair") == 20.0
+
+
+async def test_answered_request_is_sampled() -> None:
+    """A first-attempt answer feeds the estimator for its code."""
+    device = _make_device()
+    send = _answer_on(device, 1)
+
+    assert await device._send_packet_while_connected(
+        TuyaBLECode.FUN_SENDER_DPS, b"", 0, True
+    )
+
+    assert send.await_count == 1
+    assert "FUN_SENDER_DPS" in device.response_rtt
+    assert device._input_expected_responses == {}
+
+
+async def test_lost_frame_is_retransmitted_with_same_seq_num() -> None:
+    """An unanswered frame is written once more before giving up."""
+    device = _make_device()
+    send = _answer_on(device, 2)
+
+    assert await device._send_packet_while_connected(
+        TuyaBLECode.FUN_SENDER_DPS, b"", 0, True
+    )
+
+    assert send.await_count == 2
+    assert send.await_args_list[0].args[0] == send.await_args_list[1].args[0]
+    # The answer may belong to either copy, so it is not sampled.
+    assert device.response_rtt == {}
+
+
+async def test_unanswered_request_fails_after_one_retransmit() -> None:
+    """A request gives up after the initial and the doubled timeout."""
+    device = _make_device()
+    send = _answer_on(device, 0)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    assert not await device._send_packet_while_connected(
+        TuyaBLECode.FUN_SENDER_DPS, b"", 0, True
+    )
+
+    assert send.await_count == 2
+    assert loop.time() - start == pytest.approx(0.15, abs=0.05)
+    assert device._input_expected_responses == {}
+
+
+async def test_device_error_is_raised_without_retransmit() -> None:
+    """An error answer is a response, not a lost frame."""
+    device = _make_device()
+    send = _answer_on(device, 1, result=3)
+
+    with pytest.raises(TuyaBLEDeviceError):
+        await device._send_packet_while_connected(
+            TuyaBLECode.FUN_SENDER_DPS, b"", 0, True
+        )
+
+    assert send.await_count == 1
+
+
+async def test_no_retransmit_after_disconnect() -> None:
+    """A dropped link fails the request instead of writing again."""
+    device = _make_device()
+    send = _answer_on(device, 0)
+    device._client.is_connected = False
+
+    assert not await device._send_packet_while_connected(
+        TuyaBLECode.FUN_SENDER_DPS, b"", 0, True
+    )
+
+    assert send.await_count == 1
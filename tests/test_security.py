@@ -1,7 +1,10 @@
 """Tests for Tuya BLE classic and protocol-v2 security."""
 
+import os
 from unittest.mock import AsyncMock, Mock
 
+from Crypto.Cipher import AES
+
 from bleak.backends.device import BLEDevice
 from homeassistant.const import (
     CONF_COUNTRY_CODE,
@@ -33,7 +36,10 @@ from custom_components.tuya_ble.tuya_ble import (
     TuyaBLEDeviceCredentials,
 )
 from custom_components.tuya_ble.tuya_ble.const import TuyaBLECode
-from custom_components.tuya_ble.tuya_ble.security import TuyaBLESecurityMaterial
+from custom_components.tuya_ble.tuya_ble.security import (
+    TuyaBLECipher,
+    TuyaBLESecurityMaterial,
+)
 
 
 LOCAL_KEY = "0123456789abcdef"
@@ -132,6 +138,60 @@ def test_device_info_uses_protocol_v2_session_derivation() -> None:
     assert device._session_key == material.session_key(DEVICE_RANDOM)
 
 
+@pytest.mark.parametrize("length", (0, 16, 32, 48, 64, 80, 256))
+def test_cipher_matches_aes_cbc(length: int) -> None:
+    """The cached context produces the same bytes as a fresh CBC cipher."""
+    key = os.urandom(16)
+    iv = os.urandom(16)
+    data = os.urandom(length)
+    cipher = TuyaBLECipher(key)
+
+    encrypted = cipher.encrypt(iv, data)
+
+    assert encrypted == AES.new(key, AES.MODE_CBC, iv).encrypt(data)
+    assert cipher.decrypt(iv, encrypted) == data
+    assert cipher.decrypt(memoryview(iv), memoryview(encrypted)) == data
+
+
+def test_cipher_rejects_unaligned_data() -> None:
+    """CBC without padding only accepts whole AES blocks."""
+    cipher = TuyaBLECipher(os.urandom(16))
+
+    with pytest.raises(ValueError):
+        cipher.encrypt(bytes(16), bytes(15))
+    with pytest.raises(ValueError):
+        cipher.decrypt(bytes(16), bytes(17))
+
+
+def test_cipher_context_is_reused_per_session() -> None:
+    """Frames reuse one context until the session key changes or drops."""
+    device = _make_device()
+    material = TuyaBLESecurityMaterial(LOCAL_KEY, SEC_KEY)
+    device._security_material = material
+    device._login_key = material.login_key
+    response = bytearray(46)
+    response[6:12] = DEVICE_RANDOM
+
+    device._handle_command_or_response(
+        3, 0, TuyaBLECode.FUN_SENDER_DEVICE_INFO, response
+    )
+    session_cipher = device._get_cipher(15)
+    device._build_packets(1, TuyaBLECode.FUN_SENDER_DEVICE_STATUS, bytes())
+
+    assert session_cipher.key == device._session_key
+    assert device._get_cipher(15) is session_cipher
+
+    response[6:12] = bytes.fromhex("0a0b0c0d0e0f")
+    device._handle_command_or_response(
+        4, 0, TuyaBLECode.FUN_SENDER_DEVICE_INFO, response
+    )
+    assert device._get_cipher(15) is not session_cipher
+
+    device._expected_disconnect = True
+    device._disconnected(Mock())
+    assert not device._ciphers
+
+
 async def test_sec_key_is_loaded_from_saved_device_options(
     hass: HomeAssistant,
 ) -> None:
@@ -0,0 +1,82 @@
+"""Tests and benchmark for the incrementally kept device status."""
+
+import time
+
+import pytest
+
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
+
+from . import benchmark, make_device
+
+CODES = 40
+
+
+def _make_device() -> TuyaBLEDevice:
+    device = make_device(stub_sends=True)
+    device.append_functions(
+        [
+            {"code": f"code_{dp_id}", "dp_id": dp_id, "type": "Integer", "values": "{}"}
+            for dp_id in range(1, CODES + 1)
+        ],
+        [{"code": "switch_led", "dp_id": 20, "type": "Boolean", "values": "{}"}],
+    )
+    return device
+
+
+def _report(device: TuyaBLEDevice, dp_id: int, value: int) -> None:
+    device.datapoints._update_from_device(
+        dp_id, time.time(), 0, TuyaBLEDataPointType.DT_VALUE, value
+    )
+
+
+async def test_status_follows_reports_and_writes() -> None:
+    """Reports and user writes show up without rebuilding the status."""
+    device = _make_device()
+    _report(device, 1, 5)
+    status = device.status
+    assert status == {"code_1": 5}
+
+    _report(device, 20, 1)
+    await device.datapoints[1].set_value(7)
+    device.datapoints.get_or_create(2, TuyaBLEDataPointType.DT_VALUE, 3)
+
+    assert device.status is status
+    assert status == {"code_1": 7, "code_2": 3, "code_20": 1, "switch_led": 1}
+    with pytest.raises(TypeError):
+        status["code_1"] = 0
+
+
+async def test_new_functions_reindex_the_status() -> None:
+    """Codes added by a later description get the current values."""
+    device = _make_device()
+    _report(device, 41, 9)
+    assert "extra" not in device.status
+
+    device.append_functions(
+        [{"code": "extra", "dp_id": 41, "type": "Integer", "values": "{}"}], []
+    )
+
+    assert device.status["extra"] == 9
+
+
+@benchmark
+async def test_status_read_benchmark() -> None:
+    """Time reading the kept status against building it."""
+    device = _make_device()
+    for dp_id in range(1, CODES + 1):
+        _report(device, dp_id, dp_id)
+    rounds = 2000
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        device._build_status()
+    rebuilt = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(rounds):
+        device.status.get("switch_led")
+    kept = time.perf_counter() - start
+
+    print(
+        f"status of {CODES} codes: rebuilt {rebuilt / rounds * 1e6:5.2f} us, "
+        f"kept {kept / rounds * 1e6:5.2f} us per read"
+    )
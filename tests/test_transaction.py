@@ -0,0 +1,48 @@
+"""Tests for writing several datapoints as one transaction."""
+
+import asyncio
+
+import pytest
+
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
+
+from . import make_device
+
+
+def _datapoint(device: TuyaBLEDevice, dp_id: int):
+    return device.datapoints.get_or_create(dp_id, TuyaBLEDataPointType.DT_VALUE, 0)
+
+
+async def test_transaction_sends_one_frame_on_exit() -> None:
+    """Writes in the block are held back and sent together when it ends."""
+    device = make_device(stub_sends=True)
+
+    async with device.transaction():
+        await _datapoint(device, 2).set_value(20)
+        await _datapoint(device, 1).set_value(10)
+        await asyncio.sleep(0.1)
+        device._send_datapoints.assert_not_awaited()
+
+    device._send_datapoints.assert_awaited_once_with([2, 1])
+
+
+async def test_write_datapoints() -> None:
+    """All values are set and the call returns once the frame is sent."""
+    device = make_device(stub_sends=True)
+    colour = _datapoint(device, 5)
+    brightness = _datapoint(device, 3)
+
+    await device.write_datapoints([(colour, 1), (brightness, 500)])
+
+    device._send_datapoints.assert_awaited_once_with([5, 3])
+    assert colour.value == 1
+    assert brightness.value == 500
+
+
+async def test_write_datapoints_reports_send_errors() -> None:
+    """A failed frame is raised to the caller."""
+    device = make_device(stub_sends=True)
+    device._send_datapoints.side_effect = TimeoutError
+
+    with pytest.raises(TimeoutError):
+        await device.write_datapoints([(_datapoint(device, 1), 1)])
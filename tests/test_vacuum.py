@@ -169,11 +169,11 @@ async def test_vacuum_bool_control(hass: HomeAssistant) -> None:
     device._send_datapoints.assert_any_call([6])
     assert device.datapoints[6].value is True
 
-    # Test set fan speed (mode) action (should set DP 2 to index and start)
+    # Test set fan speed (mode) action (should set DP 2 to index and start,
+    # both in one frame)
     await entity.async_set_fan_speed("n_mode")
     await hass.async_block_till_done()
-    device._send_datapoints.assert_any_call([2])
-    device._send_datapoints.assert_any_call([1])
+    device._send_datapoints.assert_any_call([2, 1])
     assert device.datapoints[2].value == 2
     assert device.datapoints[1].value is True
 
@@ -0,0 +1,81 @@
+"""Tests for skipping writes of values the device already reported."""
+
+import time
+from unittest.mock import AsyncMock, Mock
+
+from custom_components.tuya_ble.tuya_ble import TuyaBLEDataPointType, TuyaBLEDevice
+from custom_components.tuya_ble.tuya_ble.const import WRITE_SUPPRESSION_WINDOW
+
+from . import make_device
+
+
+def _report(device: TuyaBLEDevice, dp_id: int, value: bool) -> None:
+    device.datapoints._update_from_device(
+        dp_id, time.time(), 0, TuyaBLEDataPointType.DT_BOOL, value
+    )
+
+
+async def test_reported_value_is_not_written_again() -> None:
+    """Re-asserting the reported state sends nothing and is counted."""
+    device = make_device(stub_sends=True)
+    _report(device, 1, True)
+
+    await device.datapoints[1].set_value(True)
+    await device.datapoints[1].set_value(1)
+
+    device._send_datapoints.assert_not_awaited()
+    assert device.suppressed_writes == 2
+
+
+async def test_pending_change_is_not_suppressed() -> None:
+    """Writing the reported value back after another write still sends it."""
+    device = make_device(stub_sends=True)
+    _report(device, 1, True)
+    datapoint = device.datapoints[1]
+
+    await datapoint.set_value(False)
+    await datapoint.set_value(True)
+
+    assert device._send_datapoints.await_args_list == [(([1],),), (([1],),)]
+    assert device.suppressed_writes == 0
+
+
+async def test_unknown_and_stale_values_are_written() -> None:
+    """Values never reported, or reported too long ago, are sent."""
+    device = make_device(stub_sends=True)
+    created = device.datapoints.get_or_create(2, TuyaBLEDataPointType.DT_BOOL, True)
+    await created.set_value(True)
+    device._send_datapoints.assert_awaited_once_with([2])
+
+    _report(device, 1, True)
+    device.datapoints[1]._reported_at -= WRITE_SUPPRESSION_WINDOW + 1
+    await device.datapoints[1].set_value(True)
+    device._send_datapoints.assert_awaited_with([1])
+    assert device.suppressed_writes == 0
+
+
+async def test_momentary_datapoints_are_always_written() -> None:
+    """Commands like a lock or a push are sent even if nothing changes."""
+    device = make_device(stub_sends=True)
+    device.datapoints.set_momentary(6)
+    _report(device, 6, True)
+
+    await device.datapoints[6].set_value(True)
+
+    device._send_datapoints.assert_awaited_once_with([6])
+    assert device.suppressed_writes == 0
+
+
+async def test_values_are_written_after_an_idle_disconnect() -> None:
+    """A device that was away may have changed, so its values are sent."""
+    device = make_device(stub_sends=True)
+    client = Mock(is_connected=True, stop_notify=AsyncMock(), disconnect=AsyncMock())
+    device._client = client
+    device._is_paired = True
+    _report(device, 1, True)
+
+    await device._execute_idle_disconnect()
+    await device.datapoints[1].set_value(True)
+
+    device._send_datapoints.assert_awaited_once_with([1])
+    assert device.suppressed_writes == 0